@@ -110,14 +110,20 @@ def repo():
 @repo.command()
 @click.argument('url')
 @click.option('--data-dir', type=click.Path(), help='Directory for test data')
-def analyze(url: str, data_dir: Optional[str] = None):
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Number of worker processes used to parse files')
+@click.option('--incremental', is_flag=True, default=False,
+              help='Only re-analyze files changed since the last analyzed commit')
+def analyze(url: str, data_dir: Optional[str] = None, workers: Optional[int] = None,
+            incremental: bool = False):
     """Analyze a repository."""
     try:
         # If using test data, construct file URL
         if data_dir:
             url = f"file://{Path(data_dir).absolute()}"
             
-        repo_id = db_service.analyze_repository(url)
+        repo_id = db_service.analyze_repository(url, workers=workers,
+                                                 incremental=incremental or None)
         click.echo(f"Repository analyzed successfully. ID: {repo_id}")
     except Exception as e:
         click.echo(f"Error analyzing repository: {str(e)}", err=True)
@@ -212,5 +218,53 @@ def pattern(pattern: str, repo_id: Optional[int], limit: int):
     except Exception as e:
         click.echo(f"Error searching patterns: {str(e)}", err=True)
 
+# Pattern Commands
+@cli.group()
+def patterns():
+    """Query pattern library commands."""
+    pass
+
+@patterns.command()
+@click.option('--language', '-l', 'languages', multiple=True,
+              help='Only compile patterns of this language (repeatable)')
+@click.option('--json', 'as_json', is_flag=True, default=False,
+              help='Print the report as JSON')
+@click.option('--strict', is_flag=True, default=False,
+              help='Exit with status 1 if any pattern fails to compile')
+def warmup(languages: tuple, as_json: bool, strict: bool):
+    """Compile every query pattern and report compile times and errors."""
+    from GithubAnalyzer.services.analysis.parsers.pattern_warmup import \
+        warm_up_patterns
+    try:
+        report = warm_up_patterns(languages or None)
+    except Exception as e:
+        click.echo(f"Error warming up patterns: {str(e)}", err=True)
+        raise SystemExit(1)
+        
+    if as_json:
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    else:
+        compile_ms = sum(result.compile_ms for result in report.results)
+        click.echo("\nPattern Warm-up:")
+        click.echo("================")
+        click.echo(f"Compiled: {len(report.compiled)} patterns in {compile_ms:.1f} ms "
+                   f"({report.total_ms:.1f} ms total)")
+        
+        click.echo("\nSlowest Patterns:")
+        for result in report.slowest(5):
+            click.echo(f"  - {result.language}/{result.pattern_name}: {result.compile_ms:.2f} ms")
+            
+        if report.skipped_languages:
+            click.echo("\nSkipped Languages (no grammar):")
+            for language in sorted(report.skipped_languages):
+                click.echo(f"  - {language}")
+                
+        click.echo(f"\nInvalid Patterns: {len(report.invalid)}")
+        for result in report.invalid:
+            click.echo(f"  - {result.language}/{result.pattern_name} ({result.source}): {result.error}")
+            
+    if strict and report.invalid:
+        raise SystemExit(1)
+
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
@@ -14,8 +14,9 @@ from .language import (CodeAnalysis, LanguageDetectionResult,
 from .pattern_registry import (PATTERN_REGISTRY, get_language_patterns,
                                get_optimization_settings, get_query_pattern)
 # Query models
-from .query import (QueryCapture, QueryExecutor, QueryOptimizationSettings,
-                    QueryPattern, QueryResult, QueryStats)
+from .query import (ExtractionQuery, ExtractionResult, QueryCapture,
+                    QueryExecutor, QueryOptimizationSettings, QueryPattern,
+                    QueryResult, QueryStats)
 from .query_constants import (PATTERN_CATEGORY_CLASS, PATTERN_CATEGORY_COMMENT,
                               PATTERN_CATEGORY_CONTROL_FLOW,
                               PATTERN_CATEGORY_ERROR,
@@ -96,6 +97,7 @@ __all__ = [
     
     # Query models
     'QueryCapture', 'QueryPattern', 'QueryResult',
+    'ExtractionQuery', 'ExtractionResult',
     'QueryStats', 'QueryExecutor', 'QueryOptimizationSettings',
     
     # Pattern types
@@ -31,6 +31,22 @@ class QueryResult(BaseModel):
     is_valid: bool = True
     errors: List[str] = field(default_factory=list)
 
+@dataclass
+class ExtractionQuery(BaseModel):
+    """Several pattern kinds combined into one query for a single pass."""
+    query: Any  # Compiled tree-sitter Query
+    pattern_kinds: List[str] = field(default_factory=list)  # Kind of each pattern index
+    source: str = ""  # Combined pattern source
+
+@dataclass
+class ExtractionResult(BaseModel):
+    """Nodes collected by one pass of an extraction query."""
+    functions: List[Dict[str, Any]] = field(default_factory=list)
+    classes: List[Dict[str, Node]] = field(default_factory=list)
+    imports: List[Dict[str, Node]] = field(default_factory=list)
+    error_nodes: List[Node] = field(default_factory=list)  # ERROR nodes only, not their flagged ancestors
+    missing_nodes: List[Node] = field(default_factory=list)
+
 @dataclass
 class QueryPattern(BaseModel):
     """A tree-sitter query pattern."""
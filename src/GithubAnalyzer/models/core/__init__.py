@@ -1,7 +1,8 @@
 """Core models for the GithubAnalyzer package."""
 
 # AST models
-from .ast import NodeDict, NodeList, TreeSitterEdit
+from .ast import NodeDict, NodeList, ParseSummary, TreeSitterEdit
+from .compact_ast import CompactAST
 # Base models
 from .base_model import BaseModel
 # Database models
@@ -9,25 +10,28 @@ from .db.database import DatabaseConfig, DatabaseConnection, DatabaseModel, Grap
 # Error models
 from .errors import (AnalysisError, APIError, AuthError, BaseError, CacheError,
                     ConfigError, DatabaseError, EditorError, FileError, GraphError,
-                    LanguageError, NetworkError, ParserError, PatternError,
+                    LanguageError, NetworkError, ParseCancelledError,
+                    ParserError, ParseSizeError, ParseTimeoutError, PatternError,
                     QueryError, RepositoryError, ResourceError, ServiceError,
                     StateError, TimeoutError, TraversalError, ValidationError)
 # File models
-from .file import FileFilterConfig, FileInfo, FileModel, FilePattern
+from .file import FileContent, FileFilterConfig, FileInfo, FileModel, FilePattern
 # Language models
 from .language import (EXTENSION_TO_LANGUAGE, LANGUAGE_FEATURES,
                        SPECIAL_FILENAMES, LanguageFeatures, LanguageInfo)
 # Parser models
 from .parsers import get_custom_parser
 # Repository models
-from .repository import ProcessingResult, ProcessingStats, RepositoryInfo
+from .repository import (IngestionConfig, ProcessingResult, ProcessingStats,
+                         RepositoryChanges, RepositoryInfo)
 # Type definitions
 from .types import (FileId, FileType, JsonDict, LanguageId, LanguageType, LineList,
                     NodeId, NodeType, PathStr, QueryId, RepoId, Result, TreeSitterRange)
 
 __all__ = [
     # AST models
-    'NodeDict', 'NodeList', 'TreeSitterEdit', 'TreeSitterRange',
+    'CompactAST', 'NodeDict', 'NodeList', 'ParseSummary', 'TreeSitterEdit',
+    'TreeSitterRange',
     
     # Base models
     'BaseModel',
@@ -35,12 +39,13 @@ __all__ = [
     # Error models
     'AnalysisError', 'APIError', 'AuthError', 'BaseError', 'CacheError',
     'ConfigError', 'DatabaseError', 'EditorError', 'FileError', 'GraphError',
-    'LanguageError', 'NetworkError', 'ParserError', 'PatternError',
+    'LanguageError', 'NetworkError', 'ParseCancelledError', 'ParserError',
+    'ParseSizeError', 'ParseTimeoutError', 'PatternError',
     'QueryError', 'RepositoryError', 'ResourceError', 'ServiceError',
     'StateError', 'TimeoutError', 'TraversalError', 'ValidationError',
     
     # File models
-    'FileInfo', 'FileModel', 'FilePattern', 'FileFilterConfig',
+    'FileContent', 'FileInfo', 'FileModel', 'FilePattern', 'FileFilterConfig',
     
     # Language models
     'EXTENSION_TO_LANGUAGE', 'LANGUAGE_FEATURES', 'SPECIAL_FILENAMES',
@@ -50,7 +55,8 @@ __all__ = [
     'get_custom_parser',
     
     # Repository models
-    'ProcessingResult', 'ProcessingStats', 'RepositoryInfo',
+    'IngestionConfig', 'ProcessingResult', 'ProcessingStats',
+    'RepositoryChanges', 'RepositoryInfo',
     
     # Database models
     'DatabaseConfig', 'DatabaseConnection', 'DatabaseModel', 'GraphAnalytics',
@@ -7,6 +7,9 @@ from tree_sitter import Node, Tree
 from typing import Any, Dict, List, Optional, Union
 
 from GithubAnalyzer.models.core.base_model import BaseModel
+from GithubAnalyzer.models.core.compact_ast import (FLAG_ERROR, FLAG_MISSING,
+                                                    CompactAST,
+                                                    compact_ast_data)
 from GithubAnalyzer.models.core.types import (NodeDict, NodeList,
                                               TreeSitterRange)
 from GithubAnalyzer.utils.logging import get_logger
@@ -243,6 +246,122 @@ class ParseResult:
         })
         return structure 
 
+def _span(node: Node) -> Dict[str, Any]:
+    """Describe where a node is, without its text."""
+    return {
+        'type': node.type,
+        'start_point': tuple(node.start_point),
+        'end_point': tuple(node.end_point),
+        'start_byte': node.start_byte,
+        'end_byte': node.end_byte
+    }
+
+def _element(captures: Dict[str, Any], kind: str, name_captures: List[str]) -> Optional[Dict[str, Any]]:
+    """Describe a function, class or import match by its span and name."""
+    def_node = captures.get(f'{kind}.def') or captures.get(kind)
+    if def_node is None:
+        return None
+    name_node = next((captures[name] for name in name_captures if captures.get(name) is not None), None)
+    if name_node is None:
+        # Patterns without a name capture; most grammars have a name field
+        name_node = def_node.child_by_field_name('name')
+    element = _span(def_node)
+    element['name'] = get_node_text(name_node) if name_node is not None else None
+    return element
+
+@dataclass
+class ParseSummary:
+    """Everything ingestion keeps from a parse, without tree-sitter objects.
+
+    Summaries are what the parse cache stores, so they only hold plain
+    values: elements are described by their name and span, and the tree
+    itself by a serialized ``CompactAST``. Text is sliced from the source
+    when needed.
+
+    Attributes:
+        language: Language identifier
+        syntax_valid: Whether the tree is free of syntax errors
+        errors: Error messages
+        functions: Function names and spans
+        classes: Class names and spans
+        imports: Imported module names and import statement spans
+        error_nodes: Spans of ERROR nodes
+        missing_nodes: Spans of nodes inserted by error recovery
+        ast: Tree serialized by ``CompactAST.to_bytes``
+        node_count: Number of nodes in the tree
+        from_cache: Whether the summary was served from the parse cache
+    """
+    language: str
+    syntax_valid: bool = True
+    errors: List[str] = field(default_factory=list)
+    functions: List[Dict[str, Any]] = field(default_factory=list)
+    classes: List[Dict[str, Any]] = field(default_factory=list)
+    imports: List[Dict[str, Any]] = field(default_factory=list)
+    error_nodes: List[Dict[str, Any]] = field(default_factory=list)
+    missing_nodes: List[Dict[str, Any]] = field(default_factory=list)
+    ast: Optional[bytes] = field(default=None, repr=False)
+    node_count: int = 0
+    from_cache: bool = False
+
+    @classmethod
+    def from_parse_result(cls, parse_result: ParseResult) -> 'ParseSummary':
+        """Summarize a parse result while its tree is still alive.
+
+        Args:
+            parse_result: Result of ``ParserService.parse_content``
+
+        Returns:
+            ParseSummary of the result
+        """
+        summary = cls(language=parse_result.language, errors=list(parse_result.errors))
+        summary.functions = [
+            element for element in (_element(f, 'function', ['function.name']) for f in parse_result.functions)
+            if element is not None
+        ]
+        summary.classes = [
+            element for element in (_element(c, 'class', ['class.name']) for c in parse_result.classes)
+            if element is not None
+        ]
+        summary.imports = [
+            element for element in (_element(i, 'import', ['import.module', 'import.from', 'import.name'])
+                                    for i in parse_result.imports)
+            if element is not None
+        ]
+        if parse_result.tree is not None:
+            root = parse_result.tree.root_node
+            summary.syntax_valid = not root.has_error
+            ast = CompactAST.from_node(root)
+            summary.ast = ast.to_bytes()
+            summary.node_count = len(ast)
+            # The compact tree flags the same nodes the error patterns capture
+            summary.error_nodes = [ast.node_dict(i) for i, flags in enumerate(ast.flags) if flags & FLAG_ERROR]
+            summary.missing_nodes = [ast.node_dict(i) for i, flags in enumerate(ast.flags) if flags & FLAG_MISSING]
+        return summary
+
+    def to_ast_data(self) -> Dict[str, Any]:
+        """Build the ``ast_data`` stored with a code snippet."""
+        ast_data = compact_ast_data(self.ast, self.node_count) if self.ast is not None else {}
+        ast_data.update({
+            'syntax_valid': self.syntax_valid,
+            'errors': list(self.errors),
+            'error_nodes': list(self.error_nodes),
+            'missing_nodes': list(self.missing_nodes)
+        })
+        return ast_data
+
+    def get_compact_ast(self, source: Optional[bytes] = None) -> Optional[CompactAST]:
+        """Decode the stored tree.
+
+        Args:
+            source: Bytes that were parsed, for slicing node text
+
+        Returns:
+            CompactAST, or None if the summary has no tree
+        """
+        if self.ast is None:
+            return None
+        return CompactAST.from_bytes(self.ast, source)
+
 @dataclass
 class TreeSitterEdit(BaseModel):
     """Represents a tree-sitter edit operation."""
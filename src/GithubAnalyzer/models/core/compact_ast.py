@@ -0,0 +1,337 @@
+"""Compact columnar encoding of tree-sitter syntax trees.
+
+``node_to_dict`` nests a dict per node and embeds every node's decoded
+text, so a stored tree holds the file's text once per level of nesting.
+``CompactAST`` instead keeps one entry per node, in pre-order, spread over
+parallel arrays: a type id into a table of node type names, the parent's
+index, the start and end byte and point, and a few flag bits. No text is
+stored; it is sliced from the source bytes when asked for.
+
+The arrays serialize to a single zlib-compressed binary blob, which is
+stored base64-encoded in ``ast_data`` (see ``to_ast_data``).
+"""
+import base64
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from tree_sitter import Node
+
+from GithubAnalyzer.models.core.errors import ParserError
+
+# Value of ``ast_data['ast_format']`` for compact trees
+COMPACT_AST_FORMAT = 'compact'
+COMPACT_AST_VERSION = 1
+
+# Node flag bits
+FLAG_NAMED = 1
+FLAG_ERROR = 2
+FLAG_MISSING = 4
+FLAG_EXTRA = 8
+
+_MAGIC = b'CAST'
+# Magic, version, node count and length of the type table
+_HEADER = struct.Struct('<4sHII')
+# Column names and array type codes, in serialization order
+_COLUMNS = (
+    ('type_ids', 'H'),
+    ('parents', 'i'),
+    ('start_bytes', 'I'),
+    ('end_bytes', 'I'),
+    ('start_rows', 'I'),
+    ('start_columns', 'I'),
+    ('end_rows', 'I'),
+    ('end_columns', 'I'),
+    ('flags', 'B'),
+)
+
+
+@dataclass
+class CompactAST:
+    """A syntax tree stored as parallel arrays, one entry per node.
+
+    Nodes are numbered in pre-order, so the root is node 0, a parent
+    always comes before its children and a node's descendants directly
+    follow it.
+
+    Attributes:
+        types: Node type names, indexed by type id
+        type_ids: Type id of each node
+        parents: Index of each node's parent, -1 for the root
+        start_bytes: Start byte of each node
+        end_bytes: End byte of each node
+        start_rows: Start row of each node
+        start_columns: Start column of each node, in bytes
+        end_rows: End row of each node
+        end_columns: End column of each node, in bytes
+        flags: FLAG_* bits of each node
+        source: Source bytes node text is sliced from; not serialized
+    """
+    types: List[str] = field(default_factory=list)
+    type_ids: array = field(default_factory=lambda: array('H'))
+    parents: array = field(default_factory=lambda: array('i'))
+    start_bytes: array = field(default_factory=lambda: array('I'))
+    end_bytes: array = field(default_factory=lambda: array('I'))
+    start_rows: array = field(default_factory=lambda: array('I'))
+    start_columns: array = field(default_factory=lambda: array('I'))
+    end_rows: array = field(default_factory=lambda: array('I'))
+    end_columns: array = field(default_factory=lambda: array('I'))
+    flags: array = field(default_factory=lambda: array('B'))
+    source: Optional[bytes] = field(default=None, repr=False)
+    _children: Optional[List[List[int]]] = field(default=None, init=False, repr=False)
+    _subtree_ends: Optional[List[int]] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_node(cls, node: Node, source: Optional[bytes] = None) -> 'CompactAST':
+        """Encode a node and its subtree.
+
+        Args:
+            node: Root of the tree to encode
+            source: Bytes the tree was parsed from, for slicing node text
+
+        Returns:
+            CompactAST of the subtree
+        """
+        ast = cls(source=source)
+        # Type id and named flag only depend on the node's grammar symbol
+        kinds: Dict[int, Tuple[int, int]] = {}
+        type_table: Dict[str, int] = {}
+        # MISSING nodes only occur in trees with errors
+        check_missing = node.has_error
+        ancestors: List[int] = []
+        add_type, add_parent = ast.type_ids.append, ast.parents.append
+        add_start_byte, add_end_byte = ast.start_bytes.append, ast.end_bytes.append
+        add_start_row, add_start_column = ast.start_rows.append, ast.start_columns.append
+        add_end_row, add_end_column = ast.end_rows.append, ast.end_columns.append
+        add_flags = ast.flags.append
+        cursor = node.walk()
+        index = 0
+        while True:
+            current = cursor.node
+            kind = kinds.get(current.kind_id)
+            if kind is None:
+                type_id = type_table.get(current.type)
+                if type_id is None:
+                    type_id = type_table[current.type] = len(ast.types)
+                    ast.types.append(current.type)
+                kind = kinds[current.kind_id] = (
+                    type_id,
+                    (FLAG_NAMED if current.is_named else 0) | (FLAG_ERROR if current.is_error else 0))
+            type_id, flags = kind
+            if current.is_extra:
+                flags |= FLAG_EXTRA
+            if check_missing and current.is_missing:
+                flags |= FLAG_MISSING
+            start_row, start_column = current.start_point
+            end_row, end_column = current.end_point
+            add_type(type_id)
+            add_parent(ancestors[-1] if ancestors else -1)
+            add_start_byte(current.start_byte)
+            add_end_byte(current.end_byte)
+            add_start_row(start_row)
+            add_start_column(start_column)
+            add_end_row(end_row)
+            add_end_column(end_column)
+            add_flags(flags)
+
+            if cursor.goto_first_child():
+                ancestors.append(index)
+            else:
+                while not cursor.goto_next_sibling():
+                    if not cursor.goto_parent():
+                        return ast
+                    ancestors.pop()
+            index += 1
+
+    def __len__(self) -> int:
+        return len(self.type_ids)
+
+    def type_of(self, index: int) -> str:
+        """Get the type name of a node."""
+        return self.types[self.type_ids[index]]
+
+    def parent(self, index: int) -> Optional[int]:
+        """Get the index of a node's parent, or None for the root."""
+        parent = self.parents[index]
+        return parent if parent >= 0 else None
+
+    def children(self, index: int) -> List[int]:
+        """Get the indices of a node's children, in order."""
+        if self._children is None:
+            children: List[List[int]] = [[] for _ in range(len(self))]
+            for child, parent in enumerate(self.parents):
+                if parent >= 0:
+                    children[parent].append(child)
+            self._children = children
+        return self._children[index]
+
+    def descendants(self, index: int) -> range:
+        """Get the indices of a node's descendants, in pre-order."""
+        if self._subtree_ends is None:
+            # A subtree ends where its last descendant's subtree ends
+            ends = list(range(1, len(self) + 1))
+            for child in range(len(self) - 1, 0, -1):
+                parent = self.parents[child]
+                if ends[child] > ends[parent]:
+                    ends[parent] = ends[child]
+            self._subtree_ends = ends
+        return range(index + 1, self._subtree_ends[index])
+
+    def find(self, types: Union[str, Iterable[str]]) -> List[int]:
+        """Get the indices of all nodes of the given type or types."""
+        wanted = {types} if isinstance(types, str) else set(types)
+        type_ids = {type_id for type_id, name in enumerate(self.types) if name in wanted}
+        return [index for index, type_id in enumerate(self.type_ids) if type_id in type_ids]
+
+    def has_flag(self, index: int, flag: int) -> bool:
+        """Check a FLAG_* bit of a node."""
+        return bool(self.flags[index] & flag)
+
+    def byte_range(self, index: int) -> Tuple[int, int]:
+        """Get the start and end byte of a node."""
+        return self.start_bytes[index], self.end_bytes[index]
+
+    def start_point(self, index: int) -> Tuple[int, int]:
+        """Get the (row, column) a node starts at."""
+        return self.start_rows[index], self.start_columns[index]
+
+    def end_point(self, index: int) -> Tuple[int, int]:
+        """Get the (row, column) a node ends at."""
+        return self.end_rows[index], self.end_columns[index]
+
+    def text(self, index: int) -> Optional[str]:
+        """Get the text of a node, sliced from the source.
+
+        Returns:
+            The node's text, or None if no source is attached
+        """
+        if self.source is None:
+            return None
+        return self.source[self.start_bytes[index]:self.end_bytes[index]].decode('utf-8', errors='replace')
+
+    def node_dict(self, index: int, with_text: bool = True) -> Dict[str, Any]:
+        """Describe a single node in the shape of ``node_to_dict``, without children.
+
+        Args:
+            index: Node to describe
+            with_text: Include the node's text if a source is attached
+
+        Returns:
+            Dict with type, points, bytes and optionally text
+        """
+        info = {
+            'type': self.type_of(index),
+            'start_point': self.start_point(index),
+            'end_point': self.end_point(index),
+            'start_byte': self.start_bytes[index],
+            'end_byte': self.end_bytes[index]
+        }
+        if with_text and self.source is not None:
+            info['text'] = self.text(index)
+        return info
+
+    def to_bytes(self, level: int = 1) -> bytes:
+        """Serialize the tree to a compressed binary blob.
+
+        Args:
+            level: zlib compression level
+
+        Returns:
+            Blob readable by ``from_bytes``
+        """
+        type_table = '\0'.join(self.types).encode('utf-8')
+        parts = [_HEADER.pack(_MAGIC, COMPACT_AST_VERSION, len(self), len(type_table)), type_table]
+        for name, _ in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return zlib.compress(b''.join(parts), level)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, source: Optional[bytes] = None) -> 'CompactAST':
+        """Load a tree serialized by ``to_bytes``.
+
+        Args:
+            data: Serialized blob
+            source: Bytes the tree was parsed from, for slicing node text
+
+        Returns:
+            Decoded CompactAST
+
+        Raises:
+            ParserError: If the blob is not a valid compact AST
+        """
+        try:
+            payload = zlib.decompress(data)
+            magic, version, count, table_size = _HEADER.unpack_from(payload)
+        except (zlib.error, struct.error) as e:
+            raise ParserError(f"Invalid compact AST data: {e}")
+        if magic != _MAGIC or version != COMPACT_AST_VERSION:
+            raise ParserError(f"Unsupported compact AST format: {magic!r} version {version}")
+
+        offset = _HEADER.size
+        table = payload[offset:offset + table_size].decode('utf-8')
+        offset += table_size
+        ast = cls(types=table.split('\0') if table else [], source=source)
+        for name, typecode in _COLUMNS:
+            column = array(typecode)
+            size = count * column.itemsize
+            column.frombytes(payload[offset:offset + size])
+            if len(column) != count:
+                raise ParserError(f"Truncated compact AST column: {name}")
+            if sys.byteorder == 'big':
+                column.byteswap()
+            setattr(ast, name, column)
+            offset += size
+        return ast
+
+    def to_ast_data(self) -> Dict[str, Any]:
+        """Wrap the serialized tree for storage in ``ast_data``.
+
+        Returns:
+            JSON-serializable dict with the base64-encoded blob
+        """
+        return compact_ast_data(self.to_bytes(), len(self))
+
+    @classmethod
+    def from_ast_data(cls, ast_data: Optional[Dict[str, Any]],
+                      source: Optional[bytes] = None) -> Optional['CompactAST']:
+        """Load the tree stored in ``ast_data`` by ``to_ast_data``.
+
+        Args:
+            ast_data: Stored AST data
+            source: Bytes the tree was parsed from, for slicing node text
+
+        Returns:
+            Decoded CompactAST, or None if ``ast_data`` holds no compact tree
+            (for example output of a custom parser)
+
+        Raises:
+            ParserError: If the stored tree is corrupt
+        """
+        if not ast_data or ast_data.get('ast_format') != COMPACT_AST_FORMAT:
+            return None
+        return cls.from_bytes(base64.b64decode(ast_data['ast']), source)
+
+
+def compact_ast_data(data: bytes, node_count: int) -> Dict[str, Any]:
+    """Wrap a blob produced by ``CompactAST.to_bytes`` for ``ast_data``.
+
+    Args:
+        data: Serialized tree
+        node_count: Number of nodes in the tree
+
+    Returns:
+        JSON-serializable dict with the base64-encoded blob
+    """
+    return {
+        'ast_format': COMPACT_AST_FORMAT,
+        'ast_version': COMPACT_AST_VERSION,
+        'node_count': node_count,
+        'ast': base64.b64encode(data).decode('ascii')
+    }
@@ -94,6 +94,7 @@ class CodeSnippet(DatabaseModel):
         syntax_valid: Whether the code has valid syntax
         complexity_metrics: Optional code complexity metrics
         metadata: Optional metadata about the code snippet
+        content_hash: Optional git blob SHA of the raw file content, used for change detection
     """
     id: Optional[int]
     repo_id: int
@@ -105,6 +106,7 @@ class CodeSnippet(DatabaseModel):
     syntax_valid: bool = True
     complexity_metrics: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
+    content_hash: Optional[str] = None
     
     def __post_init__(self):
         """Initialize and validate code snippet."""
@@ -34,6 +34,21 @@ class ParserError(BaseError):
     """Error related to parsing operations."""
     pass
 
+@dataclass
+class ParseCancelledError(ParserError):
+    """Error raised when a parse is cancelled before it completes."""
+    pass
+
+@dataclass
+class ParseTimeoutError(ParseCancelledError):
+    """Error raised when a parse runs longer than its timeout."""
+    pass
+
+@dataclass
+class ParseSizeError(ParserError):
+    """Error raised when content is too large to be parsed."""
+    pass
+
 @dataclass
 class TraversalError(BaseError):
     """Error related to AST traversal."""
@@ -129,6 +144,9 @@ __all__ = [
     'EditorError',
     'LanguageError',
     'ParserError',
+    'ParseCancelledError',
+    'ParseTimeoutError',
+    'ParseSizeError',
     'TraversalError',
     'ValidationError',
     'DatabaseError',
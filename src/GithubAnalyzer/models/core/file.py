@@ -1,6 +1,7 @@
 """File-related data models."""
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
@@ -169,6 +170,113 @@ EDITOR_EXCLUDES: Set[str] = {
 
 DEFAULT_EXCLUDES: Set[str] = GIT_EXCLUDES | BUILD_EXCLUDES | EDITOR_EXCLUDES
 
+# Leading bytes inspected when deciding whether content is binary
+BINARY_SNIFF_SIZE = 8000
+
+def is_binary_content(data: bytes) -> bool:
+    """Check if content looks binary, based on its first 8000 bytes.
+
+    Args:
+        data: File content or a leading chunk of it
+
+    Returns:
+        True if more than 10% of the inspected bytes are null bytes
+    """
+    chunk = data[:BINARY_SNIFF_SIZE]
+    return chunk.count(b'\x00') > len(chunk) * 0.1
+
+@dataclass
+class FileContent:
+    """Content of a file, read from disk exactly once.
+
+    Holds both the raw bytes and the decoded text so that hashing, parsing
+    and storage never read or re-encode the file again.
+
+    Attributes:
+        path: Path of the file
+        data: Raw bytes as stored on disk or in git
+        text: Decoded text with line endings normalized to ``\\n``, or None
+            if the content is binary or not valid UTF-8
+        is_binary: Whether the leading bytes look binary
+        read_ms: Time spent reading the file, in milliseconds
+        error: Why the content could not be decoded, if it could not
+    """
+    path: Path
+    data: bytes
+    text: Optional[str] = None
+    is_binary: bool = False
+    read_ms: float = 0.0
+    error: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'FileContent':
+        """Read a file with a single open.
+
+        The first buffer is sniffed for binary content and the rest of
+        the file is only read when it is text.
+
+        Args:
+            path: File to read
+
+        Returns:
+            FileContent for the file
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            data = f.read(BINARY_SNIFF_SIZE)
+            if is_binary_content(data):
+                return cls(path=Path(path), data=data, is_binary=True,
+                           read_ms=(time.perf_counter() - start) * 1000)
+            data += f.read()
+        content = cls.from_bytes(path, data)
+        content.read_ms = (time.perf_counter() - start) * 1000
+        return content
+
+    @classmethod
+    def from_bytes(cls, path: Union[str, Path], data: bytes) -> 'FileContent':
+        """Build file content from bytes that were already read.
+
+        Args:
+            path: Path the bytes belong to
+            data: Raw file content
+
+        Returns:
+            FileContent with the text decoded
+        """
+        content = cls(path=Path(path), data=data, is_binary=is_binary_content(data))
+        if content.is_binary:
+            return content
+        try:
+            # Match the newline handling of text-mode reads
+            text = data.decode('utf-8')
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            content.text = text
+        except UnicodeDecodeError as e:
+            content.error = str(e)
+        return content
+
+    @property
+    def size(self) -> int:
+        """Number of bytes read."""
+        return len(self.data)
+
+    @property
+    def source_bytes(self) -> bytes:
+        """UTF-8 bytes of ``text``, as handed to tree-sitter.
+
+        These are the raw bytes unless newline normalization changed the
+        text, so node byte offsets always index into ``text``'s encoding.
+        """
+        if self.text is None:
+            return b''
+        if b'\r' in self.data:
+            return self.text.encode('utf-8')
+        return self.data
+
 @dataclass
 class FileModel(BaseModel):
     """Model for file operations."""
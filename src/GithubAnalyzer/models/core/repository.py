@@ -2,13 +2,145 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from GithubAnalyzer.models.core.base_model import BaseModel
 from GithubAnalyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+@dataclass
+class IngestionConfig(BaseModel):
+    """Configuration for repository ingestion.
+
+    Attributes:
+        workers: Number of worker processes used to parse files.
+            A value of 1 parses files inside the pipeline's parse thread.
+        queue_size: Capacity of each bounded queue between pipeline stages
+        embed_batch_size: Maximum number of snippets embedded in one batch
+        incremental: Only re-process files changed since the last analyzed
+            commit, falling back to a full run when that is not possible
+        use_git_objects: Clone remote repositories bare and read file
+            content straight from the git object database at HEAD. With
+            the mirror cache this reads from a full mirror unless
+            ``blob_size_limit`` or ``clone_depth`` is set.
+        use_repo_cache: Keep remote repositories in a persistent mirror
+            cache and refresh them with ``git fetch`` instead of re-cloning
+        cache_dir: Root of the mirror cache; defaults to
+            ``GITHUB_ANALYZER_CACHE_DIR`` or ``~/.cache/github_analyzer/repos``
+        cache_max_bytes: Size above which least recently used cache
+            entries are evicted
+        clone_depth: Clone only this many commits of history. Incremental
+            runs fall back to a full run when the base commit is missing.
+            With the mirror cache, shallow copies are cached separately.
+        blob_size_limit: Partial clone that leaves blobs larger than this
+            many bytes on the server; such files are never analyzed. With
+            the mirror cache, partial copies are cached separately.
+        sparse_checkout: Only materialize files matching ``include_paths``
+        include_paths: Patterns of files to analyze, as in
+            ``FileFilterConfig.include_paths``
+        warm_up_patterns: Compile the whole query pattern library when the
+            processor starts, so no repository pays compile latency
+        use_parse_cache: Keep parse results in a persistent cache keyed by
+            content, so identical files are never parsed twice
+        parse_cache_dir: Directory of the parse cache; defaults to
+            ``GITHUB_ANALYZER_PARSE_CACHE_DIR`` or
+            ``~/.cache/github_analyzer/parses``
+        parse_cache_max_bytes: Size above which least recently used parse
+            cache entries are evicted
+        parse_timeout_ms: Abandon parsing a file after this long and store
+            only its metadata; no limit when None
+        max_parse_bytes: Files larger than this are not parsed and only
+            their metadata is stored; no limit when None
+        use_file_policy: Place files in processing tiers by size,
+            minification and generated-file markers, so outliers skip
+            the stages they would dominate
+        skip_file_bytes: Files larger than this are not processed at all
+            when the file policy is used; no limit when None
+        parse_only_bytes: Files larger than this are parsed but not
+            embedded when the file policy is used; no limit when None
+        record_file_stats: Keep the status and read cost of every file in
+            ``ProcessingStats.file_stats``; memory then grows with the
+            number of files, so only run totals are kept by default
+    """
+    workers: int = 1
+    queue_size: int = 64
+    embed_batch_size: int = 16
+    incremental: bool = False
+    use_git_objects: bool = False
+    use_repo_cache: bool = True
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 5 * 1024 ** 3
+    clone_depth: Optional[int] = None
+    blob_size_limit: Optional[int] = None
+    sparse_checkout: bool = False
+    include_paths: Optional[List[str]] = None
+    warm_up_patterns: bool = False
+    use_parse_cache: bool = True
+    parse_cache_dir: Optional[str] = None
+    parse_cache_max_bytes: int = 512 * 1024 ** 2
+    parse_timeout_ms: Optional[float] = 30_000
+    max_parse_bytes: Optional[int] = 10 * 1024 ** 2
+    use_file_policy: bool = True
+    skip_file_bytes: Optional[int] = 50 * 1024 ** 2
+    parse_only_bytes: Optional[int] = 1024 ** 2
+    record_file_stats: bool = False
+
+    def __post_init__(self):
+        """Validate ingestion configuration."""
+        super().__post_init__()
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if self.queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if self.embed_batch_size < 1:
+            raise ValueError("embed_batch_size must be at least 1")
+        if self.cache_max_bytes < 0:
+            raise ValueError("cache_max_bytes must not be negative")
+        if self.parse_cache_max_bytes < 0:
+            raise ValueError("parse_cache_max_bytes must not be negative")
+        if self.clone_depth is not None and self.clone_depth < 1:
+            raise ValueError("clone_depth must be at least 1")
+        if self.blob_size_limit is not None and self.blob_size_limit < 0:
+            raise ValueError("blob_size_limit must not be negative")
+        if self.parse_timeout_ms is not None and self.parse_timeout_ms <= 0:
+            raise ValueError("parse_timeout_ms must be positive")
+        if self.max_parse_bytes is not None and self.max_parse_bytes < 0:
+            raise ValueError("max_parse_bytes must not be negative")
+        if self.skip_file_bytes is not None and self.skip_file_bytes < 0:
+            raise ValueError("skip_file_bytes must not be negative")
+        if self.parse_only_bytes is not None and self.parse_only_bytes < 0:
+            raise ValueError("parse_only_bytes must not be negative")
+
+@dataclass
+class RepositoryChanges(BaseModel):
+    """Files changed between two commits, relative to the repository path.
+
+    Attributes:
+        base_commit: Commit the changes are computed from
+        head_commit: Commit the changes are computed to
+        added: Paths of added files
+        modified: Paths of modified files
+        deleted: Paths of deleted files
+        renamed: (old_path, new_path) pairs of renamed files
+    """
+    base_commit: str
+    head_commit: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    renamed: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def changed_paths(self) -> List[str]:
+        """Paths whose current content must be (re-)processed."""
+        return self.added + self.modified + [new for _, new in self.renamed]
+
+    @property
+    def removed_paths(self) -> List[str]:
+        """Paths whose stored data must be removed."""
+        return self.deleted + [old for old, _ in self.renamed]
+
 @dataclass
 class ProcessingStats(BaseModel):
     """Statistics about repository processing."""
@@ -16,10 +148,20 @@ class ProcessingStats(BaseModel):
     processed_files: int = 0
     error_files: int = 0
     skipped_files: int = 0
+    timed_out_files: int = 0
+    oversized_files: int = 0
+    metadata_only_paths: Dict[str, str] = field(default_factory=dict)
+    tier_counts: Dict[str, int] = field(default_factory=dict)
+    tier_reasons: Dict[str, int] = field(default_factory=dict)
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     language_counts: Dict[str, int] = field(default_factory=dict)
     error_messages: List[str] = field(default_factory=list)
+    failed_stages: List[str] = field(default_factory=list)
+    bytes_read: int = 0
+    read_time_ms: float = 0.0
+    file_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    record_file_stats: bool = False
 
     def __post_init__(self):
         """Initialize processing stats."""
@@ -47,6 +189,22 @@ class ProcessingStats(BaseModel):
                 error_count=self.error_files,
                 error=error_message)
 
+    def record_stage_failure(self, stage: str, error_message: str):
+        """Record a processing stage that stopped before the end of its input.
+        
+        Files the stage had not handed on are neither processed nor counted
+        as errors, so the run must not be treated as complete.
+        
+        Args:
+            stage: Name of the stage
+            error_message: Error that stopped it
+        """
+        self.failed_stages.append(stage)
+        self.error_messages.append(f"{stage} stage failed: {error_message}")
+        self._log("error", "Processing stage failed",
+                stage=stage,
+                error=error_message)
+
     def increment_skipped(self):
         """Increment skipped files count."""
         self.skipped_files += 1
@@ -54,6 +212,57 @@ class ProcessingStats(BaseModel):
                 skipped=self.skipped_files,
                 total=self.total_files)
 
+    def record_metadata_only(self, file_path: str, reason: str):
+        """Record a file stored without its parse.
+        
+        Args:
+            file_path: Path of the file
+            reason: Why it was not parsed (timeout or oversized)
+        """
+        if reason == "timeout":
+            self.timed_out_files += 1
+        elif reason == "oversized":
+            self.oversized_files += 1
+        self.metadata_only_paths[file_path] = reason
+        self._log("warning", "Stored file metadata only",
+                file=file_path,
+                reason=reason)
+
+    def record_tier(self, tier: str, reason: Optional[str] = None):
+        """Count a file placed in a processing tier.
+        
+        Args:
+            tier: Tier the file was placed in
+            reason: Why the file is below the full tier
+        """
+        self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+        if reason:
+            self.tier_reasons[reason] = self.tier_reasons.get(reason, 0) + 1
+
+    def record_file(self, file_path: str, status: str, bytes_read: int = 0,
+                    read_ms: float = 0.0):
+        """Record per-file processing stats.
+        
+        The read cost is added to the run totals. A record per file is only
+        kept in ``file_stats`` when ``record_file_stats`` is set, so memory
+        stays flat on large repositories by default.
+        
+        Args:
+            file_path: Path of the file
+            status: Outcome for the file (processed, skipped or error)
+            bytes_read: Bytes read from disk or git for the file
+            read_ms: Time spent reading the file, in milliseconds
+        """
+        self.bytes_read += bytes_read
+        self.read_time_ms += read_ms
+        if not self.record_file_stats:
+            return
+        self.file_stats[file_path] = {
+            'status': status,
+            'bytes_read': bytes_read,
+            'read_ms': read_ms
+        }
+
     def add_language(self, language: str):
         """Increment count for a language.
         
@@ -73,7 +282,14 @@ class ProcessingStats(BaseModel):
                 duration_seconds=duration,
                 processed=self.processed_files,
                 errors=self.error_files,
-                skipped=self.skipped_files)
+                skipped=self.skipped_files,
+                failed_stages=self.failed_stages,
+                timed_out=self.timed_out_files,
+                oversized=self.oversized_files,
+                tiers=self.tier_counts,
+                tier_reasons=self.tier_reasons,
+                bytes_read=self.bytes_read,
+                read_time_ms=self.read_time_ms)
 
 @dataclass
 class ProcessingResult(BaseModel):
@@ -1,7 +1,7 @@
 """Core tree-sitter traversal functionality."""
 from dataclasses import dataclass, field
-from typing import (Any, Dict, Iterator, List, Optional, Set, Tuple, TypeVar,
-                    Union)
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple,
+                    TypeVar, Union)
 
 from tree_sitter import Node, Tree
 
@@ -10,7 +10,7 @@ from GithubAnalyzer.models.core.base_model import BaseModel
 from GithubAnalyzer.models.core.errors import TraversalError
 from GithubAnalyzer.models.core.tree_sitter_core import (
     get_node_text, get_node_type, get_node_range, is_valid_node,
-    node_to_dict, iter_children, get_node_hierarchy
+    node_to_dict, get_node_hierarchy
 )
 from GithubAnalyzer.utils.logging import get_logger
 
@@ -18,6 +18,79 @@ logger = get_logger(__name__)
 
 T = TypeVar('T', bound=Node)
 
+# Traversal orders supported by walk_tree
+PRE_ORDER = 'pre'
+POST_ORDER = 'post'
+
+def walk_tree(
+    node: Optional[Node],
+    order: str = PRE_ORDER,
+    named_only: bool = False,
+    max_depth: Optional[int] = None,
+    types: Optional[Union[str, Iterable[str]]] = None,
+    byte_range: Optional[Tuple[int, int]] = None
+) -> Iterator[Node]:
+    """Walk a subtree with a tree-sitter cursor.
+    
+    The cursor moves with ``goto_first_child``, ``goto_next_sibling`` and
+    ``goto_parent``, so the walk needs no recursion or child lists and
+    works on arbitrarily deep trees. Filters only decide which nodes are
+    yielded; the walk still descends through nodes that are filtered out.
+    
+    Args:
+        node: Root of the subtree; it is part of the walk
+        order: PRE_ORDER yields parents before their children, POST_ORDER
+            after them
+        named_only: Only yield named nodes
+        max_depth: Do not descend below this depth; the root is depth 0
+        types: Only yield nodes of this type or these types
+        byte_range: (start_byte, end_byte); subtrees that do not overlap it
+            are skipped without being entered
+        
+    Yields:
+        Nodes of the subtree in the requested order
+        
+    Raises:
+        TraversalError: If the order is unknown
+    """
+    if order not in (PRE_ORDER, POST_ORDER):
+        raise TraversalError(f"Unknown traversal order: {order}")
+    if node is None:
+        return
+    if isinstance(types, str):
+        types = {types}
+    elif types is not None:
+        types = set(types)
+    pre_order = order == PRE_ORDER
+
+    def wanted(current: Node) -> bool:
+        return ((not named_only or current.is_named) and
+                (types is None or current.type in types))
+
+    def overlaps(current: Node) -> bool:
+        return (byte_range is None or
+                (current.start_byte < byte_range[1] and current.end_byte > byte_range[0]))
+
+    cursor = node.walk()
+    depth = 0
+    while True:
+        current = cursor.node
+        if overlaps(current):
+            if pre_order and wanted(current):
+                yield current
+            if (max_depth is None or depth < max_depth) and cursor.goto_first_child():
+                depth += 1
+                continue
+            if not pre_order and wanted(current):
+                yield current
+        # Move to the next sibling, finishing parents on the way up
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+            depth -= 1
+            if not pre_order and wanted(cursor.node):
+                yield cursor.node
+
 @dataclass
 class NodeRange(BaseModel):
     """Range information for a node in the AST."""
@@ -107,11 +180,12 @@ class TreeSitterTraversal:
     _node_cache: Dict[int, NodeDict] = field(default_factory=dict)
     
     def traverse(self, node: Node, visit_once: bool = True) -> Iterator[Node]:
-        """Traverse a tree-sitter node.
+        """Traverse a tree-sitter node in pre-order.
         
         Args:
             node: Node to traverse
-            visit_once: Whether to visit each node only once
+            visit_once: Kept for compatibility; a cursor walk visits each
+                node exactly once
             
         Yields:
             Each node in the traversal
@@ -123,29 +197,21 @@ class TreeSitterTraversal:
             raise TraversalError("Invalid node for traversal")
             
         try:
-            # Reset visited set if not visiting nodes multiple times
-            if visit_once:
-                self._visited = set()
-                
-            # Start with current node
-            stack = [node]
-            while stack:
-                current = stack.pop()
-                
-                # Skip if already visited
-                if visit_once and id(current) in self._visited:
-                    continue
-                    
-                # Mark as visited and yield
-                if visit_once:
-                    self._visited.add(id(current))
-                yield current
-                
-                # Add children to stack
-                stack.extend(reversed(list(iter_children(current))))
-                
+            yield from walk_tree(node)
         except Exception as e:
             raise TraversalError(f"Traversal failed: {e}")
+
+    def walk_tree(self, node: Node, **options: Any) -> Iterator[Node]:
+        """Walk a tree with a cursor; see ``walk_tree`` for the options.
+        
+        Args:
+            node: Root node of the walk
+            **options: order, named_only, max_depth, types and byte_range
+            
+        Yields:
+            Nodes of the subtree
+        """
+        return walk_tree(node, **options)
             
     def get_node_info(self, node: Node) -> NodeDict:
         """Get detailed information about a node.
@@ -213,21 +279,11 @@ class TreeSitterTraversal:
             
         try:
             matches = []
-            current_depth = 0
-            
-            def _search(node: Node, depth: int) -> None:
-                if max_depth is not None and depth > max_depth:
-                    return
+            for node in walk_tree(root, max_depth=max_depth):
                 if max_nodes is not None and len(matches) >= max_nodes:
-                    return
-                    
+                    break
                 if predicate(node):
                     matches.append(node)
-                    
-                for child in iter_children(node):
-                    _search(child, depth + 1)
-                    
-            _search(root, current_depth)
             return matches
             
         except Exception as e:
@@ -1,5 +1,5 @@
 """Core tree-sitter utility functions."""
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from tree_sitter import Node, Tree
 
@@ -126,6 +126,38 @@ def iter_children(node: Node) -> List[Node]:
         return []
     return node.children
 
+def iter_error_nodes(node: Optional[Node]) -> Iterator[Node]:
+    """Yield the nodes that are or contain syntax errors, in pre-order.
+    
+    Tree-sitter sets ``has_error`` on every ancestor of an ERROR or MISSING
+    node, so only flagged subtrees are entered: an error-free tree costs a
+    single check, and a tree with errors only visits the paths leading to
+    them and their siblings. The walk uses a tree cursor instead of
+    recursion, so deep trees cannot hit Python's recursion limit.
+    
+    Args:
+        node: Root of the subtree to search
+        
+    Yields:
+        Nodes whose ``has_error`` is set, including ERROR and MISSING nodes
+    """
+    if not node or not node.has_error:
+        return
+    cursor = node.walk()
+    while True:
+        current = cursor.node
+        if current.has_error:
+            yield current
+            if cursor.goto_first_child():
+                continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+
+def find_missing_nodes(node: Optional[Node]) -> List[Node]:
+    """Get the MISSING nodes tree-sitter inserted to recover from errors."""
+    return [n for n in iter_error_nodes(node) if n.is_missing]
+
 def get_node_hierarchy(node: Node) -> List[str]:
     """Get the type hierarchy of a node."""
     if not node:
@@ -3,7 +3,11 @@
 # Analysis parser
 from .analysis_parser import AnalysisParserService
 # Editor services
+from .edit_session import EditSession, TextEdit
 from .editor_service import TreeSitterEditor
+# Pattern warm-up
+from .pattern_warmup import (PatternCompileResult, PatternWarmupReport,
+                             warm_up_patterns)
 # Query services
 from .query_service import TreeSitterQueryHandler
 
@@ -12,8 +16,15 @@ __all__ = [
     'AnalysisParserService',
     
     # Editor services
+    'EditSession',
+    'TextEdit',
     'TreeSitterEditor',
     
+    # Pattern warm-up
+    'PatternCompileResult',
+    'PatternWarmupReport',
+    'warm_up_patterns',
+    
     # Query services
     'TreeSitterQueryHandler'
 ] 
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""Incremental editing of a single source file.
+
+An ``EditSession`` owns the source of a file, in a ``TextBuffer``, and its
+current tree. Edits are applied to both, and the file is reparsed with the
+edited old tree, so tree-sitter reuses every subtree the edits did not
+touch. The ranges whose syntax changed are kept for callers that only want
+to re-query the affected regions.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple, Union
+
+from tree_sitter import Parser, Range, Tree
+
+from GithubAnalyzer.models.core.errors import EditorError
+
+from .text_buffer import TextBuffer
+
+
+@dataclass
+class TextEdit:
+    """Replacement of a byte range of the source.
+
+    Attributes:
+        start_byte: First byte replaced
+        old_end_byte: End of the replaced bytes
+        new_text: Replacement text
+    """
+    start_byte: int
+    old_end_byte: int
+    new_text: Union[str, bytes]
+
+
+@dataclass
+class EditSession:
+    """Source buffer and tree of one file, reparsed incrementally on edits.
+
+    Attributes:
+        parser: Parser for the file's language
+        buffer: Current source
+        tree: Tree of the current source
+        previous_tree: Tree before the last batch of edits, unedited so
+            nodes taken from it remain usable
+        changed_ranges: Ranges whose syntax changed in the last batch
+        edits: (start_byte, old_end_byte, new_end_byte) of each edit in the
+            last batch, in coordinates of the source before the batch
+    """
+    parser: Parser
+    buffer: TextBuffer
+    tree: Tree
+    previous_tree: Optional[Tree] = None
+    changed_ranges: List[Range] = field(default_factory=list)
+    edits: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @classmethod
+    def start(cls, parser: Parser, source: Union[str, bytes]) -> 'EditSession':
+        """Parse a file and start editing it.
+
+        Args:
+            parser: Parser for the file's language
+            source: File content, as text or UTF-8 bytes
+
+        Returns:
+            EditSession of the file
+
+        Raises:
+            EditorError: If the content cannot be parsed
+        """
+        data = source.encode('utf-8') if isinstance(source, str) else bytes(source)
+        tree = parser.parse(data)
+        if tree is None:
+            raise EditorError("Failed to parse content")
+        return cls(parser=parser, buffer=TextBuffer(data), tree=tree)
+
+    @classmethod
+    def from_tree(cls, parser: Parser, tree: Tree,
+                  source: Union[str, bytes]) -> 'EditSession':
+        """Start editing an already parsed tree.
+
+        The source is taken from the caller rather than from the root node,
+        whose text leaves out whitespace before the first and after the last
+        token, which would shift every edit offset.
+
+        Args:
+            parser: Parser for the tree's language
+            tree: Tree parsed from ``source``
+            source: Content the tree was parsed from, as text or UTF-8 bytes
+
+        Returns:
+            EditSession of the tree's source
+        """
+        data = source.encode('utf-8') if isinstance(source, str) else bytes(source)
+        return cls(parser=parser, buffer=TextBuffer(data), tree=tree)
+
+    @property
+    def source(self) -> bytes:
+        """Current source bytes."""
+        return bytes(self.buffer)
+
+    @property
+    def text(self) -> str:
+        """Current source as text."""
+        return self.buffer.text()
+
+    def point_at(self, byte: int) -> Tuple[int, int]:
+        """Get the (row, byte column) of a byte offset in the current source."""
+        return self.buffer.point_at(byte)
+
+    def byte_at(self, point: Tuple[int, int]) -> int:
+        """Get the byte offset of a (row, byte column) in the current source.
+
+        Raises:
+            EditorError: If the row is past the end of the source
+        """
+        return self.buffer.byte_at(point)
+
+    def map_byte(self, byte: int) -> Optional[int]:
+        """Map a byte offset from before the last batch of edits to the current source.
+
+        Returns:
+            The offset in the current source, or None if the byte was
+            inside replaced text
+        """
+        shift = 0
+        for start_byte, old_end_byte, new_end_byte in self.edits:
+            if byte >= old_end_byte:
+                shift += new_end_byte - old_end_byte
+            elif byte > start_byte:
+                return None
+        return byte + shift
+
+    def affected_ranges(self) -> List[Tuple[int, int]]:
+        """Get the byte ranges touched by the last batch of edits.
+
+        Covers the syntax changes reported by tree-sitter and the replaced
+        text itself, which changes node text without changing syntax (for
+        example renaming an identifier).
+
+        Returns:
+            Sorted, non-overlapping (start_byte, end_byte) ranges in the
+            current source
+        """
+        ranges = [(r.start_byte, r.end_byte) for r in self.changed_ranges]
+        shift = 0
+        for start_byte, old_end_byte, new_end_byte in self.edits:
+            ranges.append((start_byte + shift, new_end_byte + shift))
+            shift += new_end_byte - old_end_byte
+        merged: List[Tuple[int, int]] = []
+        for start_byte, end_byte in sorted(ranges):
+            if merged and start_byte <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end_byte))
+            else:
+                merged.append((start_byte, end_byte))
+        return merged
+
+    def replace(self, start_byte: int, old_end_byte: int, new_text: Union[str, bytes]) -> Tree:
+        """Replace a byte range and reparse.
+
+        Args:
+            start_byte: First byte to replace
+            old_end_byte: End of the bytes to replace
+            new_text: Replacement text
+
+        Returns:
+            The new tree
+        """
+        return self.apply_edits([TextEdit(start_byte, old_end_byte, new_text)])
+
+    def apply_edits(self, edits: Sequence[TextEdit]) -> Tree:
+        """Apply a batch of edits and reparse incrementally.
+
+        Edits are given in coordinates of the source before the batch and
+        must not overlap. Any object with ``start_byte``, ``old_end_byte``
+        and ``new_text`` attributes (such as ``EditOperation``) is accepted;
+        points are always recomputed from the source.
+
+        Args:
+            edits: Edits to apply
+
+        Returns:
+            The new tree
+
+        Raises:
+            EditorError: If an edit is out of bounds or the reparse fails
+        """
+        # Nodes of the current tree stay valid only while it is not edited,
+        # so the edits go to a copy
+        tree = self.tree.copy()
+        applied = []
+        # Applied back to front, so earlier offsets stay valid
+        for edit in sorted(edits, key=lambda e: e.start_byte, reverse=True):
+            start_byte, old_end_byte = edit.start_byte, edit.old_end_byte
+            if not 0 <= start_byte <= old_end_byte <= len(self.buffer):
+                raise EditorError(
+                    f"Edit range {start_byte}-{old_end_byte} outside of source "
+                    f"({len(self.buffer)} bytes)")
+            new_text = edit.new_text
+            new_bytes = new_text.encode('utf-8') if isinstance(new_text, str) else bytes(new_text)
+
+            start_point = self.point_at(start_byte)
+            old_end_point = self.point_at(old_end_byte)
+            newlines = new_bytes.count(b'\n')
+            if newlines:
+                new_end_point = (start_point[0] + newlines, len(new_bytes) - new_bytes.rfind(b'\n') - 1)
+            else:
+                new_end_point = (start_point[0], start_point[1] + len(new_bytes))
+
+            self.buffer.replace(start_byte, old_end_byte, new_bytes)
+            applied.append((start_byte, old_end_byte, start_byte + len(new_bytes)))
+            tree.edit(
+                start_byte=start_byte,
+                old_end_byte=old_end_byte,
+                new_end_byte=start_byte + len(new_bytes),
+                start_point=start_point,
+                old_end_point=old_end_point,
+                new_end_point=new_end_point
+            )
+
+        # Passing the edited tree lets tree-sitter reuse unchanged subtrees;
+        # the buffer hands over only the chunks the parser reads
+        new_tree = self.parser.parse(self.buffer.read, tree)
+        if new_tree is None:
+            raise EditorError("Failed to reparse content after edits")
+        self.changed_ranges = list(tree.changed_ranges(new_tree))
+        self.previous_tree = self.tree
+        self.tree = new_tree
+        self.edits = applied[::-1]
+        return new_tree
@@ -25,6 +25,8 @@ from GithubAnalyzer.services.parsers.core.language_service import \
     LanguageService
 from GithubAnalyzer.services.parsers.core.traversal_service import \
     TreeSitterTraversal
+from GithubAnalyzer.services.analysis.parsers.edit_session import \
+    EditSession
 from GithubAnalyzer.utils.logging import get_logger
 
 # Initialize logger
@@ -38,6 +40,7 @@ class TreeSitterEditor:
     _traversal: TreeSitterTraversal = field(default_factory=TreeSitterTraversal)
     _parser: Optional[Parser] = field(default=None)
     _text: str = field(default="")
+    _session: Optional[EditSession] = field(default=None)
     _log_handler: Any = field(default_factory=lambda: logger)
     _operation_times: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
     
@@ -578,12 +581,44 @@ class TreeSitterEditor:
             return False
         return True
 
-    def update_tree_with_edits(self, tree: Tree, edits: List[TreeSitterEdit]) -> Tree:
-        """Update a tree with edits.
+    def start_session(self, code: str, language: str) -> EditSession:
+        """Parse code and start an incremental edit session on it.
+        
+        Later calls to ``update_tree_with_edits`` with the session's tree
+        reuse its source buffer instead of rebuilding it from the tree.
+        
+        Args:
+            code: The code to edit
+            language: The language of the code
+            
+        Returns:
+            The new edit session
+            
+        Raises:
+            EditorError: If parsing fails
+        """
+        parser = self._language_service.get_parser(language)
+        self._session = EditSession.start(parser, code)
+        return self._session
+
+    @property
+    def changed_ranges(self) -> List[Range]:
+        """Ranges whose syntax changed in the last ``update_tree_with_edits``."""
+        return self._session.changed_ranges if self._session else []
+
+    def update_tree_with_edits(self, tree: Tree, edits: List[TreeSitterEdit],
+                               source: Optional[Union[str, bytes]] = None) -> Tree:
+        """Update a tree with edits, reparsing incrementally.
+        
+        The edited old tree is handed to the parser, so only the regions
+        touched by the edits are reparsed. Afterwards ``changed_ranges``
+        holds the ranges whose syntax changed.
         
         Args:
             tree: Tree to update
-            edits: List of edits to apply
+            edits: Edits to apply, in coordinates of the tree's text
+            source: Content the tree was parsed from; only needed when the
+                tree does not come from ``start_session`` or an earlier update
             
         Returns:
             Updated tree
@@ -593,22 +628,16 @@ class TreeSitterEditor:
         """
         start_time = self._time_operation('update_tree_with_edits')
         try:
-            # Apply edits to the tree
-            for edit in edits:
-                tree.edit(
-                    start_byte=edit.start_byte,
-                    old_end_byte=edit.old_end_byte,
-                    new_end_byte=edit.new_end_byte,
-                    start_point=edit.start_point,
-                    old_end_point=edit.old_end_point,
-                    new_end_point=edit.new_end_point
-                )
+            session = self._session
+            if session is None or session.tree is not tree:
+                if source is None:
+                    raise ParserError(
+                        "Source of the tree is unknown; pass it or use start_session"
+                    )
+                parser = self._parser or Parser(tree.language)
+                session = self._session = EditSession.from_tree(parser, tree, source)
                 
-            # Get the updated text by applying the edits
-            text = self._get_text_with_edits(tree.root_node.text.decode('utf8'), edits)
-
-            # Reparse tree with the updated text
-            new_tree = self._parser.parse(text.encode('utf-8'))
+            new_tree = session.apply_edits(edits)
             if not self._validate_tree(new_tree):
                 raise ParserError("Failed to reparse tree after edits")
                 
@@ -619,25 +648,6 @@ class TreeSitterEditor:
         finally:
             self._end_operation('update_tree_with_edits', start_time)
 
-    def _get_text_with_edits(self, text: str, edits: List[TreeSitterEdit]) -> str:
-        """Get text with edits applied.
-        
-        Args:
-            text: Original text
-            edits: List of edits to apply
-            
-        Returns:
-            Updated text
-        """
-        # Sort edits by start byte in reverse order to apply from end to start
-        sorted_edits = sorted(edits, key=lambda x: x.start_byte, reverse=True)
-
-        # Apply each edit to the text
-        for edit in sorted_edits:
-            text = text[:edit.start_byte] + edit.new_text + text[edit.old_end_byte:]
-
-        return text
-
     def _time_operation(self, operation_name: str) -> float:
         """Start timing an operation."""
         start_time = time.time()
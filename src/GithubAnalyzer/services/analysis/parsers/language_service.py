@@ -1,5 +1,6 @@
 """Language service for managing tree-sitter language support."""
 import json
+import logging
 import re
 import threading
 import time
@@ -21,8 +22,9 @@ from GithubAnalyzer.models.core.language import (EXTENSION_TO_LANGUAGE,
                                                  LanguageFeatures,
                                                  LanguageInfo,
                                                  get_base_language)
-from GithubAnalyzer.models.core.tree_sitter_core import get_node_text
-from GithubAnalyzer.utils.logging import get_logger
+from GithubAnalyzer.models.core.tree_sitter_core import (get_node_text,
+                                                         iter_error_nodes)
+from GithubAnalyzer.utils.logging import get_logger, get_tree_sitter_logger
 
 from .query_patterns import (EXTENSION_TO_LANGUAGE, QUERY_PATTERNS,
                              SPECIAL_FILENAMES)
@@ -34,6 +36,29 @@ from GithubAnalyzer.services.parsers.core.custom_parsers import \
 
 # Initialize logger with correlation ID
 logger = get_logger(__name__, correlation_id='language_service')
+ts_logger = get_tree_sitter_logger()
+
+CSHARP_ALIASES = ('c_sharp', 'c#', 'csharp')
+
+# Language objects are immutable and shared by every thread
+_languages: Dict[str, Language] = {}
+_languages_lock = threading.Lock()
+
+# Parsers are not thread-safe, so each thread (and, after a fork, each
+# worker process) keeps its own parser per language
+_parser_pool = threading.local()
+
+
+def _tree_sitter_log(log_type: int, msg: str) -> None:
+    """Forward tree-sitter's parse and lex messages to the tree-sitter logger."""
+    level = logging.ERROR if log_type == 1 else logging.DEBUG
+    ts_logger.log(level, msg, extra={
+        'context': {
+            'source': 'tree-sitter',
+            'type': 'parser',
+            'log_type': 'error' if log_type == 1 else 'parse'
+        }
+    })
 
 @dataclass
 class LanguageService(TreeSitterServiceBase):
@@ -146,16 +171,10 @@ class LanguageService(TreeSitterServiceBase):
         Returns:
             True if the language is supported
         """
-        normalized_lang = language.lower().strip()
-        if normalized_lang in ['c_sharp', 'c#', 'csharp']:
-            return True
-        else:
-            try:
-                from tree_sitter_language_pack import get_language
-                lang_obj = get_language(language)
-                return lang_obj is not None
-            except Exception:
-                return False
+        try:
+            return self.get_tree_sitter_language(language) is not None
+        except LanguageError:
+            return False
 
     def get_tree_sitter_language(self, language: str):
         """
@@ -174,38 +193,52 @@ class LanguageService(TreeSitterServiceBase):
             LanguageError: If the language cannot be obtained.
         """
         normalized_lang = language.lower().strip()
-        if normalized_lang in ['c_sharp', 'c#', 'csharp']:
-            import tree_sitter_c_sharp as tscsharp
-            from tree_sitter import Language
-            return Language(tscsharp.language())
+        if normalized_lang in CSHARP_ALIASES:
+            normalized_lang = 'c_sharp'
+        lang_obj = _languages.get(normalized_lang)
+        if lang_obj is not None:
+            return lang_obj
+
+        if normalized_lang == 'c_sharp':
+            lang_obj = Language(tscsharp.language())
         else:
             try:
-                from tree_sitter_language_pack import get_language
-                lang_obj = get_language(language)
-                if not lang_obj:
-                    from GithubAnalyzer.models.core.errors import LanguageError
-                    raise LanguageError(f"Failed to obtain language object for {language}.")
-                return lang_obj
+                lang_obj = get_language(normalized_lang)
             except Exception as e:
-                from GithubAnalyzer.models.core.errors import LanguageError
                 raise LanguageError(f"Error obtaining tree-sitter language for {language}: {str(e)}")
+            if not lang_obj:
+                raise LanguageError(f"Failed to obtain language object for {language}.")
+        with _languages_lock:
+            return _languages.setdefault(normalized_lang, lang_obj)
 
     def get_parser(self, language: str) -> Parser:
         """
         Get a tree-sitter parser for the given language.
         For C# (c_sharp), use the tree-sitter-c-sharp package.
         For all other languages, use tree_sitter_language_pack.
+
+        Parsers come from a per-thread pool: the first call for a language
+        in a thread creates the parser, later calls return the same one.
+        The returned parser must not be handed to another thread. When
+        tree-sitter debug logging is enabled, the log callback is installed
+        once when the parser is created.
         """
-        language_lower = language.lower()
-        if language_lower in ['c_sharp', 'c#', 'csharp']:
-            import tree_sitter_c_sharp as tscsharp
-            from tree_sitter import Language, Parser
-            CSHARP_LANGUAGE = Language(tscsharp.language())
-            parser = Parser(CSHARP_LANGUAGE)
-            return parser
-        else:
-            from tree_sitter_language_pack import get_parser
-            return get_parser(language_lower)
+        language_lower = language.lower().strip()
+        if language_lower in CSHARP_ALIASES:
+            language_lower = 'c_sharp'
+        parsers = getattr(_parser_pool, 'parsers', None)
+        if parsers is None:
+            parsers = _parser_pool.parsers = {}
+        parser = parsers.get(language_lower)
+        if parser is None:
+            parser = Parser(self.get_tree_sitter_language(language_lower))
+            if ts_logger.isEnabledFor(logging.DEBUG):
+                parser.logger = _tree_sitter_log
+            parsers[language_lower] = parser
+            self._log("debug", "Created pooled parser",
+                    operation="get_parser",
+                    language=language_lower)
+        return parser
 
     def get_language_object(self, language: str) -> Language:
         """Get the tree-sitter Language object for a language.
@@ -222,7 +255,7 @@ class LanguageService(TreeSitterServiceBase):
         start_time = self._time_operation('get_language_object')
         try:
             normalized_lang = language.lower().strip()
-            if normalized_lang in ['c_sharp', 'c#', 'csharp']:
+            if normalized_lang in CSHARP_ALIASES:
                 lang_obj = self.get_tree_sitter_language(language)
                 if not lang_obj:
                     raise LanguageError(f"Failed to get language object for: {language}")
@@ -383,12 +416,7 @@ class LanguageService(TreeSitterServiceBase):
 
     def _find_error_nodes(self, node: Node) -> List[Node]:
         """Find all error nodes in a tree."""
-        errors = []
-        if node.has_error:
-            errors.append(node)
-        for child in node.children:
-            errors.extend(self._find_error_nodes(child))
-        return errors
+        return list(iter_error_nodes(node))
 
     def get_binding(self, language: str) -> int:
         """Get language binding using tree-sitter-language-pack.
@@ -435,13 +463,6 @@ class LanguageService(TreeSitterServiceBase):
             parser = self.get_parser(language)
             if not parser:
                 raise ParserError(f"Failed to get parser for language: {language}")
-            
-            # Set up logging callback for this parse operation
-            def logger_callback(msg: str) -> None:
-                self._log("debug", msg, operation="parse", language=language)
-            
-            # Set the logger for this parse operation
-            parser.logger = logger_callback
                 
             # Parse the content
             tree = parser.parse(bytes(content, "utf8"))
@@ -453,9 +474,6 @@ class LanguageService(TreeSitterServiceBase):
             self._log("error", f"Error parsing content: {str(e)}")
             return None
         finally:
-            # Clean up logger after parsing
-            if 'parser' in locals():
-                parser.logger = None
             self._end_operation('parse_content', start_time)
 
     def _initialize_patterns(self):
@@ -0,0 +1,192 @@
+"""Ahead-of-time compilation of the query pattern library.
+
+Patterns are otherwise compiled lazily, the first time a file needs them,
+so a broken pattern only shows up as a failed query in the middle of a
+run and the first repository processed pays for every compilation.
+``warm_up_patterns`` compiles every pattern of every language once, stores
+the compiled queries in the process-wide query cache and reports compile
+times and invalid patterns.
+
+Compiled tree-sitter queries cannot be serialized, so the warm cache lives
+as long as the process does; long-running processes should warm up once at
+start-up (see ``IngestionConfig.warm_up_patterns``).
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tree_sitter import Query
+
+from GithubAnalyzer.models.core.errors import LanguageError
+from GithubAnalyzer.services.analysis.parsers.language_service import \
+    LanguageService
+from GithubAnalyzer.services.parsers.core.query_cache import (QueryCache,
+                                                              get_query_cache)
+from GithubAnalyzer.utils.logging import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+
+@dataclass
+class PatternCompileResult:
+    """Outcome of compiling one pattern.
+
+    Attributes:
+        language: Language the pattern belongs to
+        pattern_name: Name of the pattern in its registry
+        source: Registry the pattern comes from
+        compile_ms: Time spent compiling, 0 for cache hits
+        error: Compile error, or None if the pattern is valid
+    """
+    language: str
+    pattern_name: str
+    source: str
+    compile_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the pattern compiled."""
+        return self.error is None
+
+
+@dataclass
+class PatternWarmupReport:
+    """Summary of a warm-up run.
+
+    Attributes:
+        results: One result per distinct (language, pattern)
+        skipped_languages: Languages without a tree-sitter grammar, with the reason
+        total_ms: Wall time of the whole warm-up
+    """
+    results: List[PatternCompileResult] = field(default_factory=list)
+    skipped_languages: Dict[str, str] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    @property
+    def compiled(self) -> List[PatternCompileResult]:
+        """Patterns that compiled."""
+        return [result for result in self.results if result.is_valid]
+
+    @property
+    def invalid(self) -> List[PatternCompileResult]:
+        """Patterns that failed to compile."""
+        return [result for result in self.results if not result.is_valid]
+
+    def slowest(self, count: int = 10) -> List[PatternCompileResult]:
+        """Patterns that took longest to compile."""
+        return sorted(self.compiled, key=lambda result: result.compile_ms, reverse=True)[:count]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a JSON-serializable dict."""
+        return {
+            'total_ms': self.total_ms,
+            'compile_ms': sum(result.compile_ms for result in self.results),
+            'compiled': len(self.compiled),
+            'invalid': [result.__dict__ for result in self.invalid],
+            'skipped_languages': self.skipped_languages,
+            'slowest': [result.__dict__ for result in self.slowest()]
+        }
+
+
+def iter_registered_patterns(languages: Optional[Iterable[str]] = None
+                             ) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield every pattern of the pattern registries.
+
+    Both the ``query_patterns`` registry (including the common patterns it
+    adds to every language) and the ``patterns`` package are covered.
+    Identical patterns registered twice for a language are yielded once.
+
+    Args:
+        languages: Only yield patterns of these languages
+
+    Yields:
+        (language, pattern_name, source, pattern) tuples
+    """
+    # Imported here: both registries are large and only needed for warm-up
+    from GithubAnalyzer.services.analysis.parsers.patterns import \
+        LANGUAGE_PATTERNS
+    from GithubAnalyzer.services.analysis.parsers.query_patterns import (
+        QUERY_PATTERNS, get_language_patterns)
+
+    wanted = set(languages) if languages is not None else None
+    registries = (
+        ('query_patterns', {language: get_language_patterns(language) for language in QUERY_PATTERNS}),
+        ('patterns', LANGUAGE_PATTERNS),
+    )
+    seen = set()
+    for source, registry in registries:
+        for language, patterns in registry.items():
+            if wanted is not None and language not in wanted:
+                continue
+            for name, pattern in patterns.items():
+                if not isinstance(pattern, str) or (language, pattern) in seen:
+                    continue
+                seen.add((language, pattern))
+                yield language, name, source, pattern
+
+
+def warm_up_patterns(languages: Optional[Iterable[str]] = None,
+                     query_cache: Optional[QueryCache] = None,
+                     language_service: Optional[LanguageService] = None) -> PatternWarmupReport:
+    """Compile every registered pattern into the query cache.
+
+    The cache is grown if needed so that warming up never evicts the
+    queries it just compiled.
+
+    Args:
+        languages: Only warm up these languages
+        query_cache: Cache to fill; defaults to the process-wide cache
+        language_service: Service providing tree-sitter languages
+
+    Returns:
+        Report with compile times, invalid patterns and skipped languages
+    """
+    start_time = time.perf_counter()
+    query_cache = query_cache if query_cache is not None else get_query_cache()
+    language_service = language_service or LanguageService()
+    report = PatternWarmupReport()
+
+    patterns = list(iter_registered_patterns(languages))
+    query_cache.max_size = max(query_cache.max_size, len(query_cache) + len(patterns))
+
+    for language, name, source, pattern in patterns:
+        if language in report.skipped_languages:
+            continue
+        try:
+            lang_obj = language_service.get_tree_sitter_language(language)
+        except LanguageError as e:
+            report.skipped_languages[language] = str(e)
+            continue
+
+        result = PatternCompileResult(language=language, pattern_name=name, source=source)
+        compile_start = time.perf_counter()
+        try:
+            query_cache.get(language, pattern, lambda: Query(lang_obj, pattern))
+        except Exception as e:
+            result.error = str(e)
+        result.compile_ms = (time.perf_counter() - compile_start) * 1000
+        report.results.append(result)
+        if not result.is_valid:
+            logger.warning("Invalid query pattern", extra={
+                'context': {
+                    'module': 'pattern_warmup',
+                    'language': language,
+                    'pattern_name': name,
+                    'source': source,
+                    'error': result.error
+                }
+            })
+
+    report.total_ms = (time.perf_counter() - start_time) * 1000
+    logger.info("Query patterns warmed up", extra={
+        'context': {
+            'module': 'pattern_warmup',
+            'compiled': len(report.compiled),
+            'invalid': len(report.invalid),
+            'skipped_languages': sorted(report.skipped_languages),
+            'duration_ms': report.total_ms
+        }
+    })
+    return report
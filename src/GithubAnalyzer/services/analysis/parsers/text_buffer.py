@@ -0,0 +1,289 @@
+"""Piece table text buffer for incremental editing.
+
+A ``TextBuffer`` never copies the text it was created from. Its content is
+a sequence of pieces, each a slice of either the original bytes or an
+append-only buffer holding all inserted text. The pieces are kept in a
+treap ordered by position, whose nodes also sum up the bytes and newlines
+of their subtrees, so replacing a range and converting between byte
+offsets and (row, column) points take O(log n) expected time regardless
+of the file size or the number of edits already made.
+
+The buffer hands its content to tree-sitter in chunks through ``read``,
+so a reparse never needs the whole file as one bytes object.
+"""
+import random
+from bisect import bisect_left
+from typing import List, Optional, Tuple, Union
+
+from GithubAnalyzer.models.core.errors import EditorError
+
+# Largest chunk ``read`` returns, so seeking into a large piece does not
+# copy the rest of it
+READ_CHUNK_SIZE = 64 * 1024
+
+_ORIGINAL = 0
+_ADDED = 1
+
+
+class _Piece:
+    """Treap node: a slice of one of the buffers plus subtree totals."""
+    __slots__ = ('source', 'start', 'length', 'newlines', 'priority',
+                 'left', 'right', 'size', 'lines')
+
+    def __init__(self, source: int, start: int, length: int, newlines: int):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.newlines = newlines
+        self.priority = random.random()
+        self.left: Optional['_Piece'] = None
+        self.right: Optional['_Piece'] = None
+        self.size = length
+        self.lines = newlines
+
+    def update(self) -> '_Piece':
+        """Recompute the subtree totals from the children."""
+        size, lines = self.length, self.newlines
+        if self.left is not None:
+            size += self.left.size
+            lines += self.left.lines
+        if self.right is not None:
+            size += self.right.size
+            lines += self.right.lines
+        self.size, self.lines = size, lines
+        return self
+
+
+class TextBuffer:
+    """Byte buffer supporting O(log n) range replacement and point conversion.
+
+    Points are (row, column) pairs with the column counted in bytes, as
+    in tree-sitter.
+    """
+
+    def __init__(self, data: Union[str, bytes] = b''):
+        """Create a buffer holding ``data``.
+
+        Args:
+            data: Initial content, as text or UTF-8 bytes
+        """
+        original = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+        self._buffers: Tuple[bytes, bytearray] = (original, bytearray())
+        # Offsets of the newlines in each buffer, for counting them in a slice
+        self._newline_offsets: Tuple[List[int], List[int]] = (_newline_offsets(original, 0), [])
+        self._root: Optional[_Piece] = None
+        if original:
+            self._root = _Piece(_ORIGINAL, 0, len(original), len(self._newline_offsets[_ORIGINAL]))
+
+    def __len__(self) -> int:
+        return self._root.size if self._root is not None else 0
+
+    def __bytes__(self) -> bytes:
+        return b''.join(self._chunks(self._root))
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines; an empty buffer has one."""
+        return (self._root.lines if self._root is not None else 0) + 1
+
+    def text(self) -> str:
+        """Get the content as text."""
+        return bytes(self).decode('utf-8', errors='replace')
+
+    def replace(self, start_byte: int, end_byte: int, data: Union[str, bytes]) -> None:
+        """Replace a byte range with new content.
+
+        Args:
+            start_byte: First byte to replace
+            end_byte: End of the bytes to replace
+            data: Replacement, as text or UTF-8 bytes
+
+        Raises:
+            EditorError: If the range is outside of the buffer
+        """
+        if not 0 <= start_byte <= end_byte <= len(self):
+            raise EditorError(f"Range {start_byte}-{end_byte} outside of buffer ({len(self)} bytes)")
+        data = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+        left, rest = self._split(self._root, start_byte)
+        _, right = self._split(rest, end_byte - start_byte)
+        if data:
+            added = self._buffers[_ADDED]
+            offset = len(added)
+            added.extend(data)
+            newlines = _newline_offsets(data, offset)
+            self._newline_offsets[_ADDED].extend(newlines)
+            left = self._merge(left, _Piece(_ADDED, offset, len(data), len(newlines)))
+        self._root = self._merge(left, right)
+
+    def insert(self, byte: int, data: Union[str, bytes]) -> None:
+        """Insert content at a byte offset."""
+        self.replace(byte, byte, data)
+
+    def delete(self, start_byte: int, end_byte: int) -> None:
+        """Delete a byte range."""
+        self.replace(start_byte, end_byte, b'')
+
+    def point_at(self, byte: int) -> Tuple[int, int]:
+        """Get the (row, column) of a byte offset.
+
+        Raises:
+            EditorError: If the offset is outside of the buffer
+        """
+        if not 0 <= byte <= len(self):
+            raise EditorError(f"Byte {byte} outside of buffer ({len(self)} bytes)")
+        row = self._newlines_before(byte)
+        return row, byte - self.line_start(row)
+
+    def byte_at(self, point: Tuple[int, int]) -> int:
+        """Get the byte offset of a (row, column).
+
+        Raises:
+            EditorError: If the row is past the end of the buffer
+        """
+        row, column = point
+        return self.line_start(row) + column
+
+    def line_start(self, row: int) -> int:
+        """Get the byte offset a row starts at.
+
+        Raises:
+            EditorError: If the row is past the end of the buffer
+        """
+        if not 0 <= row < self.line_count:
+            raise EditorError(f"Row {row} outside of buffer ({self.line_count} lines)")
+        if row == 0:
+            return 0
+        # Find the piece holding the row-th newline; the row starts after it
+        node, offset, remaining = self._root, 0, row
+        while True:
+            left_lines = node.left.lines if node.left is not None else 0
+            if remaining <= left_lines:
+                node = node.left
+                continue
+            offset += node.left.size if node.left is not None else 0
+            remaining -= left_lines
+            if remaining <= node.newlines:
+                newlines = self._newline_offsets[node.source]
+                first = bisect_left(newlines, node.start)
+                return offset + newlines[first + remaining - 1] - node.start + 1
+            offset += node.length
+            remaining -= node.newlines
+            node = node.right
+
+    def slice(self, start_byte: int, end_byte: int) -> bytes:
+        """Get the bytes of a range."""
+        parts = []
+        byte = max(start_byte, 0)
+        while byte < min(end_byte, len(self)):
+            chunk = self._chunk_at(byte, end_byte - byte)
+            parts.append(chunk)
+            byte += len(chunk)
+        return b''.join(parts)
+
+    def read(self, byte: int, point: Optional[Tuple[int, int]] = None) -> bytes:
+        """Read callback for tree-sitter's chunked input API.
+
+        Args:
+            byte: Offset to read from
+            point: Point of the offset; unused
+
+        Returns:
+            Bytes starting at the offset, empty at the end of the buffer
+        """
+        if byte >= len(self):
+            return b''
+        return self._chunk_at(byte, READ_CHUNK_SIZE)
+
+    def _chunk_at(self, byte: int, limit: int) -> bytes:
+        """Get the bytes from an offset to the end of its piece, at most ``limit``."""
+        node, offset = self._root, byte
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if offset < left_size:
+                node = node.left
+            elif offset < left_size + node.length:
+                start = node.start + offset - left_size
+                end = min(node.start + node.length, start + limit)
+                return bytes(self._buffers[node.source][start:end])
+            else:
+                offset -= left_size + node.length
+                node = node.right
+
+    def _newlines_before(self, byte: int) -> int:
+        """Count the newlines before a byte offset."""
+        node, offset, count = self._root, byte, 0
+        while node is not None:
+            left_size = node.left.size if node.left is not None else 0
+            if offset <= left_size:
+                node = node.left
+                continue
+            if node.left is not None:
+                count += node.left.lines
+            offset -= left_size
+            if offset <= node.length:
+                return count + self._count_newlines(node, offset)
+            count += node.newlines
+            offset -= node.length
+            node = node.right
+        return count
+
+    def _count_newlines(self, node: _Piece, length: int) -> int:
+        """Count the newlines in the first ``length`` bytes of a piece."""
+        newlines = self._newline_offsets[node.source]
+        return bisect_left(newlines, node.start + length) - bisect_left(newlines, node.start)
+
+    def _split(self, node: Optional[_Piece], byte: int) -> Tuple[Optional[_Piece], Optional[_Piece]]:
+        """Split a subtree into the pieces before and after a byte offset."""
+        if node is None:
+            return None, None
+        left_size = node.left.size if node.left is not None else 0
+        if byte <= left_size:
+            left, node.left = self._split(node.left, byte)
+            return left, node.update()
+        if byte >= left_size + node.length:
+            node.right, right = self._split(node.right, byte - left_size - node.length)
+            return node.update(), right
+        # The offset falls inside this piece, which is cut in two
+        cut = byte - left_size
+        head_newlines = self._count_newlines(node, cut)
+        tail = _Piece(node.source, node.start + cut, node.length - cut, node.newlines - head_newlines)
+        # Taking over the piece's priority keeps the heap order of its subtree
+        tail.priority = node.priority
+        tail.right, node.right = node.right, None
+        node.length, node.newlines = cut, head_newlines
+        return node.update(), tail.update()
+
+    def _merge(self, left: Optional[_Piece], right: Optional[_Piece]) -> Optional[_Piece]:
+        """Concatenate two subtrees."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            return left.update()
+        right.left = self._merge(left, right.left)
+        return right.update()
+
+    def _chunks(self, node: Optional[_Piece]) -> List[bytes]:
+        """Get the content of a subtree, one slice per piece."""
+        chunks: List[bytes] = []
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            chunks.append(self._buffers[node.source][node.start:node.start + node.length])
+            node = node.right
+        return chunks
+
+
+def _newline_offsets(data: bytes, base: int) -> List[int]:
+    """Get the offsets of the newlines in ``data``, shifted by ``base``."""
+    offsets = []
+    index = data.find(b'\n')
+    while index != -1:
+        offsets.append(base + index)
+        index = data.find(b'\n', index + 1)
+    return offsets
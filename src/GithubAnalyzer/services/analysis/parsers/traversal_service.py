@@ -2,17 +2,22 @@
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, Generator, List, Optional, Set, Tuple, Union
+from typing import (Any, Dict, Generator, Iterable, List, Optional, Set,
+                    Tuple, Union)
 
 from tree_sitter import (Language, Node, Parser, Point, Query, Range, Tree,
                          TreeCursor)
-from tree_sitter_language_pack import get_parser
 
 from GithubAnalyzer.models.analysis.types import NodeDict, NodeList
 from GithubAnalyzer.models.core.errors import TraversalError
+from GithubAnalyzer.models.core.traversal import PRE_ORDER
+from GithubAnalyzer.models.core.traversal import walk_tree as _walk_tree
+from GithubAnalyzer.models.core.tree_sitter_core import (find_missing_nodes,
+                                                         iter_error_nodes)
 from GithubAnalyzer.services.analysis.parsers.language_service import \
     LanguageService
 from GithubAnalyzer.services.core.base_service import BaseService
+from GithubAnalyzer.services.parsers.core.query_cache import get_query_cache
 from GithubAnalyzer.utils.logging import get_logger
 
 from .utils import (TreeSitterServiceBase, get_node_text, get_node_text_safe,
@@ -52,7 +57,7 @@ class TraversalService(BaseService, TreeSitterServiceBase):
                 
         try:
             nodes = []
-            for node in self._traverse_node(tree.root_node):
+            for node in _walk_tree(tree.root_node):
                 if not is_valid_node(node):
                     continue
                     
@@ -73,23 +78,6 @@ class TraversalService(BaseService, TreeSitterServiceBase):
                     error=str(e))
             raise TraversalError(f"Failed to traverse tree: {str(e)}")
             
-    def _traverse_node(self, node: Node) -> Generator[Node, None, None]:
-        """Traverse a node and its children.
-        
-        Args:
-            node: The node to traverse
-            
-        Yields:
-            Each node in the traversal
-        """
-        if not node:
-            return
-            
-        yield node
-        
-        for child in node.children:
-            yield from self._traverse_node(child)
-
     def find_nodes_in_range(self, root: Node, range_obj: Range) -> List[Node]:
         """Find nodes in range using tree-sitter queries.
         
@@ -129,7 +117,9 @@ class TraversalService(BaseService, TreeSitterServiceBase):
                 self._log("error", "Could not determine language from root node")
                 return []
                 
-            query = Query(self._language_service.get_language_object(language), query_str)
+            query = get_query_cache().get(
+                language, query_str,
+                lambda: Query(self._language_service.get_language_object(language), query_str))
             captures = query.captures(root)
             nodes = [capture[0] for capture in captures]
                     
@@ -270,35 +260,21 @@ class TraversalService(BaseService, TreeSitterServiceBase):
 
     def find_nodes_by_type(self, node: Node, node_type: str) -> List[Node]:
         """Find all nodes of a specific type."""
-        nodes = []
-        cursor = node.walk()
-        
-        while True:
-            if cursor.node.type == node_type:
-                nodes.append(cursor.node)
-            
-            if not cursor.goto_first_child():
-                while not cursor.goto_next_sibling():
-                    if not cursor.goto_parent():
-                        return nodes
-        return nodes
+        return list(_walk_tree(node, types=node_type))
 
     def find_node_at_position(self, node: Node, point: Point) -> Optional[Node]:
         """Find the smallest node containing a point."""
+        if not node or not (node.start_point <= point <= node.end_point):
+            return None
         cursor = node.walk()
-        
+        # Descend into the first child containing the point until none does
         while True:
-            if (cursor.node.start_point <= point and 
-                point <= cursor.node.end_point):
-                
-                if cursor.goto_first_child():
-                    continue
+            if not cursor.goto_first_child():
                 return cursor.node
-            
-            if not cursor.goto_next_sibling():
-                if not cursor.goto_parent():
-                    return None
-        return None
+            while not (cursor.node.start_point <= point <= cursor.node.end_point):
+                if not cursor.goto_next_sibling():
+                    cursor.goto_parent()
+                    return cursor.node
 
     def find_child_by_field(self, node: Node, field_name: str) -> Optional[Node]:
         """Find a child node by its field name."""
@@ -336,37 +312,23 @@ class TraversalService(BaseService, TreeSitterServiceBase):
             return None
 
     @staticmethod
-    def walk_tree(node: Node) -> Generator[Node, None, None]:
+    def walk_tree(node: Node, order: str = PRE_ORDER, named_only: bool = False,
+                  max_depth: Optional[int] = None,
+                  types: Optional[Union[str, Iterable[str]]] = None) -> Generator[Node, None, None]:
         """Walk a tree using tree-sitter's native cursor API.
         
         Args:
             node: Root node to start traversal from
+            order: PRE_ORDER or POST_ORDER
+            named_only: Only yield named nodes
+            max_depth: Do not descend below this depth; the root is depth 0
+            types: Only yield nodes of this type or these types
             
         Yields:
             Each node in the tree in traversal order
         """
-        if not node:
-            return
-
-        cursor = node.walk()
-        reached_root = False
-        
-        while not reached_root:
-            yield cursor.node
-            
-            if cursor.goto_first_child():
-                continue
-                
-            if cursor.goto_next_sibling():
-                continue
-                
-            while not reached_root:
-                if not cursor.goto_parent():
-                    reached_root = True
-                    break
-                    
-                if cursor.goto_next_sibling():
-                    break
+        return _walk_tree(node, order=order, named_only=named_only,
+                          max_depth=max_depth, types=types)
 
     def get_named_descendants(self, node: Node, start_byte: int = 0, end_byte: Optional[int] = None) -> List[Node]:
         """Get all named descendants in a byte range.
@@ -382,45 +344,17 @@ class TraversalService(BaseService, TreeSitterServiceBase):
         start_time = self._time_operation('get_named_descendants')
         
         try:
-            # Get language from root node's grammar name
-            language = node.grammar_name
-            if not language:
-                self._log("error", "Could not determine language from root node")
+            if not node:
                 return []
-                
-            # Create parser for getting node text
-            parser = get_parser(language)
-            
-            # Get text content
-            text = node.text.decode('utf8')
-            
-            # Default end_byte to text length if not specified
             if end_byte is None:
-                end_byte = len(text.encode('utf8'))
+                end_byte = node.end_byte
                 
-            # Track visited nodes to avoid duplicates
-            visited = set()
-            nodes = []
-            
-            def visit_node(current: Node) -> None:
-                if current.id in visited:
-                    return
-                visited.add(current.id)
-                
-                # Check if node is in range
-                if (current.start_byte >= start_byte and 
-                    current.end_byte <= end_byte and
-                    current.is_named):
-                    nodes.append(current)
-                    
-                # Visit children
-                for child in current.children:
-                    if (child.start_byte < end_byte and 
-                        child.end_byte > start_byte):
-                        visit_node(child)
-                        
-            visit_node(node)
-            return nodes
+            # Subtrees outside the range are skipped by the walk
+            return [
+                current for current in _walk_tree(node, named_only=True,
+                                                  byte_range=(start_byte, end_byte))
+                if current.start_byte >= start_byte and current.end_byte <= end_byte
+            ]
             
         finally:
             self._end_operation('get_named_descendants', start_time)
@@ -551,9 +485,10 @@ class TraversalService(BaseService, TreeSitterServiceBase):
     @staticmethod
     def walk_descendants(node: Node) -> Generator[Node, None, None]:
         """Walk through all descendants of a node."""
-        for child in node.children:
-            yield child
-            yield from TraversalService.walk_descendants(child)
+        nodes = _walk_tree(node)
+        # The walk starts with the node itself
+        next(nodes, None)
+        yield from nodes
 
     def walk_named_descendants(self, node: Node) -> Generator[Node, None, None]:
         """Walk through all named descendants of a node."""
@@ -562,25 +497,8 @@ class TraversalService(BaseService, TreeSitterServiceBase):
             return
             
         self._log("debug", f"Starting walk of named descendants from node type: {node.type}")
-        cursor = node.walk()
-        reached_root = False
-        
-        while not reached_root:
-            if cursor.node.is_named:
-                self._log("debug", f"Found named node during walk: {cursor.node.type}")
-                yield cursor.node
-                
-            if cursor.goto_first_child():
-                continue
-                
-            if cursor.goto_next_sibling():
-                continue
-                
-            while not reached_root:
-                if not cursor.goto_parent():
-                    reached_root = True
-                    self._log("debug", "Reached root node, walk complete")
-                    break
+        yield from _walk_tree(node, named_only=True)
+        self._log("debug", "Reached root node, walk complete")
 
     @staticmethod
     def get_next_node(node: Node) -> Optional[Node]:
@@ -697,11 +615,8 @@ class TraversalService(BaseService, TreeSitterServiceBase):
         if not node:
             return False
             
-        # Check for errors in node and its children
-        for n in self.walk_tree(node):
-            if self.has_errors(n):
-                return False
-        return True
+        # has_error covers the node's descendants as well
+        return not self.has_errors(node)
 
     def find_error_nodes(self, node: Node) -> List[Node]:
         """Find all error nodes in the tree.
@@ -712,16 +627,8 @@ class TraversalService(BaseService, TreeSitterServiceBase):
         Returns:
             List of nodes that have errors
         """
-        error_nodes = []
-        
-        def check_node(n: Node):
-            if n.has_error or n.type == "ERROR":
-                error_nodes.append(n)
-            for child in n.children:
-                check_node(child)
-                
-        check_node(node)
-        return error_nodes
+        # Error-free subtrees are skipped without being visited
+        return list(iter_error_nodes(node))
 
     def find_missing_nodes(self, node: Node) -> List[Node]:
         """Find all missing nodes in the tree.
@@ -732,16 +639,7 @@ class TraversalService(BaseService, TreeSitterServiceBase):
         Returns:
             List of nodes that are missing
         """
-        missing_nodes = []
-        
-        def check_node(n: Node):
-            if n.is_missing:
-                missing_nodes.append(n)
-            for child in n.children:
-                check_node(child)
-                
-        check_node(node)
-        return missing_nodes
+        return find_missing_nodes(node)
 
     def is_point_in_node_range(self, point: Point, node: Node) -> bool:
         """Check if a point is within a node's range.
@@ -768,18 +666,8 @@ class TraversalService(BaseService, TreeSitterServiceBase):
     @staticmethod
     def find_nodes_by_text(node: Node, text: str) -> List[Node]:
         """Find nodes containing specific text."""
-        nodes = []
-        cursor = node.walk()
-        
-        while True:
-            if cursor.node.text.decode('utf8').find(text) != -1:
-                nodes.append(cursor.node)
-            
-            if not cursor.goto_first_child():
-                while not cursor.goto_next_sibling():
-                    if not cursor.goto_parent():
-                        return nodes
-        return nodes
+        return [current for current in _walk_tree(node)
+                if current.text.decode('utf8').find(text) != -1]
 
     @staticmethod
     def get_node_text(node: Node) -> str:
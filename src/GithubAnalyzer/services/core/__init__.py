@@ -8,10 +8,13 @@ from .database.embedding_service import CodeEmbeddingService as EmbeddingService
 from .database.neo4j_service import Neo4jService
 from .database.postgres_service import PostgresService
 # File services
+from .file_policy import FilePolicy
 from .file_service import FileService
 # Parser services
+from .parse_cache import ParseCache
 from .parser_service import ParserService
 # Repository services
+from .file_processor import FileProcessor
 from .repo_processor import RepoProcessor
 
 __all__ = [
@@ -19,12 +22,15 @@ __all__ = [
     'BaseService',
     
     # File services
+    'FilePolicy',
     'FileService',
     
     # Parser services
+    'ParseCache',
     'ParserService',
     
     # Repository services
+    'FileProcessor',
     'RepoProcessor',
     
     # Database services
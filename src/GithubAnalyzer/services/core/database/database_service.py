@@ -1,15 +1,19 @@
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from GithubAnalyzer.models.analysis.query import ExtractionResult
 from GithubAnalyzer.models.core.db.database import (CodebaseQuery, CodeSnippet,
                                                     File, Function)
 from GithubAnalyzer.models.core.errors import ParserError
 from GithubAnalyzer.models.core.traversal import TreeSitterTraversal
 from GithubAnalyzer.services.analysis.code_analytics_service import \
     CodeAnalyticsService
+from GithubAnalyzer.services.analysis.parsers.edit_session import (EditSession,
+                                                                   TextEdit)
 from GithubAnalyzer.services.analysis.parsers.language_service import \
     LanguageService
 from GithubAnalyzer.services.analysis.parsers.query_patterns import \
@@ -25,11 +29,19 @@ from GithubAnalyzer.services.core.database.postgres_service import \
 from GithubAnalyzer.services.core.parser_service import ParserService
 from GithubAnalyzer.services.core.repo_processor import RepoProcessor
 from GithubAnalyzer.utils.db.cleanup import DatabaseCleaner
+from GithubAnalyzer.utils.hashing import content_hash
 from GithubAnalyzer.utils.logging import get_logger
 
 # Initialize logger
 logger = get_logger("database")
 
+# Edited files whose session is kept, so further edits of the result are
+# parsed and extracted incrementally
+MAX_EDIT_SESSIONS = 16
+
+# Element types served by the extraction query
+EXTRACTED_ELEMENTS = {'function': 'functions', 'class': 'classes', 'import': 'imports'}
+
 """Service for coordinated database operations and AI agent interactions.
 
 This service acts as a high-level coordinator between different components:
@@ -76,11 +88,14 @@ class DatabaseService:
         self.pg_service = PostgresService()
         self.neo4j_service = Neo4jService()
         self.cleaner = DatabaseCleaner()
-        self._parser_service = ParserService()
+        self._repo_processor = RepoProcessor()
+        # Share the ingestion parser so analysis uses the same parse cache
+        self._parser_service = self._repo_processor.parser_service
         self._editor = TreeSitterEditor()
         self._traversal = TreeSitterTraversal()
         self._language_service = LanguageService()
-        self._repo_processor = RepoProcessor()
+        # (language, content hash) -> session and extraction of that content
+        self._edit_sessions: OrderedDict = OrderedDict()
     
     def _get_context(self, **kwargs) -> Dict[str, Any]:
         """Get standard context for logging.
@@ -169,13 +184,16 @@ class DatabaseService:
         self.cleanup_databases()
         self.initialize_databases()
     
-    def analyze_repository(self, repo_url: str) -> str:
+    def analyze_repository(self, repo_url: str, workers: Optional[int] = None,
+                           incremental: Optional[bool] = None) -> str:
         """Analyze a GitHub repository and store its data.
         
         This is the main entry point for AI agents to process new repositories.
         
         Args:
             repo_url: URL of the GitHub repository to analyze
+            workers: Optional number of worker processes used for parsing
+            incremental: Only re-process files changed since the last analysis
             
         Returns:
             Repository ID for future reference
@@ -185,7 +203,8 @@ class DatabaseService:
             repo_id = pg.create_repository(repo_url)
             
             # Process repository contents (implemented in repo_processor.py)
-            self.process_repository(repo_id, repo_url)
+            self.process_repository(repo_id, repo_url, workers=workers,
+                                    incremental=incremental)
             
             return repo_id
     
@@ -599,6 +618,8 @@ class DatabaseService:
         """Edit code using tree-sitter.
         
         This method allows the AI agent to make precise edits to code while maintaining syntax validity.
+        The session of the result is remembered, so editing the modified code again only
+        reparses and re-extracts the regions the edits touch.
         
         Args:
             code: The code to edit
@@ -613,29 +634,40 @@ class DatabaseService:
             - modified_code: The edited code
             - is_valid: Whether the resulting code is syntactically valid
             - errors: List of any syntax errors
+            - changed_ranges: (start_byte, end_byte) ranges affected by the edits
+            - elements: Functions, classes and imports of the edited code
         """
+        language = language or 'python'
         try:
-            tree = self._editor.parse_code(code)
+            session, previous = self._get_edit_session(code, language)
+            session.apply_edits([
+                TextEdit(session.byte_at(self._to_point(op['start_position'])),
+                         session.byte_at(self._to_point(op['end_position'])),
+                         op['new_text'])
+                for op in edit_operations
+            ])
             
-            for op in edit_operations:
-                edit = self._editor.create_edit_operation(
-                    tree,
-                    start_position=op['start_position'],
-                    end_position=op['end_position'],
-                    new_text=op['new_text']
-                )
-                self._editor.apply_edit(tree, edit)
+            # Only the changed ranges are queried again
+            handler = self._parser_service._query_handler
+            changed_ranges = session.affected_ranges()
+            extraction = handler.extract_changes(
+                previous, session.tree, changed_ranges, session.map_byte, language)
+            self._remember_edit_session(session, extraction, language)
             
             # Verify the edited code
-            is_valid = self._editor.verify_tree_changes(tree)
+            root = session.tree.root_node
+            is_valid = not root.has_error
             errors = []
             if not is_valid:
-                _, errors = self._parser_service._query_handler.validate_syntax(tree.root_node, language)
+                _, errors = handler.validate_syntax(root, language)
             
             return {
-                'modified_code': tree.root_node.text.decode('utf8'),
+                'modified_code': session.text,
                 'is_valid': is_valid,
-                'errors': errors
+                'errors': errors,
+                'changed_ranges': changed_ranges,
+                'elements': {element_type: getattr(extraction, kind)
+                             for element_type, kind in EXTRACTED_ELEMENTS.items()}
             }
         except Exception as e:
             raise ParserError(f"Failed to edit code: {str(e)}")
@@ -644,6 +676,8 @@ class DatabaseService:
         """Find specific code elements using tree-sitter queries.
         
         This method allows the AI agent to find specific code elements like functions, classes, etc.
+        Functions, classes and imports of code produced by ``edit_code`` are served from
+        its incrementally updated extraction.
         
         Args:
             code: The code to analyze
@@ -653,23 +687,56 @@ class DatabaseService:
         Returns:
             Dictionary mapping element types to lists of found elements
         """
+        language = language or 'python'
         try:
-            tree = self._editor.parse_code(code)
+            session, extraction = self._get_edit_session(code, language)
+            self._remember_edit_session(session, extraction, language)
             results = {}
             
-            query_methods = self._language_service.get_query_methods(language or 'python')
-            
             for element_type in element_types:
-                if f'find_{element_type}s' in query_methods:
-                    results[element_type] = query_methods[f'find_{element_type}s'](tree.root_node)
+                if element_type in EXTRACTED_ELEMENTS:
+                    results[element_type] = getattr(extraction, EXTRACTED_ELEMENTS[element_type])
                 else:
                     # Fallback to generic node finding
-                    results[element_type] = self._parser_service._query_handler.find_nodes(tree, element_type)
+                    results[element_type] = self._parser_service._query_handler.find_nodes(
+                        session.tree, element_type, language)
             
             return results
         except Exception as e:
             raise ParserError(f"Failed to find code elements: {str(e)}")
 
+    def _get_edit_session(self, code: str, language: str) -> Tuple[EditSession, ExtractionResult]:
+        """Get the remembered session of some code, or parse and extract it.
+        
+        Args:
+            code: The code
+            language: Language identifier
+            
+        Returns:
+            Tuple of (session, extraction of its current tree)
+        """
+        key = (language, content_hash(code))
+        remembered = self._edit_sessions.pop(key, None)
+        if remembered is not None:
+            return remembered
+        session = self._editor.start_session(code, language)
+        extraction = self._parser_service._query_handler.extract(session.tree, language)
+        return session, extraction
+
+    def _remember_edit_session(self, session: EditSession, extraction: ExtractionResult,
+                               language: str) -> None:
+        """Keep a session for further edits of its current content."""
+        self._edit_sessions[(language, content_hash(bytes(session.source)))] = (session, extraction)
+        while len(self._edit_sessions) > MAX_EDIT_SESSIONS:
+            self._edit_sessions.popitem(last=False)
+
+    @staticmethod
+    def _to_point(position: Any) -> Tuple[int, int]:
+        """Convert a position given as a dict with row and column, or a pair, to a point."""
+        if isinstance(position, dict):
+            return position['row'], position['column']
+        return tuple(position)
+
     def analyze_code_flow(self, code: str, language: Optional[str] = None) -> Dict[str, Any]:
         """Analyze code control flow using tree traversal.
         
@@ -942,15 +1009,20 @@ class DatabaseService:
         
         return metrics
 
-    def process_repository(self, repo_id: int, repo_url: str) -> None:
+    def process_repository(self, repo_id: int, repo_url: str,
+                           workers: Optional[int] = None,
+                           incremental: Optional[bool] = None) -> None:
         """Process repository contents using RepoProcessor.
         
         Args:
             repo_id: Repository identifier
             repo_url: URL of the GitHub repository
+            workers: Optional number of worker processes used for parsing
+            incremental: Only re-process files changed since the last analysis
         """
         try:
-            self._repo_processor.process_repo(repo_url, repo_id)
+            self._repo_processor.process_repo(repo_url, repo_id, workers=workers,
+                                              incremental=incremental)
         except Exception as e:
             logger.error(f"Failed to process repository {repo_url}: {str(e)}")
             raise
@@ -1001,7 +1073,7 @@ class DatabaseService:
         return overview
 
     def analyze_file_ast(self, code_text: str, language: Optional[str] = None) -> Dict[str, Any]:
-        """Analyze a file's AST using a unified approach with ParserService and LanguageService.
+        """Analyze a file's AST using the ParserService parse summary.
         
         This method replaces duplicate AST analysis implementations and returns a structured
         representation of the code including syntax validity, errors, and extracted elements.
@@ -1017,9 +1089,10 @@ class DatabaseService:
               - language: Detected language of the code.
               - elements: Dictionary mapping element types (e.g., function, class) to lists of extracted elements.
         """
-        # Parse the content using ParserService
-        parse_result = self._parser_service.parse_content(code_text, language)
-        if not parse_result.tree:
+        # Parse the content using ParserService; repeated content is served
+        # from the parse cache
+        summary = self._parser_service.summarize_content(code_text, language)
+        if summary.ast is None:
             return {
                 'syntax_valid': False,
                 'error_messages': ['Parsing failed.'],
@@ -1027,33 +1100,27 @@ class DatabaseService:
                 'elements': {}
             }
 
-        # Use LanguageService to get query methods for extraction
-        query_methods = self._language_service.get_query_methods(parse_result.language)
+        # Summaries hold spans only; element text is sliced from the source
+        source = code_text.encode('utf-8')
         ast_data = {
-            'syntax_valid': parse_result.is_supported,
-            'error_messages': parse_result.errors,
-            'language': parse_result.language,
+            'syntax_valid': summary.syntax_valid,
+            'error_messages': summary.errors,
+            'language': summary.language,
             'elements': {}
         }
-
-        # Iterate over query methods that follow 'find_' pattern and extract elements
-        for method_name, query_method in query_methods.items():
-            if method_name.startswith('find_'):
-                # Derive element type from method name, e.g., find_functions -> function
-                element_type = method_name.split('_', 1)[1].rstrip('s')
-                elements = query_method(parse_result.tree.root_node)
-                extracted = []
-                for captures in elements:
-                    element_def = captures.get(f'{element_type}.def')
-                    if element_def:
-                        extracted.append({
-                            'type': element_type,
-                            'name': self._get_node_text(captures.get(f'{element_type}.name')),
-                            'start_point': getattr(element_def, 'start_point', None),
-                            'end_point': getattr(element_def, 'end_point', None),
-                            'text': self._get_node_text(element_def)
-                        })
-                ast_data['elements'][element_type] = extracted
+        for element_type, elements in (('function', summary.functions),
+                                       ('class', summary.classes),
+                                       ('import', summary.imports)):
+            ast_data['elements'][element_type] = [
+                {
+                    'type': element_type,
+                    'name': element['name'],
+                    'start_point': element['start_point'],
+                    'end_point': element['end_point'],
+                    'text': source[element['start_byte']:element['end_byte']].decode('utf-8', errors='replace')
+                }
+                for element in elements
+            ]
 
         return ast_data
 
@@ -121,20 +121,34 @@ class PostgresService(BaseService):
                 self._conn.rollback()
                 raise DatabaseError(f"Failed to create tables: {str(e)}")
 
-    def store_code_with_embedding(self, snippet: CodeSnippet) -> None:
-        """Store code snippet with its embedding vector and metadata."""
+    def store_code_with_embedding(self, snippet: CodeSnippet,
+                                  embedding: Optional[List[float]] = None,
+                                  skip_embedding: bool = False) -> None:
+        """Store code snippet with its embedding vector and metadata.
+        
+        Args:
+            snippet: Code snippet to store. Its ``content_hash`` must be the
+                ``git_blob_hash`` of the file's raw bytes; without one the
+                row is stored unhashed and treated as changed next run.
+            embedding: Precomputed embedding; computed here when omitted
+            skip_embedding: Store the snippet without an embedding. The
+                row is excluded from similarity search.
+        """
         start_time = time.time()
         self.ensure_connection()
         try:
-            embedding = self._embedding_service.get_embedding(snippet.code_text)
+            if skip_embedding:
+                embedding = None
+            elif embedding is None:
+                embedding = self._embedding_service.get_embedding(snippet.code_text)
             
             with self._conn.cursor() as cur:
                 cur.execute('''
                     INSERT INTO code_snippets (
                         repo_id, file_path, code_text, language, embedding, 
-                        metadata, is_supported
+                        metadata, is_supported, content_hash
                     )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 ''', (
                     snippet.repo_id,
                     snippet.file_path,
@@ -142,7 +156,8 @@ class PostgresService(BaseService):
                     snippet.language,
                     embedding,
                     json.dumps(snippet.metadata) if snippet.metadata else None,
-                    snippet.metadata.get('is_supported', True) if snippet.metadata else True
+                    snippet.metadata.get('is_supported', True) if snippet.metadata else True,
+                    snippet.content_hash
                 ))
                 self._conn.commit()
                 
@@ -178,7 +193,7 @@ class PostgresService(BaseService):
                         metadata,
                         1 - (embedding <=> %s::vector) as similarity
                     FROM code_snippets
-                    WHERE is_supported = true
+                    WHERE is_supported = true AND embedding IS NOT NULL
                 '''
                 params = [query_embedding]
                 
@@ -292,6 +307,51 @@ class PostgresService(BaseService):
             self._conn.commit()
             return int(repo_id)
 
+    def get_last_analyzed_commit(self, repo_id: int) -> Optional[str]:
+        """Get the commit SHA recorded by the last successful analysis.
+        
+        Args:
+            repo_id: The ID of the repository
+            
+        Returns:
+            Commit SHA, or None if the repository was never analyzed
+        """
+        self.ensure_connection()
+        with self._conn.cursor() as cur:
+            cur.execute("SELECT last_analyzed_commit FROM repositories WHERE id = %s", (repo_id,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def update_last_analyzed_commit(self, repo_id: int, commit_sha: str) -> None:
+        """Record the commit a repository was analyzed at.
+        
+        Args:
+            repo_id: The ID of the repository
+            commit_sha: SHA of the analyzed commit
+        """
+        start_time = time.time()
+        self.ensure_connection()
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE repositories
+                    SET last_analyzed_commit = %s, last_analyzed = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (commit_sha, repo_id))
+                self._conn.commit()
+                
+                self._log('debug', 'Updated last analyzed commit',
+                         repo_id=repo_id,
+                         commit_sha=commit_sha,
+                         duration_ms=int((time.time() - start_time) * 1000))
+        except Exception as e:
+            self._log('error', 'Failed to update last analyzed commit',
+                     repo_id=repo_id,
+                     error=str(e),
+                     duration_ms=int((time.time() - start_time) * 1000))
+            self._conn.rollback()
+            raise
+
     def semantic_search(self, query: str, limit: int = 5, 
                        filter_repo: Optional[str] = None) -> List[Dict[str, Any]]:
         """Perform semantic search over code snippets."""
@@ -312,7 +372,7 @@ class PostgresService(BaseService):
                         1 - (cs.embedding <=> %s::vector) as similarity
                     FROM code_snippets cs
                     JOIN repositories r ON cs.repo_id = r.id
-                    WHERE cs.is_supported = true
+                    WHERE cs.is_supported = true AND cs.embedding IS NOT NULL
                 '''
                 params = [query_embedding]
                 
@@ -529,13 +589,60 @@ class PostgresService(BaseService):
             row = cur.fetchone()
             return row[0] if row else None
 
-    def delete_file_snippets(self, file_path: str) -> None:
-        """Delete all code snippets for a given file path."""
+    def get_file_hashes(self, repo_id: int) -> Dict[str, Optional[str]]:
+        """Get the content hash of every stored file in a repository.
+        
+        Rows stored before content hashes were tracked map to None, so
+        callers treat them as changed and re-store them with a hash.
+        
+        Args:
+            repo_id: The ID of the repository
+            
+        Returns:
+            Dictionary mapping file paths to content hashes
+        """
+        start_time = time.time()
+        self.ensure_connection()
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute(
+                    "SELECT DISTINCT ON (file_path) file_path, content_hash "
+                    "FROM code_snippets WHERE repo_id = %s "
+                    "ORDER BY file_path, created_at DESC",
+                    (repo_id,)
+                )
+                hashes = {row[0]: row[1] for row in cur.fetchall()}
+                
+                self._log('debug', 'Retrieved file hashes',
+                         repo_id=repo_id,
+                         file_count=len(hashes),
+                         duration_ms=int((time.time() - start_time) * 1000))
+                return hashes
+        except Exception as e:
+            self._log('error', 'Failed to retrieve file hashes',
+                     repo_id=repo_id,
+                     error=str(e),
+                     duration_ms=int((time.time() - start_time) * 1000))
+            raise
+
+    def delete_file_snippets(self, file_path: str, repo_id: Optional[int] = None) -> None:
+        """Delete all code snippets for a given file path.
+        
+        Args:
+            file_path: Path of the file
+            repo_id: Only delete the file's snippets in this repository;
+                needed for repository-relative paths, which repeat across
+                repositories
+        """
         start_time = time.time()
         self.ensure_connection()
         try:
             with self._conn.cursor() as cur:
-                cur.execute('DELETE FROM code_snippets WHERE file_path = %s', (file_path,))
+                if repo_id is None:
+                    cur.execute('DELETE FROM code_snippets WHERE file_path = %s', (file_path,))
+                else:
+                    cur.execute('DELETE FROM code_snippets WHERE repo_id = %s AND file_path = %s',
+                                (repo_id, file_path))
                 deleted_count = cur.rowcount
                 self._conn.commit()
                 
@@ -7,9 +7,13 @@ CREATE TABLE IF NOT EXISTS repositories (
     description TEXT,
     default_branch VARCHAR(255) NOT NULL DEFAULT 'main',
     last_analyzed TIMESTAMP WITH TIME ZONE,
+    last_analyzed_commit VARCHAR(64),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Upgrade databases created before analyzed commits were tracked
+ALTER TABLE repositories ADD COLUMN IF NOT EXISTS last_analyzed_commit VARCHAR(64);
+
 CREATE TABLE IF NOT EXISTS files (
     id SERIAL PRIMARY KEY,
     repository_id INTEGER REFERENCES repositories(id) ON DELETE CASCADE,
@@ -130,9 +134,13 @@ CREATE TABLE IF NOT EXISTS code_snippets (
     embedding vector(768),
     metadata JSONB,
     is_supported BOOLEAN DEFAULT TRUE,
+    content_hash VARCHAR(64),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Upgrade databases created before content hashes were tracked
+ALTER TABLE code_snippets ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_files_repo_id ON files(repository_id);
 CREATE INDEX IF NOT EXISTS idx_namespaces_file_id ON namespaces(file_id);
@@ -142,6 +150,7 @@ CREATE INDEX IF NOT EXISTS idx_functions_type_id ON functions(type_id);
 CREATE INDEX IF NOT EXISTS idx_parameters_function_id ON parameters(function_id);
 CREATE INDEX IF NOT EXISTS idx_fields_type_id ON fields(type_id);
 CREATE INDEX IF NOT EXISTS idx_imports_file_id ON imports(file_id);
+CREATE INDEX IF NOT EXISTS idx_code_snippets_repo_path ON code_snippets(repo_id, file_path);
 
 -- Full-text search indexes
 CREATE INDEX IF NOT EXISTS idx_types_documentation_fts ON types USING GIN (to_tsvector('english', documentation));
@@ -0,0 +1,162 @@
+"""Size-tiered processing policy for repository files.
+
+A handful of outliers - huge data files, minified bundles, generated
+protobuf or parser code - can dominate the wall-clock time and memory of
+a repository run while contributing nothing useful to search. The policy
+puts every file in one of four tiers, each of which runs fewer stages:
+
+- ``skip``: the file is not processed at all
+- ``metadata_only``: the file is recorded without parsing or embedding
+- ``parse_only``: the file is parsed and stored, but not embedded
+- ``full``: parse, embed and store
+
+Files are classified by size, by minification heuristics (average line
+length and byte entropy of a leading sample) and by generated-file
+markers in their name or header.
+"""
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from GithubAnalyzer.models.core.file import FileInfo
+from GithubAnalyzer.services.core.file_processor import \
+    METADATA_ONLY_OVERSIZED
+
+TIER_SKIP = "skip"
+TIER_METADATA_ONLY = "metadata_only"
+TIER_PARSE_ONLY = "parse_only"
+TIER_FULL = "full"
+TIERS = (TIER_SKIP, TIER_METADATA_ONLY, TIER_PARSE_ONLY, TIER_FULL)
+
+# Reasons a file is placed below the full tier
+REASON_MINIFIED = "minified"
+REASON_ENCODED = "encoded"
+REASON_GENERATED = "generated"
+REASON_LARGE = "large"
+
+# File name fragments of minified bundles and source maps
+MINIFIED_NAME_MARKERS = ('.min.js', '.min.css', '.min.mjs', '-min.js', '.bundle.js', '.js.map', '.css.map')
+
+# File name fragments of code emitted by generators and package managers
+GENERATED_NAME_MARKERS = (
+    '_pb2.py', '_pb2_grpc.py', '.pb.go', '.pb.cc', '.pb.h', '.g.dart', '.freezed.dart',
+    '.designer.cs', '.generated.', '_generated.', 'package-lock.json', 'yarn.lock',
+    'pnpm-lock.yaml', 'poetry.lock', 'cargo.lock', 'composer.lock', 'gemfile.lock'
+)
+
+# Header markers generators conventionally leave in their output
+GENERATED_CONTENT_MARKERS = (
+    b'@generated', b'do not edit', b'code generated by', b'auto-generated',
+    b'autogenerated', b'automatically generated'
+)
+
+# Bytes of the header searched for generated markers
+GENERATED_HEADER_BYTES = 2048
+
+
+@dataclass
+class TierDecision:
+    """Tier a file was placed in.
+
+    Attributes:
+        tier: One of ``TIERS``
+        reason: Why the file is below the full tier
+    """
+    tier: str
+    reason: Optional[str] = None
+
+    @property
+    def runs_parse(self) -> bool:
+        """Whether the file is parsed."""
+        return self.tier in (TIER_PARSE_ONLY, TIER_FULL)
+
+    @property
+    def runs_embedding(self) -> bool:
+        """Whether the file is embedded."""
+        return self.tier == TIER_FULL
+
+
+@dataclass
+class FilePolicy:
+    """Places files in processing tiers.
+
+    Size limits of None disable the corresponding tier.
+
+    Attributes:
+        skip_bytes: Files larger than this are skipped
+        metadata_only_bytes: Files larger than this are recorded without parsing
+        parse_only_bytes: Files larger than this are not embedded
+        minified_line_length: Average line length above which a file is
+            treated as minified and recorded without parsing
+        max_entropy: Byte entropy, in bits, above which an ASCII file is
+            treated as encoded data (base64, packed assets) and recorded
+            without parsing
+        min_heuristic_bytes: Files smaller than this are never treated as
+            minified or encoded, since short samples are unreliable
+        sample_bytes: Leading bytes the heuristics look at
+    """
+    skip_bytes: Optional[int] = 50 * 1024 ** 2
+    metadata_only_bytes: Optional[int] = 10 * 1024 ** 2
+    parse_only_bytes: Optional[int] = 1024 ** 2
+    minified_line_length: int = 300
+    max_entropy: float = 5.8
+    min_heuristic_bytes: int = 1024
+    sample_bytes: int = 64 * 1024
+
+    def classify_size(self, size: int) -> Optional[TierDecision]:
+        """Place a file by size alone, before its content is read.
+
+        Args:
+            size: Size of the file in bytes
+
+        Returns:
+            TierDecision if the size decides the tier, None otherwise
+        """
+        if self.skip_bytes is not None and size > self.skip_bytes:
+            return TierDecision(TIER_SKIP, METADATA_ONLY_OVERSIZED)
+        if self.metadata_only_bytes is not None and size > self.metadata_only_bytes:
+            return TierDecision(TIER_METADATA_ONLY, METADATA_ONLY_OVERSIZED)
+        return None
+
+    def classify(self, file_info: FileInfo, data: bytes) -> TierDecision:
+        """Place a file in a tier.
+
+        Args:
+            file_info: File being processed
+            data: Content of the file
+
+        Returns:
+            TierDecision for the file
+        """
+        decision = self.classify_size(len(data))
+        if decision is not None:
+            return decision
+
+        name = file_info.path.name.lower()
+        if any(marker in name for marker in MINIFIED_NAME_MARKERS):
+            return TierDecision(TIER_METADATA_ONLY, REASON_MINIFIED)
+        if len(data) >= self.min_heuristic_bytes:
+            sample = data[:self.sample_bytes]
+            if len(sample) / (sample.count(b'\n') + 1) > self.minified_line_length:
+                return TierDecision(TIER_METADATA_ONLY, REASON_MINIFIED)
+            # Text encodings of binary data are ASCII; non-English text is
+            # legitimately high in entropy once encoded as UTF-8
+            if sample.isascii() and byte_entropy(sample) > self.max_entropy:
+                return TierDecision(TIER_METADATA_ONLY, REASON_ENCODED)
+
+        header = data[:GENERATED_HEADER_BYTES].lower()
+        if (any(marker in name for marker in GENERATED_NAME_MARKERS) or
+                any(marker in header for marker in GENERATED_CONTENT_MARKERS)):
+            return TierDecision(TIER_PARSE_ONLY, REASON_GENERATED)
+        if self.parse_only_bytes is not None and len(data) > self.parse_only_bytes:
+            return TierDecision(TIER_PARSE_ONLY, REASON_LARGE)
+        return TierDecision(TIER_FULL)
+
+
+def byte_entropy(data: bytes) -> float:
+    """Get the Shannon entropy of a byte string, in bits per byte."""
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
@@ -0,0 +1,466 @@
+"""Database-free file processing for repository ingestion.
+
+This module holds the per-file work of repository ingestion (reading,
+parsing and AST extraction) so it can run either inline in
+``RepoProcessor`` or inside worker processes of a process pool. Nothing
+in here touches PostgreSQL or Neo4j; storage is left to the single writer
+in ``RepoProcessor``.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from GithubAnalyzer.models.core.base_model import BaseModel
+from GithubAnalyzer.models.core.db.database import CodeSnippet
+from GithubAnalyzer.models.core.errors import FileError, ParseCancelledError
+from GithubAnalyzer.models.core.file import FileContent, FileInfo
+from GithubAnalyzer.services.analysis.parsers.language_service import \
+    LanguageService
+from GithubAnalyzer.services.core.file_service import FileService
+from GithubAnalyzer.services.core.git_blob_reader import GitBlobReader
+from GithubAnalyzer.services.core.parse_cache import (
+    DEFAULT_PARSE_CACHE_MAX_BYTES, ParseCache)
+from GithubAnalyzer.services.core.parser_service import ParserService
+from GithubAnalyzer.services.parsers.core.custom_parsers import \
+    get_custom_parser
+from GithubAnalyzer.utils.logging import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Result statuses reported back to the writer
+STATUS_PROCESSED = "processed"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+# Why a file was stored with metadata only instead of its parse
+METADATA_ONLY_TIMEOUT = "timeout"
+METADATA_ONLY_OVERSIZED = "oversized"
+
+
+@dataclass
+class FileProcessingResult:
+    """Outcome of processing a single file.
+
+    Instances are returned from worker processes, so every field must be
+    picklable (no tree-sitter objects).
+
+    Attributes:
+        file_path: Path of the processed file
+        status: One of ``processed``, ``skipped`` or ``error``
+        code_text: File content, if it could be read
+        snippet: Resulting code snippet, if any
+        reason: Why the file was skipped
+        error: Error message when processing failed
+    """
+    file_path: str
+    status: str
+    code_text: Optional[str] = None
+    snippet: Optional[CodeSnippet] = None
+    reason: Optional[str] = None
+    error: Optional[str] = None
+
+
+def metadata_only_reason(snippet: Optional[CodeSnippet]) -> Optional[str]:
+    """Get why a snippet holds only file metadata, or None if it was parsed."""
+    if snippet is None or not snippet.ast_data:
+        return None
+    return snippet.ast_data.get('metadata_only')
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert tree-sitter value types (e.g. ``Point``) to plain Python types."""
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_to_plain(item) for item in value)
+    return value
+
+
+@dataclass
+class FileProcessor(BaseModel):
+    """Reads and parses repository files without touching the databases.
+
+    When ``blob_reader`` is set, files whose metadata carries a ``blob_sha``
+    are read from the git object database instead of the working tree.
+    """
+    file_service: FileService = field(default_factory=FileService)
+    parser_service: ParserService = field(default_factory=ParserService)
+    language_service: LanguageService = field(default_factory=LanguageService)
+    blob_reader: Optional[GitBlobReader] = None
+
+    def __post_init__(self):
+        """Initialize the file processor."""
+        super().__post_init__()
+        self._logger = logger
+        self._start_time = time.time()
+
+    def _get_context(self, **kwargs) -> Dict[str, Any]:
+        """Get standard context for logging.
+
+        Args:
+            **kwargs: Additional context key-value pairs
+
+        Returns:
+            Dict with standard context fields plus any additional fields
+        """
+        context = {
+            'module': 'file_processor',
+            'thread': threading.get_ident(),
+            'duration_ms': (time.time() - self._start_time) * 1000
+        }
+        context.update(kwargs)
+        return context
+
+    def _log(self, level: str, message: str, **kwargs) -> None:
+        """Log with consistent context.
+
+        Args:
+            level: Log level (debug, info, warning, error, critical)
+            message: Message to log
+            **kwargs: Additional context key-value pairs
+        """
+        context = self._get_context(**kwargs)
+        getattr(self._logger, level)(message, extra={'context': context})
+
+    def read_file(self, file_info: FileInfo) -> Tuple[Optional[FileContent], Optional[str]]:
+        """Read a file once if it is eligible for processing.
+
+        Args:
+            file_info: File to read
+
+        Returns:
+            Tuple of (content, skip_reason). Exactly one of them is None.
+        """
+        # Skip files we can't process
+        if not file_info.is_supported:
+            self._log("debug", "Skipping unsupported file", file=str(file_info.path))
+            return None, "unsupported"
+
+        blob_sha = (file_info.metadata or {}).get('blob_sha')
+        try:
+            if blob_sha and self.blob_reader is not None:
+                content = self._read_blob(file_info, blob_sha)
+            else:
+                content = FileContent.load(file_info.path)
+        except (FileError, OSError) as e:
+            self._log("debug", "File read error", file=str(file_info.path), error=str(e))
+            return None, "read_error"
+
+        # Skip binary files
+        if content.is_binary:
+            self._log("debug", "Skipping binary file", file=str(file_info.path))
+            return None, "binary"
+        if content.text is None:
+            self._log("debug", "File read error", file=str(file_info.path), error=content.error)
+            return None, "read_error"
+        return content, None
+
+    def _read_blob(self, file_info: FileInfo, blob_sha: str) -> FileContent:
+        """Read a file's content from the git object database.
+
+        Args:
+            file_info: File to read
+            blob_sha: SHA of the file's blob
+
+        Returns:
+            FileContent for the blob
+
+        Raises:
+            FileError: If the blob cannot be read
+        """
+        start = time.perf_counter()
+        content = FileContent.from_bytes(file_info.path, self.blob_reader.read_blob(blob_sha))
+        content.read_ms = (time.perf_counter() - start) * 1000
+        return content
+
+    def process(self, file_info: FileInfo, content: Optional[FileContent] = None) -> FileProcessingResult:
+        """Read and process a file, returning a picklable result.
+
+        This is the unit of work executed by ingestion worker processes.
+
+        Args:
+            file_info: File to process
+            content: Content loaded by ``read_file``; the file is read if omitted
+
+        Returns:
+            FileProcessingResult describing the outcome
+        """
+        path = str(file_info.path)
+        try:
+            if content is None:
+                content, reason = self.read_file(file_info)
+                if content is None:
+                    return FileProcessingResult(file_path=path, status=STATUS_SKIPPED, reason=reason)
+
+            snippet = self.process_file(file_info, content)
+            if snippet is None:
+                return FileProcessingResult(file_path=path, status=STATUS_SKIPPED,
+                                            code_text=content.text, reason="no_snippet")
+
+            snippet.ast_data = _to_plain(snippet.ast_data)
+            return FileProcessingResult(file_path=path, status=STATUS_PROCESSED,
+                                        code_text=content.text, snippet=snippet)
+        except Exception as e:
+            return FileProcessingResult(file_path=path, status=STATUS_ERROR, error=str(e))
+
+    def process_file(self, file_info: FileInfo,
+                     content: Union[FileContent, str, None] = None) -> Optional[CodeSnippet]:
+        """Process a single file from the repository.
+
+        Args:
+            file_info: File to process
+            content: Already-read file content, preferably as FileContent so
+                its bytes are handed to tree-sitter as-is; the file is read
+                if omitted
+
+        Returns:
+            - None if the file cannot be processed (encoding errors, read errors, etc.)
+            - CodeSnippet with syntax_valid=False if the file can be read but not parsed
+            - CodeSnippet with syntax_valid=True if the file is successfully parsed
+        """
+        start_time = time.time()
+        try:
+            if content is None:
+                # Try to read file content first
+                try:
+                    content = FileContent.load(file_info.path)
+                except OSError as e:
+                    self._log("debug", "File read error",
+                             file=str(file_info.path),
+                             error=str(e))
+                    return None
+            source = None
+            if isinstance(content, FileContent):
+                if content.text is None:
+                    self._log("debug", "File read error",
+                             file=str(file_info.path),
+                             error=content.error or "binary content")
+                    return None
+                source = content.source_bytes
+                content = content.text
+
+            # Handle empty files
+            if not content.strip():
+                self._log("debug", "Empty file",
+                         file=str(file_info.path))
+                return None
+
+            # Files over the parse ceiling are never handed to a parser
+            max_parse_bytes = self.parser_service.max_parse_bytes
+            if max_parse_bytes is not None:
+                size = len(source) if source is not None else len(content.encode('utf-8'))
+                if size > max_parse_bytes:
+                    return self.metadata_only_snippet(file_info, METADATA_ONLY_OVERSIZED, size)
+
+            # Always try custom parser first for supported file types
+            custom_parser = get_custom_parser(str(file_info.path))
+            if custom_parser:
+                ast_data = self._parse_with_custom_parser(content, file_info.path)
+                if ast_data:
+                    self._log("debug", "Successfully parsed with custom parser",
+                             file=str(file_info.path),
+                             parser_type="custom")
+                    return CodeSnippet(
+                        id=None,
+                        repo_id=0,  # Default repo ID
+                        file_path=str(file_info.path),
+                        code_text=content,
+                        language=file_info.language,
+                        ast_data=ast_data,
+                        syntax_valid=True,
+                        embedding=[0.0] * 1536  # Default zero embedding
+                    )
+
+            # Process with tree-sitter if language is supported
+            if self.language_service.is_language_supported(file_info.language):
+                try:
+                    ast_data = self._parse_with_tree_sitter(content, file_info.language, source)
+                except ParseCancelledError:
+                    size = len(source) if source is not None else len(content.encode('utf-8'))
+                    return self.metadata_only_snippet(file_info, METADATA_ONLY_TIMEOUT, size)
+                if ast_data:
+                    duration = (time.time() - start_time) * 1000
+                    self._log("debug", "File processed successfully",
+                             file=str(file_info.path),
+                             language=file_info.language,
+                             parser_type="tree-sitter",
+                             duration_ms=duration)
+                    return CodeSnippet(
+                        id=None,
+                        repo_id=0,  # Default repo ID
+                        file_path=str(file_info.path),
+                        code_text=content,
+                        language=file_info.language,
+                        ast_data=ast_data,
+                        syntax_valid=ast_data.get('syntax_valid', True),  # Default to True if not specified
+                        embedding=[0.0] * 1536  # Default zero embedding
+                    )
+
+            # If we get here, we have valid content but no successful parse
+            # Return a CodeSnippet with syntax_valid=False
+            self._log("debug", "No successful parse",
+                     file=str(file_info.path),
+                     language=file_info.language or "unknown")
+            return CodeSnippet(
+                id=None,
+                repo_id=0,  # Default repo ID
+                file_path=str(file_info.path),
+                code_text=content,
+                language=file_info.language or "unknown",
+                ast_data={},
+                syntax_valid=False,
+                embedding=[0.0] * 1536  # Default zero embedding
+            )
+
+        except Exception as e:
+            self._log("error", "Error processing file",
+                     file=str(file_info.path),
+                     error=str(e))
+            return None
+
+    def _parse_with_tree_sitter(self, content: str, language: str,
+                                source: Optional[bytes] = None) -> Optional[Dict]:
+        """Parse file content using tree-sitter.
+
+        Args:
+            content: File content to parse
+            language: Programming language to use for parsing
+            source: UTF-8 encoding of ``content``, if already available
+
+        Returns:
+            Dictionary containing AST data if successful, None otherwise
+        """
+        try:
+            # Served from the parse cache when the same content was parsed before
+            summary = self.parser_service.summarize_content(
+                source if source is not None else content, language)
+            if summary.ast is None:
+                self._log("error", "Failed to parse content",
+                         language=language)
+                return {
+                    'syntax_valid': False,
+                    'errors': ['Failed to parse content'],
+                    'error_nodes': [],
+                    'missing_nodes': []
+                }
+
+            # AST data is kept even if there are syntax errors, since
+            # tree-sitter provides a partial AST. Error nodes are stored as
+            # spans; their text can be sliced from the code
+            return summary.to_ast_data()
+
+        except ParseCancelledError:
+            # Left to process_file, which stores the file's metadata only
+            raise
+        except Exception as e:
+            self._log("error", "Tree-sitter parsing error",
+                     language=language,
+                     error=str(e))
+            return {
+                'syntax_valid': False,
+                'errors': [str(e)],
+                'error_nodes': [],
+                'missing_nodes': []
+            }
+
+    def metadata_only_snippet(self, file_info: FileInfo, reason: str, size: int) -> CodeSnippet:
+        """Build a snippet recording a file that was not parsed.
+
+        The content is left out, so an outlier file costs neither parsing
+        nor embedding nor storage beyond its metadata.
+
+        Args:
+            file_info: File that was not parsed
+            reason: Why the file was not parsed, such as ``timeout``
+            size: Size of the file in bytes
+
+        Returns:
+            CodeSnippet without code or AST
+        """
+        self._log("warning", "Storing file metadata only",
+                 file=str(file_info.path),
+                 language=file_info.language,
+                 reason=reason,
+                 size_bytes=size)
+        return CodeSnippet(
+            id=None,
+            repo_id=0,  # Default repo ID
+            file_path=str(file_info.path),
+            code_text="",
+            language=file_info.language or "unknown",
+            ast_data={'metadata_only': reason, 'size_bytes': size},
+            syntax_valid=False,
+            embedding=[0.0] * 1536  # Default zero embedding
+        )
+
+    def _parse_with_custom_parser(self, content: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Parse file content using a custom parser.
+
+        Args:
+            content: File content to parse
+            file_path: Path to the file
+
+        Returns:
+            Parsed AST data if successful, None otherwise
+        """
+        try:
+            parser = get_custom_parser(str(file_path))
+            if parser:
+                return parser.parse(content)
+            return None
+        except Exception as e:
+            self._log("error", "Custom parser error",
+                     file=str(file_path),
+                     error=str(e))
+            return None
+
+
+
+# Per-process processor used by ingestion workers. It is created once by
+# ``init_worker`` so parsers and language objects stay warm across files.
+_worker_processor: Optional[FileProcessor] = None
+
+
+def init_worker(parse_cache_dir: Optional[str] = None,
+                parse_cache_max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES,
+                parse_timeout_ms: Optional[float] = None,
+                max_parse_bytes: Optional[int] = None) -> None:
+    """Process pool initializer that builds the worker's FileProcessor.
+
+    Args:
+        parse_cache_dir: Directory of the parse cache to share with the
+            parent process; no cache is used when None
+        parse_cache_max_bytes: Size limit of the parse cache
+        parse_timeout_ms: Per-file parse timeout of the parent's ParserService
+        max_parse_bytes: Parse size ceiling of the parent's ParserService
+    """
+    global _worker_processor
+    parse_cache = None
+    if parse_cache_dir is not None:
+        parse_cache = ParseCache(cache_dir=Path(parse_cache_dir), max_bytes=parse_cache_max_bytes)
+    _worker_processor = FileProcessor(parser_service=ParserService(
+        parse_cache=parse_cache,
+        parse_timeout_ms=parse_timeout_ms,
+        max_parse_bytes=max_parse_bytes
+    ))
+
+
+def process_file_in_worker(file_info: FileInfo,
+                           content: Optional[FileContent] = None) -> FileProcessingResult:
+    """Process one file inside an ingestion worker process.
+
+    Args:
+        file_info: File to process
+        content: Content loaded by ``read_file``; the file is read if omitted
+
+    Returns:
+        Picklable FileProcessingResult
+    """
+    if _worker_processor is None:
+        init_worker()
+    return _worker_processor.process(file_info, content)
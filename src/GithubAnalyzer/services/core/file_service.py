@@ -1,15 +1,18 @@
 """File service for GithubAnalyzer."""
 import os
+import shutil
 import tempfile
 import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import git
 
-from GithubAnalyzer.models.core.file import FileFilterConfig, FileInfo
+from GithubAnalyzer.models.core.file import (BINARY_SNIFF_SIZE, FileFilterConfig,
+                                             FileInfo, is_binary_content)
+from GithubAnalyzer.models.core.repository import RepositoryChanges
 from GithubAnalyzer.services.parsers.core.custom_parsers import (
     CustomParser, EditorConfigParser, EnvFileParser, GitignoreParser,
     LockFileParser, RequirementsParser, get_custom_parser)
@@ -18,7 +21,11 @@ from GithubAnalyzer.services.analysis.parsers.language_service import \
 from GithubAnalyzer.services.analysis.parsers.query_patterns import \
     SPECIAL_FILENAMES
 from GithubAnalyzer.services.core.base_service import BaseService
+from GithubAnalyzer.services.core.git_blob_reader import GitBlobReader
+from GithubAnalyzer.services.core.repo_cache import RepositoryCache
 from GithubAnalyzer.utils.logging import get_logger
+from GithubAnalyzer.utils.path_matcher import (PathFilter, PathMatcher,
+                                                compile_patterns)
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -146,6 +153,20 @@ EDITOR_EXCLUDES: Set[str] = {
 # Combine all excludes
 DEFAULT_EXCLUDES: Set[str] = GIT_EXCLUDES | BUILD_EXCLUDES | EDITOR_EXCLUDES
 
+# Ignore files honoured while walking a repository, read with gitignore syntax
+IGNORE_FILENAMES = ('.gitignore', '.dockerignore')
+
+# Index entry flag set on skip-worktree (sparse checkout) and intent-to-add
+# entries, whose indexed blob is not what is in the working tree
+INDEX_EXTENDED_FLAG = 0x4000
+
+# Git file modes of symlinks and submodules
+GIT_SYMLINK_MODE = 0o120000
+GIT_SUBMODULE_MODE = 0o160000
+
+# (directory prefix, matcher) pairs of the ignore files that apply to a directory
+IgnoreScopes = Tuple[Tuple[str, PathMatcher], ...]
+
 @dataclass
 class FileService(BaseService):
     """Service for managing repository files."""
@@ -153,6 +174,10 @@ class FileService(BaseService):
     _language_service: LanguageService = field(default_factory=LanguageService)
     _filter_config: FileFilterConfig = field(default_factory=FileFilterConfig)
     _start_time: float = field(default_factory=time.time)
+    _temp_dirs: Set[Path] = field(default_factory=set)
+    repo_cache: Optional[RepositoryCache] = None
+    use_ignore_files: bool = True
+    use_git_index: bool = True
     
     def __post_init__(self):
         """Initialize the service."""
@@ -162,11 +187,25 @@ class FileService(BaseService):
                 operation="initialization",
                 base_path=str(self.base_path) if self.base_path else None)
         
-    def clone_repository(self, repo_url: str) -> Optional[Path]:
+    def clone_repository(self, repo_url: str, bare: bool = False, depth: Optional[int] = None,
+                         blob_limit: Optional[int] = None, sparse: bool = False) -> Optional[Path]:
         """Clone or get local repository path.
         
+        Remote repositories are served from ``repo_cache`` when one is set,
+        otherwise they are cloned into a temporary directory. Either way the
+        path stays valid until ``cleanup_repository`` is called.
+        
         Args:
             repo_url: URL of the repository to clone or local file path
+            bare: Clone remote repositories without a working tree, for
+                reading content straight from the object database. The
+                clone holds every blob unless ``blob_limit`` is set; with
+                ``repo_cache`` it is a mirror of the same shape.
+            depth: Shallow clone with this many commits of history
+            blob_limit: Partial clone that skips blobs larger than this
+                many bytes
+            sparse: Only check out files matching the include patterns of
+                the filter configuration
             
         Returns:
             Path to the repository directory, or None if cloning failed
@@ -190,9 +229,47 @@ class FileService(BaseService):
                 return potential_path
             else:
                 # If not a local path, assume it's a remote git URL and clone it
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    git.Repo.clone_from(repo_url, temp_dir)
-                    return Path(temp_dir)
+                sparse_patterns = None
+                if sparse and not bare:
+                    # Include patterns use gitignore syntax, as sparse-checkout does
+                    sparse_patterns = list(self._filter_config.include_paths or []) or None
+                if bare and blob_limit is None:
+                    # Every blob at HEAD is read anyway, so fetching them up
+                    # front beats fetching each one on demand; large ones are
+                    # only left out when asked for
+                    self._log("info", "Bare clone fetches every blob; set a blob limit for a partial clone",
+                             repo_url=repo_url,
+                             cached=self.repo_cache is not None)
+                if self.repo_cache is not None:
+                    # Shallow and partial copies are cached apart from full mirrors
+                    return self.repo_cache.acquire(repo_url, bare=bare,
+                                                   sparse_patterns=sparse_patterns,
+                                                   depth=depth, blob_limit=blob_limit)
+                temp_dir = Path(tempfile.mkdtemp(prefix='github_analyzer_'))
+                self._temp_dirs.add(temp_dir)
+                try:
+                    clone_options: Dict[str, Any] = {}
+                    if depth:
+                        clone_options['depth'] = depth
+                    if blob_limit is not None:
+                        clone_options['filter'] = f'blob:limit={blob_limit}'
+                    if sparse_patterns:
+                        # Check out only after the pattern is set, so
+                        # excluded blobs are never materialized or fetched
+                        clone_options['no_checkout'] = True
+                    git.Repo.clone_from(repo_url, str(temp_dir), bare=bare, **clone_options)
+                    if sparse_patterns:
+                        work_tree = git.Git(str(temp_dir))
+                        work_tree.sparse_checkout('set', '--no-cone', *sparse_patterns)
+                        work_tree.checkout()
+                    self._log("debug", "Cloned repository",
+                             repo_url=repo_url,
+                             options=clone_options,
+                             sparse_patterns=sparse_patterns)
+                except Exception:
+                    self.cleanup_repository(temp_dir)
+                    raise
+                return temp_dir
                     
         except Exception as e:
             self._log("error", "Failed to clone repository",
@@ -200,6 +277,24 @@ class FileService(BaseService):
                      error=str(e))
             return None
         
+    def cleanup_repository(self, repo_path: Union[str, Path]) -> None:
+        """Release a repository obtained from ``clone_repository``.
+        
+        Temporary clones are removed and cached repositories are unlocked.
+        Local repositories that were analyzed in place are left untouched.
+        
+        Args:
+            repo_path: Path returned by ``clone_repository``
+        """
+        repo_path = Path(repo_path)
+        if self.repo_cache is not None and self.repo_cache.release(repo_path):
+            return
+        if repo_path not in self._temp_dirs:
+            return
+        self._temp_dirs.discard(repo_path)
+        shutil.rmtree(repo_path, ignore_errors=True)
+        self._log("debug", "Removed cloned repository", repo_path=str(repo_path))
+        
     def _get_context(self, **kwargs) -> Dict[str, Any]:
         """Get standard context for logging.
         
@@ -239,6 +334,25 @@ class FileService(BaseService):
         Returns:
             List of FileInfo objects for each file
         """
+        return list(self.iter_repository_files(repo_path, repo_id))
+        
+    def iter_repository_files(self, repo_path: Union[str, Path], repo_id: Optional[int] = None) -> Iterator[FileInfo]:
+        """Lazily yield files from a repository directory.
+        
+        Files are yielded as they are discovered, so consumers can start
+        working before the whole tree has been walked.
+        
+        Git working trees are listed from the index instead of walking the
+        filesystem (see ``iter_index_files``); other directories, or trees
+        whose index cannot be read, fall back to the directory walk.
+        
+        Args:
+            repo_path: Path to the repository directory
+            repo_id: Optional repository ID to associate with files
+            
+        Returns:
+            Iterator over FileInfo objects for each file
+        """
         repo_path = Path(repo_path)
         
         # Find repository root (directory containing .git)
@@ -253,13 +367,144 @@ class FileService(BaseService):
                  repo_root=str(repo_root))
         
         # Use custom filter config for repository files
-        filter_config = FileFilterConfig(
-            exclude_paths=list(GIT_EXCLUDES | BUILD_EXCLUDES | EDITOR_EXCLUDES)
-        )
+        filter_config = self._repository_filter_config()
         self._log("debug", "Created filter config",
                  exclude_paths=filter_config.exclude_paths)
         
-        return self.list_files(repo_path, filter_config, repo_id)
+        if self.use_git_index:
+            files = self.iter_index_files(repo_path, repo_id)
+            if files is not None:
+                return files
+                
+        # Binary files are detected when the ingestion pipeline reads them,
+        # so the walk itself never opens a file
+        return self.iter_files(repo_path, filter_config, repo_id, sniff_binary=False,
+                               use_ignore_files=self.use_ignore_files)
+        
+    def iter_index_files(self, repo_path: Union[str, Path],
+                         repo_id: Optional[int] = None) -> Optional[Iterator[FileInfo]]:
+        """List the files of a git working tree from its index.
+        
+        Clean tracked files are listed straight from the index, with the
+        size, modification time and blob SHA it recorded, so they cost no
+        system call at all; the blob SHA lets the ingestion pipeline skip
+        unchanged files without reading them. Files git reports as modified
+        (``git ls-files --modified``) and untracked files that are not
+        ignored (``git ls-files --others --exclude-standard``) are stat-ed
+        and hashed when read, like walked files. Entries outside a sparse
+        checkout and submodules are skipped.
+        
+        Unlike the directory walk, tracked files are listed even if an
+        ignore file matches them, as git does.
+        
+        Args:
+            repo_path: Path to the working tree or a directory inside it
+            repo_id: Optional repository ID to associate with files
+            
+        Returns:
+            Iterator over FileInfo objects, or None if ``repo_path`` is not
+            inside a git working tree or its index cannot be read
+        """
+        repo_path = Path(repo_path)
+        try:
+            repo = git.Repo(str(repo_path), search_parent_directories=True)
+            if repo.bare:
+                return None
+            prefix = repo_path.resolve().relative_to(Path(repo.working_tree_dir).resolve()).as_posix()
+            prefix = '' if prefix == '.' else prefix + '/'
+            entries = repo.index.entries
+            # Paths are relative to the work tree root, where GitPython runs git
+            changed = set(self._split_nul(repo.git.ls_files('-z', '--modified', '--deleted')))
+            untracked = self._split_nul(repo.git.ls_files('-z', '--others', '--exclude-standard',
+                                                         '--', prefix or '.'))
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError,
+                git.GitCommandError, ValueError, OSError) as e:
+            self._log("debug", "Cannot list files from git index, walking directory",
+                     repo_path=str(repo_path),
+                     error=str(e))
+            return None
+            
+        self._log("debug", "Listing files from git index",
+                 repo_path=str(repo_path),
+                 indexed=len(entries),
+                 modified=len(changed),
+                 untracked=len(untracked))
+        return self._iter_index_entries(repo_path, prefix, entries, changed, untracked, repo_id)
+        
+    def _iter_index_entries(self, repo_path: Path, prefix: str, entries: Dict[Tuple[str, int], Any],
+                            changed: Set[str], untracked: List[str],
+                            repo_id: Optional[int]) -> Iterator[FileInfo]:
+        """Turn index entries and untracked paths into FileInfo objects.
+        
+        Args:
+            repo_path: Directory the listing is for
+            prefix: Path of ``repo_path`` relative to the work tree root, with
+                a trailing ``/`` unless it is the root
+            entries: GitPython index entries keyed by (path, stage)
+            changed: Tracked paths whose working tree copy differs from the index
+            untracked: Untracked, non-ignored paths
+            repo_id: Optional repository ID to associate with files
+            
+        Yields:
+            FileInfo objects for files that pass the filters
+        """
+        path_filter = self._path_filter(self._repository_filter_config())
+        # Ordered set: conflicted paths have one entry per stage
+        from_disk: Dict[str, None] = {}
+        for (path, stage), entry in entries.items():
+            if not path.startswith(prefix):
+                continue
+            if entry.flags & INDEX_EXTENDED_FLAG or entry.mode == GIT_SUBMODULE_MODE:
+                continue
+            relative_path = path[len(prefix):]
+            if not path_filter.matches(relative_path):
+                continue
+            if stage or path in changed or entry.mode == GIT_SYMLINK_MODE:
+                # Conflicted, modified and symlinked files are read from disk
+                from_disk[relative_path] = None
+                continue
+            file_path = repo_path / relative_path
+            yield FileInfo(
+                path=file_path,
+                language=self._detect_language(file_path),
+                repo_id=repo_id or 0,
+                metadata={
+                    'size': entry.size,
+                    'modified': entry.mtime[0] + entry.mtime[1] / 1e9,
+                    'blob_sha': entry.hexsha,
+                    'mode': f'{entry.mode:o}',
+                    'is_special': file_path.name in SPECIAL_FILENAMES
+                }
+            )
+            
+        for path in untracked:
+            relative_path = path[len(prefix):]
+            if path_filter.matches(relative_path):
+                from_disk[relative_path] = None
+        for relative_path in from_disk:
+            file_path = repo_path / relative_path
+            try:
+                stat = file_path.stat()
+            except OSError:
+                # Deleted from the working tree, or a dangling symlink
+                continue
+            if not os.path.isfile(file_path):
+                continue
+            file_info = self._build_file_info(file_path, None, repo_id, sniff_binary=False, stat=stat)
+            if file_info is not None:
+                yield file_info
+                
+    @staticmethod
+    def _split_nul(output: str) -> List[str]:
+        """Split NUL-terminated git output into paths."""
+        return [path for path in output.split('\0') if path]
+        
+    def _repository_filter_config(self) -> FileFilterConfig:
+        """Build the filter configuration applied to repository files."""
+        return FileFilterConfig(
+            include_paths=self._filter_config.include_paths,
+            exclude_paths=list(GIT_EXCLUDES | BUILD_EXCLUDES | EDITOR_EXCLUDES)
+        )
         
     def list_files(self, root_path: Path, filter_config: Optional[FileFilterConfig] = None, repo_id: Optional[int] = None) -> List[FileInfo]:
         """List files in a directory, optionally filtered by configuration.
@@ -276,45 +521,48 @@ class FileService(BaseService):
             FileNotFoundError: If the root path does not exist.
             PermissionError: If a directory cannot be accessed.
         """
+        files = list(self.iter_files(root_path, filter_config, repo_id))
+        self._log("debug", "Files listed successfully",
+                 root_path=str(root_path),
+                 filter_config=filter_config.__dict__ if filter_config else None,
+                 file_count=len(files))
+        return files
+        
+    def iter_files(self, root_path: Path, filter_config: Optional[FileFilterConfig] = None, repo_id: Optional[int] = None,
+                   sniff_binary: bool = True, use_ignore_files: bool = False) -> Iterator[FileInfo]:
+        """Lazily yield files in a directory, optionally filtered by configuration.
+        
+        Args:
+            root_path: Root directory to start searching from.
+            filter_config: Optional configuration for filtering files.
+            repo_id: Optional repository ID to associate with files.
+            sniff_binary: Open each file to skip binary ones. Callers that
+                read the content anyway can skip this and check it then.
+            use_ignore_files: Skip paths ignored by ``.gitignore`` and
+                ``.dockerignore`` files found along the way
+            
+        Yields:
+            FileInfo objects for matching files.
+            
+        Raises:
+            FileNotFoundError: If the root path does not exist.
+            PermissionError: If the root directory cannot be accessed.
+        """
+        if filter_config:
+            path_filter = self._path_filter(filter_config)
+        else:
+            # Without a filter nothing is dropped, but default excludes are
+            # still never descended into
+            path_filter = PathFilter(exclude=sorted(DEFAULT_EXCLUDES))
         try:
-            files = []
-            for file_path in root_path.rglob('*'):
-                if not file_path.is_file():
-                    continue
-                    
-                # Skip files based on filter config
-                if filter_config and not self._matches_filter(file_path, filter_config):
-                    self._log("debug", "File filtered out by config", file=str(file_path))
-                    continue
-                
-                # Skip binary files early
-                if self._is_binary_file(file_path):
-                    self._log("debug", "Skipping binary file", file=str(file_path))
+            walk = self._walk_files(Path(root_path), path_filter, use_ignore_files)
+            for file_path, relative_path, stat in walk:
+                # Excluded directories were pruned, so parents need no check
+                if filter_config and not path_filter.matches(relative_path, check_parents=False):
                     continue
-                
-                # Get language from LanguageService
-                language = self._detect_language(file_path)
-                self._log("debug", "Detected language", file=str(file_path), language=language)
-                
-                # Create FileInfo with detected language
-                file_info = FileInfo(
-                    path=file_path,
-                    language=language,
-                    repo_id=repo_id or 0,  # Use 0 as default if no repo_id provided
-                    metadata={
-                        'size': file_path.stat().st_size,
-                        'modified': file_path.stat().st_mtime,
-                        'is_special': file_path.name in SPECIAL_FILENAMES
-                    }
-                )
-                self._log("debug", "Created FileInfo", file=str(file_path), language=language, is_supported=file_info.is_supported)
-                files.append(file_info)
-                
-            self._log("debug", "Files listed successfully",
-                     root_path=str(root_path),
-                     filter_config=filter_config.__dict__ if filter_config else None,
-                     file_count=len(files))
-            return files
+                file_info = self._build_file_info(file_path, None, repo_id, sniff_binary, stat)
+                if file_info is not None:
+                    yield file_info
             
         except (FileNotFoundError, PermissionError) as e:
             self._log("error", "Error listing files",
@@ -323,6 +571,319 @@ class FileService(BaseService):
                      error=str(e))
             raise
             
+    def _walk_files(self, root_path: Path, path_filter: PathFilter,
+                    use_ignore_files: bool = False) -> Iterator[Tuple[Path, str, os.stat_result]]:
+        """Walk a directory tree with ``os.scandir``, pruning excluded directories.
+        
+        Excluded directories (``node_modules``, ``.git``, ``build`` ...) are
+        never descended into, symlinked directories are not followed, and
+        each file is stat-ed once through its ``DirEntry``.
+        
+        With ``use_ignore_files``, the ignore files of each directory are
+        parsed when the walk enters it and apply to everything below it,
+        with deeper files taking precedence as in git. Ignored directories
+        are pruned like excluded ones.
+        
+        Args:
+            root_path: Directory to walk
+            path_filter: Filter whose directory excludes prune the walk
+            use_ignore_files: Honour ``.gitignore`` and ``.dockerignore`` files
+            
+        Yields:
+            (path, path relative to ``root_path`` with ``/`` separators,
+            stat result) for every regular file found
+            
+        Raises:
+            FileNotFoundError: If the root path does not exist.
+            PermissionError: If the root directory cannot be accessed.
+        """
+        ignore_parser = GitignoreParser() if use_ignore_files else None
+        root_scopes: IgnoreScopes = ()
+        if ignore_parser is not None:
+            # Repository-local excludes apply like a root .gitignore
+            root_scopes = self._load_ignore_scopes(
+                ignore_parser, root_path / '.git' / 'info', ('exclude',), '', ())
+            
+        pruned = 0
+        ignored = 0
+        stack: List[Tuple[str, str, IgnoreScopes]] = [(str(root_path), '', root_scopes)]
+        while stack:
+            directory, prefix, scopes = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError as e:
+                if directory == str(root_path):
+                    raise
+                self._log("warning", "Cannot read directory", directory=directory, error=str(e))
+                continue
+                
+            if ignore_parser is not None:
+                names = {entry.name for entry in entries}
+                present = [name for name in IGNORE_FILENAMES if name in names]
+                if present:
+                    scopes = self._load_ignore_scopes(
+                        ignore_parser, Path(directory), present, prefix, scopes)
+                    
+            subdirectories = []
+            for entry in entries:
+                try:
+                    relative_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if path_filter.is_dir_excluded(relative_path):
+                            pruned += 1
+                        elif scopes and self._is_ignored(scopes, relative_path, is_dir=True):
+                            ignored += 1
+                        else:
+                            subdirectories.append((entry.path, relative_path + '/', scopes))
+                    elif entry.is_file():
+                        if scopes and self._is_ignored(scopes, relative_path):
+                            ignored += 1
+                            continue
+                        yield Path(entry.path), relative_path, entry.stat()
+                except OSError as e:
+                    self._log("debug", "Cannot stat entry", path=entry.path, error=str(e))
+            # Reverse so directories are visited in scandir order
+            stack.extend(reversed(subdirectories))
+            
+        self._log("debug", "Directory walk finished",
+                 root_path=str(root_path),
+                 pruned_directories=pruned,
+                 ignored_paths=ignored)
+        
+    def _load_ignore_scopes(self, parser: GitignoreParser, directory: Path, names: List[str],
+                            prefix: str, scopes: IgnoreScopes) -> IgnoreScopes:
+        """Parse a directory's ignore files and push them onto the scopes.
+        
+        Args:
+            parser: Parser for gitignore-style files
+            directory: Directory containing the ignore files
+            names: Names of the ignore files to read
+            prefix: Path of ``directory`` relative to the walk root, with a
+                trailing ``/`` unless it is the root
+            scopes: Scopes inherited from parent directories
+            
+        Returns:
+            The inherited scopes plus one for the directory, if it has patterns
+        """
+        patterns: List[str] = []
+        for name in names:
+            try:
+                content = (directory / name).read_text(encoding='utf-8', errors='replace')
+            except OSError:
+                continue
+            result = parser.parse(content)
+            if result:
+                patterns.extend(str(pattern) for pattern in result.patterns)
+        if not patterns:
+            return scopes
+        return scopes + ((prefix, compile_patterns(tuple(patterns))),)
+        
+    @staticmethod
+    def _is_ignored(scopes: IgnoreScopes, relative_path: str, is_dir: bool = False) -> bool:
+        """Check a path against ignore scopes, the deepest scope deciding first."""
+        for prefix, matcher in reversed(scopes):
+            result = matcher.match(relative_path[len(prefix):], is_dir)
+            if result is not None:
+                return result
+        return False
+        
+    def iter_files_for_paths(self, repo_path: Union[str, Path], relative_paths: List[str],
+                             repo_id: Optional[int] = None) -> Iterator[FileInfo]:
+        """Yield FileInfo objects for specific paths inside a repository.
+        
+        The same filters used for a full walk are applied, so an incremental
+        run sees exactly the files a full run would.
+        
+        Args:
+            repo_path: Path to the repository directory
+            relative_paths: Paths relative to ``repo_path``
+            repo_id: Optional repository ID to associate with files
+            
+        Yields:
+            FileInfo objects for paths that exist and pass the filters
+        """
+        repo_path = Path(repo_path)
+        filter_config = self._repository_filter_config()
+        for relative_path in relative_paths:
+            file_path = repo_path / relative_path
+            if not file_path.is_file():
+                continue
+            file_info = self._build_file_info(file_path, filter_config, repo_id,
+                                              sniff_binary=False, root=repo_path)
+            if file_info is not None:
+                yield file_info
+                
+    def iter_git_files(self, repo_path: Union[str, Path], reader: GitBlobReader,
+                       repo_id: Optional[int] = None,
+                       relative_paths: Optional[List[str]] = None) -> Iterator[FileInfo]:
+        """Yield files listed in the git object database.
+        
+        Nothing is read from disk: paths are resolved against ``repo_path``
+        and each FileInfo carries the blob SHA in its metadata, so content
+        can be streamed with ``reader.read_blob``. Binary detection happens
+        when the blob is read.
+        
+        Args:
+            repo_path: Path to a bare repository or a directory inside a work tree
+            reader: Reader bound to the repository
+            repo_id: Optional repository ID to associate with files
+            relative_paths: Optional paths to restrict the listing to
+            
+        Yields:
+            FileInfo objects for blobs that pass the filters
+        """
+        repo_path = Path(repo_path)
+        path_filter = self._path_filter(self._repository_filter_config())
+        if relative_paths is not None and not relative_paths:
+            return
+        for entry in reader.iter_tree(relative_paths):
+            file_path = repo_path / entry.path
+            if entry.missing:
+                # Left on the server by a partial clone's blob size limit
+                self._log("debug", "Skipping blob missing from partial clone",
+                         file=str(file_path))
+                continue
+            if not path_filter.matches(entry.path):
+                continue
+            language = self._detect_language(file_path)
+            yield FileInfo(
+                path=file_path,
+                language=language,
+                repo_id=repo_id or 0,
+                metadata={
+                    'size': entry.size,
+                    'blob_sha': entry.blob_sha,
+                    'mode': entry.mode,
+                    'is_special': file_path.name in SPECIAL_FILENAMES
+                }
+            )
+            
+    def _build_file_info(self, file_path: Path, filter_config: Optional[FileFilterConfig],
+                         repo_id: Optional[int], sniff_binary: bool = True,
+                         stat: Optional[os.stat_result] = None,
+                         root: Optional[Path] = None) -> Optional[FileInfo]:
+        """Build a FileInfo for a file, or None if it is filtered out.
+        
+        Args:
+            file_path: Path to the file
+            filter_config: Optional configuration for filtering files
+            repo_id: Optional repository ID to associate with the file
+            sniff_binary: Open the file to skip it if it is binary
+            stat: Stat result for the file, if the caller already has one
+            root: Directory filter patterns are relative to
+            
+        Returns:
+            FileInfo for the file, or None if it should be skipped
+        """
+        # Skip files based on filter config
+        if filter_config and not self._matches_filter(file_path, filter_config, root):
+            self._log("debug", "File filtered out by config", file=str(file_path))
+            return None
+        
+        # Skip binary files early
+        if sniff_binary and self._is_binary_file(file_path):
+            self._log("debug", "Skipping binary file", file=str(file_path))
+            return None
+        
+        # Get language from LanguageService
+        language = self._detect_language(file_path)
+        self._log("debug", "Detected language", file=str(file_path), language=language)
+        
+        # Create FileInfo with detected language
+        if stat is None:
+            stat = file_path.stat()
+        file_info = FileInfo(
+            path=file_path,
+            language=language,
+            repo_id=repo_id or 0,  # Use 0 as default if no repo_id provided
+            metadata={
+                'size': stat.st_size,
+                'modified': stat.st_mtime,
+                'is_special': file_path.name in SPECIAL_FILENAMES
+            }
+        )
+        self._log("debug", "Created FileInfo", file=str(file_path), language=language, is_supported=file_info.is_supported)
+        return file_info
+        
+    def get_head_commit(self, repo_path: Union[str, Path]) -> Optional[str]:
+        """Get the SHA of the commit checked out in a repository.
+        
+        Args:
+            repo_path: Path inside the repository
+            
+        Returns:
+            HEAD commit SHA, or None if the path is not in a git repository
+        """
+        try:
+            return git.Git(str(repo_path)).rev_parse('HEAD').strip()
+        except (git.GitCommandError, git.NoSuchPathError) as e:
+            self._log("debug", "Could not resolve HEAD commit",
+                     repo_path=str(repo_path),
+                     error=str(e))
+            return None
+            
+    def get_changed_files(self, repo_path: Union[str, Path], base_commit: str,
+                          head_commit: str = 'HEAD') -> Optional[RepositoryChanges]:
+        """Get the files changed between two commits.
+        
+        Uses ``git diff --name-status`` with rename detection. Paths are
+        relative to ``repo_path`` and limited to files beneath it.
+        
+        Args:
+            repo_path: Path inside the repository
+            base_commit: Commit to diff from (e.g. the last analyzed commit)
+            head_commit: Commit to diff to
+            
+        Returns:
+            RepositoryChanges, or None if the diff could not be computed
+            (for example because the base commit is not in the clone)
+        """
+        try:
+            output = git.Git(str(repo_path)).diff(
+                '--name-status', '-M', '-z', '--relative', base_commit, head_commit
+            )
+        except (git.GitCommandError, git.NoSuchPathError) as e:
+            self._log("warning", "Failed to diff commits",
+                     repo_path=str(repo_path),
+                     base_commit=base_commit,
+                     head_commit=head_commit,
+                     error=str(e))
+            return None
+            
+        changes = RepositoryChanges(base_commit=base_commit, head_commit=head_commit)
+        tokens = output.split('\0')
+        i = 0
+        while i < len(tokens) and tokens[i]:
+            status = tokens[i][0]
+            if status in ('R', 'C'):
+                old_path, new_path = tokens[i + 1], tokens[i + 2]
+                if status == 'R':
+                    changes.renamed.append((old_path, new_path))
+                else:
+                    changes.added.append(new_path)
+                i += 3
+                continue
+            path = tokens[i + 1]
+            if status == 'A':
+                changes.added.append(path)
+            elif status == 'D':
+                changes.deleted.append(path)
+            else:
+                # M (modified), T (type change) and anything unexpected
+                changes.modified.append(path)
+            i += 2
+            
+        self._log("debug", "Computed changed files",
+                 repo_path=str(repo_path),
+                 base_commit=base_commit,
+                 head_commit=head_commit,
+                 added=len(changes.added),
+                 modified=len(changes.modified),
+                 deleted=len(changes.deleted),
+                 renamed=len(changes.renamed))
+        return changes
+        
     def _is_binary_file(self, file_path: Union[str, Path]) -> bool:
         """Check if a file is binary.
         
@@ -334,12 +895,7 @@ class FileService(BaseService):
         """
         try:
             with open(file_path, 'rb') as f:
-                # Read first 8000 bytes
-                chunk = f.read(8000)
-                # Count null bytes
-                null_count = chunk.count(b'\x00')
-                # If more than 10% of bytes are null, consider it binary
-                return null_count > len(chunk) * 0.1
+                return is_binary_content(f.read(BINARY_SNIFF_SIZE))
         except (FileNotFoundError, PermissionError):
             return False
             
@@ -408,72 +964,49 @@ class FileService(BaseService):
                      error=str(e))
             raise
             
-    def _matches_filter(self, file_path: Path, filter_config: FileFilterConfig) -> bool:
+    def _matches_filter(self, file_path: Path, filter_config: FileFilterConfig,
+                        root: Optional[Path] = None) -> bool:
         """Check if a file matches the filter configuration.
         
+        Patterns use ``.gitignore`` semantics and are compiled once per
+        configuration, so each check is a single call into a compiled
+        matcher.
+        
         Args:
             file_path: Path to the file to check.
             filter_config: Configuration for filtering files.
+            root: Directory the patterns are relative to. Without it,
+                anchored patterns are matched against the full path.
             
         Returns:
             True if the file matches the filter, False otherwise.
         """
-        if filter_config.exclude_paths:
-            for pattern in filter_config.exclude_paths:
-                # Check if pattern is a full path pattern (contains '/')
-                if '/' in pattern:
-                    if file_path.match(pattern):
-                        self._log("debug", "File excluded by path pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="full path match")
-                        return False
-                else:
-                    # For simple patterns, only match against the file name
-                    if file_path.name == pattern or file_path.name.startswith('.'):
-                        self._log("debug", "File excluded by name pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="exact name match or dot file")
-                        return False
-                    # For wildcard patterns, match against the file name
-                    if '*' in pattern and file_path.name.endswith(pattern.replace('*', '')):
-                        self._log("debug", "File excluded by wildcard pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="wildcard match")
-                        return False
-                    
-        if filter_config.include_paths:
-            for pattern in filter_config.include_paths:
-                # Check if pattern is a full path pattern (contains '/')
-                if '/' in pattern:
-                    if file_path.match(pattern):
-                        self._log("debug", "File included by path pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="full path match")
-                        return True
-                else:
-                    # For simple patterns, only match against the file name
-                    if file_path.name == pattern:
-                        self._log("debug", "File included by name pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="exact name match")
-                        return True
-                    # For wildcard patterns, match against the file name
-                    if '*' in pattern and file_path.name.endswith(pattern.replace('*', '')):
-                        self._log("debug", "File included by wildcard pattern",
-                                file=str(file_path),
-                                pattern=pattern,
-                                reason="wildcard match")
-                        return True
-            self._log("debug", "File excluded by no include pattern match",
-                     file=str(file_path))
-            return False
-            
-        return True
+        return self._path_filter(filter_config).matches(self._relative_posix(file_path, root))
+        
+    @staticmethod
+    def _path_filter(filter_config: FileFilterConfig) -> PathFilter:
+        """Compile a filter configuration into a PathFilter.
+        
+        As before compiled matching was introduced, dot files are dropped
+        whenever exclude patterns are configured, unless a pattern matches
+        them explicitly.
+        """
+        exclude = filter_config.exclude_paths or ()
+        return PathFilter(include=filter_config.include_paths or (),
+                          exclude=exclude,
+                          exclude_hidden=bool(exclude))
+        
+    @staticmethod
+    def _relative_posix(file_path: Union[str, Path], root: Optional[Path] = None) -> str:
+        """Get a path relative to ``root`` (or its anchor) with ``/`` separators."""
+        file_path = Path(file_path)
+        if root is not None:
+            try:
+                return file_path.relative_to(root).as_posix()
+            except ValueError:
+                pass
+        parts = file_path.parts[1:] if file_path.anchor else file_path.parts
+        return '/'.join(parts)
         
     def _detect_language(self, file_path: Union[str, Path]) -> str:
         """Detect the programming language of a file.
@@ -535,17 +1068,8 @@ class FileService(BaseService):
         Returns:
             True if the file should be excluded
         """
-        # Check each path component against exclude patterns
-        for part in file_path.parts:
-            if part in DEFAULT_EXCLUDES:
-                return True
-                
-            # Check wildcard patterns
-            for pattern in DEFAULT_EXCLUDES:
-                if '*' in pattern and Path(part).match(pattern):
-                    return True
-                    
-        return False 
+        matcher = compile_patterns(tuple(sorted(DEFAULT_EXCLUDES)))
+        return matcher.is_matched(self._relative_posix(file_path)) 
 
     def has_custom_parser(self, file_path: Union[str, Path]) -> bool:
         """Check if a file has a custom parser available.
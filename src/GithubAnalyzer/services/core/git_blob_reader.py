@@ -0,0 +1,234 @@
+"""Read repository content straight from the git object database.
+
+``GitBlobReader`` lists files with ``git ls-tree`` and streams blob
+contents through a single long-lived ``git cat-file --batch`` process, so
+repositories can be analyzed from a bare clone without materializing a
+working tree.
+"""
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+
+from GithubAnalyzer.models.core.errors import FileError
+from GithubAnalyzer.services.core.base_service import BaseService
+from GithubAnalyzer.utils.logging import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+
+@dataclass
+class GitTreeEntry:
+    """A blob listed in a git tree.
+
+    Attributes:
+        path: Path relative to the directory the tree was listed from
+        blob_sha: SHA of the blob, which doubles as a content hash
+        mode: Git file mode (e.g. ``100644``)
+        size: Blob size in bytes, or None if the blob is missing
+        missing: The blob was left out of a partial clone
+    """
+    path: str
+    blob_sha: str
+    mode: str
+    size: Optional[int]
+    missing: bool = False
+
+
+@dataclass
+class GitBlobReader(BaseService):
+    """Streams blobs out of a repository's object database.
+
+    Attributes:
+        repo_path: Path to a bare repository or a directory inside a work tree
+        commit: Commit-ish whose tree is read
+    """
+    repo_path: Union[str, Path] = "."
+    commit: str = "HEAD"
+    _process: Optional[subprocess.Popen] = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def _get_context(self, **kwargs) -> Dict[str, Any]:
+        """Get standard context for logging.
+
+        Args:
+            **kwargs: Additional context key-value pairs
+
+        Returns:
+            Dict with standard context fields plus any additional fields
+        """
+        context = {
+            'module': 'git_blob_reader',
+            'thread': threading.get_ident(),
+            'duration_ms': (time.time() - self._start_time) * 1000,
+            'repo_path': str(self.repo_path)
+        }
+        context.update(kwargs)
+        return context
+
+    def _log(self, level: str, message: str, **kwargs) -> None:
+        """Log with consistent context.
+
+        Args:
+            level: Log level (debug, info, warning, error, critical)
+            message: Message to log
+            **kwargs: Additional context key-value pairs
+        """
+        context = self._get_context(**kwargs)
+        getattr(self._logger, level)(message, extra={'context': context})
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def iter_tree(self, paths: Optional[Sequence[str]] = None) -> Iterator[GitTreeEntry]:
+        """List the blobs in the commit's tree.
+
+        Args:
+            paths: Optional paths to restrict the listing to
+
+        Yields:
+            GitTreeEntry for each regular file or symlink blob
+
+        Raises:
+            FileError: If the tree cannot be listed
+        """
+        if self.is_partial_clone():
+            yield from self._iter_partial_tree(paths)
+            return
+
+        for meta, path in self._ls_tree(paths, long=True):
+            mode, obj_type, sha, size = meta.split()
+            if obj_type != b'blob':
+                # Submodules (commits) have no content to analyze
+                continue
+            yield GitTreeEntry(
+                path=path.decode('utf-8', errors='surrogateescape'),
+                blob_sha=sha.decode('ascii'),
+                mode=mode.decode('ascii'),
+                size=int(size)
+            )
+
+    def is_partial_clone(self) -> bool:
+        """Check whether the repository was cloned with a blob filter."""
+        result = subprocess.run(['git', 'config', '--get', 'remote.origin.promisor'],
+                                cwd=str(self.repo_path), capture_output=True, text=True)
+        return result.stdout.strip() == 'true'
+
+    def _iter_partial_tree(self, paths: Optional[Sequence[str]]) -> Iterator[GitTreeEntry]:
+        """List a partial clone's tree without fetching filtered-out blobs.
+
+        ``ls-tree --long`` would lazily download every missing blob to
+        report its size, so missing blobs are found with ``rev-list
+        --missing=print`` (which never fetches) and sizes of the blobs that
+        are present come from ``cat-file --batch-check``.
+        """
+        output = self._run(['git', 'rev-list', '--objects', '--no-object-names',
+                            '--missing=print', '--no-walk', self.commit],
+                           "Failed to find missing blobs")
+        missing = {line[1:] for line in output.split(b'\n') if line.startswith(b'?')}
+
+        entries = []
+        for meta, path in self._ls_tree(paths, long=False):
+            mode, obj_type, sha = meta.split()
+            if obj_type == b'blob':
+                entries.append((mode, sha, path))
+
+        present = [sha for _, sha, _ in entries if sha not in missing]
+        sizes: Dict[bytes, int] = {}
+        if present:
+            output = self._run(['git', 'cat-file', '--batch-check=%(objectname) %(objectsize)'],
+                               "Failed to read blob sizes", stdin=b'\n'.join(present) + b'\n')
+            for line in output.splitlines():
+                sha, _, size = line.partition(b' ')
+                sizes[sha] = int(size)
+
+        for mode, sha, path in entries:
+            yield GitTreeEntry(
+                path=path.decode('utf-8', errors='surrogateescape'),
+                blob_sha=sha.decode('ascii'),
+                mode=mode.decode('ascii'),
+                size=sizes.get(sha),
+                missing=sha in missing
+            )
+
+    def _ls_tree(self, paths: Optional[Sequence[str]], long: bool) -> Iterator[tuple]:
+        """Run ``git ls-tree`` and yield ``(meta, path)`` byte pairs."""
+        args = ['git', 'ls-tree', '-r', '-z']
+        if long:
+            args.append('--long')
+        args.append(self.commit)
+        if paths:
+            args.append('--')
+            args.extend(paths)
+        output = self._run(args, "Failed to list git tree")
+        for record in output.split(b'\0'):
+            if record:
+                meta, _, path = record.partition(b'\t')
+                yield meta, path
+
+    def _run(self, args: Sequence[str], error: str, stdin: Optional[bytes] = None) -> bytes:
+        """Run a git command in the repository and return its output."""
+        try:
+            return subprocess.run(args, cwd=str(self.repo_path), input=stdin,
+                                  capture_output=True, check=True).stdout
+        except (subprocess.CalledProcessError, OSError) as e:
+            stderr = getattr(e, 'stderr', b'') or b''
+            raise FileError(f"{error}: {stderr.decode(errors='replace') or e}")
+
+    def read_blob(self, blob_sha: str) -> bytes:
+        """Read a blob's content.
+
+        Args:
+            blob_sha: SHA of the blob to read
+
+        Returns:
+            Raw blob bytes
+
+        Raises:
+            FileError: If the object is missing or cannot be read
+        """
+        with self._lock:
+            process = self._ensure_process()
+            process.stdin.write(blob_sha.encode('ascii') + b'\n')
+            process.stdin.flush()
+            header = process.stdout.readline()
+            if not header:
+                raise FileError(f"git cat-file exited while reading {blob_sha}")
+            parts = header.split()
+            if len(parts) < 3 or parts[1] == b'missing':
+                raise FileError(f"Git object not found: {blob_sha}")
+            size = int(parts[2])
+            data = process.stdout.read(size)
+            # Each object is followed by a newline
+            process.stdout.read(1)
+            return data
+
+    def _ensure_process(self) -> subprocess.Popen:
+        """Start the ``git cat-file --batch`` process on first use."""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ['git', 'cat-file', '--batch'],
+                cwd=str(self.repo_path),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            self._log("debug", "Started git cat-file process")
+        return self._process
+
+    def close(self) -> None:
+        """Stop the ``git cat-file`` process."""
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._process.kill()
+                self._process = None
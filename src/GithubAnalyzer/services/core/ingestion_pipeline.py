@@ -0,0 +1,495 @@
+"""Streaming ingestion pipeline for repository processing.
+
+Files flow through five stages - discovery, read, parse, embed and store -
+joined by bounded queues. Each stage runs in its own thread, so slow stages
+(embedding in particular) overlap with I/O and parsing, while the bounded
+queues apply backpressure and keep memory flat regardless of repository
+size. The store stage runs in the calling thread and is the only stage
+that writes to the databases or touches ``ProcessingStats``.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from GithubAnalyzer.models.core.base_model import BaseModel
+from GithubAnalyzer.models.core.db.database import CodeSnippet
+from GithubAnalyzer.models.core.file import FileContent, FileInfo
+from GithubAnalyzer.models.core.repository import ProcessingStats
+from GithubAnalyzer.services.core.database.embedding_service import \
+    CodeEmbeddingService
+from GithubAnalyzer.services.core.file_policy import (TIER_SKIP,
+                                                       FilePolicy,
+                                                       TierDecision)
+from GithubAnalyzer.services.core.file_processor import (
+    STATUS_ERROR, STATUS_PROCESSED, STATUS_SKIPPED, FileProcessor,
+    init_worker, metadata_only_reason, process_file_in_worker)
+from GithubAnalyzer.services.core.parse_cache import \
+    DEFAULT_PARSE_CACHE_MAX_BYTES
+from GithubAnalyzer.utils.hashing import git_blob_hash
+from GithubAnalyzer.utils.logging import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Marks the end of the stream on every queue
+_END = object()
+
+
+@dataclass
+class PipelineItem:
+    """A file travelling through the ingestion pipeline.
+
+    Attributes:
+        file_info: File being processed
+        content: File content once read; released after parsing
+        content_hash: Git blob SHA of the raw content, used for change detection
+        bytes_read: Bytes read for the file
+        read_ms: Time spent reading the file, in milliseconds
+        snippet: Code snippet once parsed
+        embedding: Embedding vector once computed
+        status: None while pending, otherwise ``processed``, ``skipped`` or ``error``
+        reason: Why the file was skipped
+        error: Error message when a stage failed
+        tier: Processing tier chosen by the file policy, if one is in use
+    """
+    file_info: FileInfo
+    content: Optional[FileContent] = None
+    content_hash: Optional[str] = None
+    bytes_read: int = 0
+    read_ms: float = 0.0
+    snippet: Optional[CodeSnippet] = None
+    embedding: Optional[List[float]] = None
+    status: Optional[str] = None
+    reason: Optional[str] = None
+    error: Optional[str] = None
+    tier: Optional[TierDecision] = None
+
+    @property
+    def file_path(self) -> str:
+        """Path of the file as stored in the databases."""
+        return str(self.file_info.path)
+
+    def skip(self, reason: str) -> "PipelineItem":
+        """Mark the item as skipped."""
+        self.status = STATUS_SKIPPED
+        self.reason = reason
+        return self
+
+    def fail(self, error: Exception) -> "PipelineItem":
+        """Mark the item as failed."""
+        self.status = STATUS_ERROR
+        self.error = str(error)
+        return self
+
+
+@dataclass
+class IngestionPipeline(BaseModel):
+    """Bounded-queue pipeline that streams files from discovery to storage.
+
+    Attributes:
+        file_processor: Reads and parses files
+        embedding_service: Computes embeddings in batches
+        is_unchanged: Callback ``(file_path, content_hash) -> bool`` used to
+            skip files whose stored version is current
+        store: Callback that persists a processed item
+        workers: Worker processes for the parse stage; 1 parses in-thread
+        queue_size: Capacity of each inter-stage queue
+        embed_batch_size: Maximum number of snippets embedded per batch
+        policy: Places files in processing tiers; every file runs every
+            stage when None
+    """
+    file_processor: FileProcessor
+    embedding_service: CodeEmbeddingService
+    is_unchanged: Callable[[str, str], bool]
+    store: Callable[[PipelineItem], None]
+    workers: int = 1
+    queue_size: int = 64
+    embed_batch_size: int = 16
+    policy: Optional[FilePolicy] = None
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+
+    def __post_init__(self):
+        """Initialize the pipeline."""
+        super().__post_init__()
+        self._logger = logger
+        self._start_time = time.time()
+        # (stage, error) of stages that stopped before their input ended
+        self._stage_failures: List[Tuple[str, str]] = []
+
+    def _get_context(self, **kwargs) -> Dict[str, Any]:
+        """Get standard context for logging.
+
+        Args:
+            **kwargs: Additional context key-value pairs
+
+        Returns:
+            Dict with standard context fields plus any additional fields
+        """
+        context = {
+            'module': 'ingestion_pipeline',
+            'thread': threading.get_ident(),
+            'duration_ms': (time.time() - self._start_time) * 1000
+        }
+        context.update(kwargs)
+        return context
+
+    def _log(self, level: str, message: str, **kwargs) -> None:
+        """Log with consistent context.
+
+        Args:
+            level: Log level (debug, info, warning, error, critical)
+            message: Message to log
+            **kwargs: Additional context key-value pairs
+        """
+        context = self._get_context(**kwargs)
+        getattr(self._logger, level)(message, extra={'context': context})
+
+    def run(self, files: Iterable[FileInfo], stats: ProcessingStats) -> ProcessingStats:
+        """Stream files through every stage and store the results.
+
+        Args:
+            files: Lazily discovered files to ingest
+            stats: Counters to update; ``total_files`` grows as files arrive
+
+        Returns:
+            The updated stats; ``failed_stages`` lists stages that stopped
+            early, in which case files may have been left unprocessed
+        """
+        self._stop.clear()
+        self._stage_failures = []
+        read_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        parse_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        store_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            threading.Thread(target=self._discover, args=(files, read_q),
+                             name="ingest-discover", daemon=True),
+            threading.Thread(target=self._read, args=(read_q, parse_q),
+                             name="ingest-read", daemon=True),
+            threading.Thread(target=self._parse, args=(parse_q, embed_q),
+                             name="ingest-parse", daemon=True),
+            threading.Thread(target=self._embed, args=(embed_q, store_q),
+                             name="ingest-embed", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        try:
+            self._store(store_q, stats)
+        finally:
+            # Unblock upstream stages if the writer stopped early
+            self._stop.set()
+            for stage in stages:
+                stage.join()
+
+        for stage, error in self._stage_failures:
+            stats.record_stage_failure(stage, error)
+        return stats
+
+    def _stage_failed(self, stage: str, error: Exception) -> None:
+        """Record a stage that stopped before the end of its input."""
+        self._log("error", f"{stage.capitalize()} stage failed", error=str(error))
+        self._stage_failures.append((stage, str(error)))
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Put an item on a bounded queue, giving up if the pipeline stops.
+
+        Returns:
+            False if the pipeline was stopped before the item was queued
+        """
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        """Get an item from a queue, returning the end marker on stop."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _discover(self, files: Iterable[FileInfo], out_q: queue.Queue) -> None:
+        """Discovery stage: feed discovered files into the pipeline."""
+        try:
+            for file_info in files:
+                if not self._put(out_q, PipelineItem(file_info=file_info)):
+                    return
+        except Exception as e:
+            self._stage_failed("discover", e)
+        finally:
+            self._put(out_q, _END)
+
+    def _read(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        """Read stage: load file content and drop unchanged files."""
+        while True:
+            item = self._get(in_q)
+            if item is _END:
+                break
+            try:
+                blob_sha = (item.file_info.metadata or {}).get('blob_sha')
+                size = (item.file_info.metadata or {}).get('size')
+                if blob_sha and self.is_unchanged(item.file_path, blob_sha):
+                    # Blob SHAs are content hashes, so unchanged files are
+                    # skipped without reading them at all
+                    item.skip("unchanged")
+                elif self._skipped_by_size(item, size):
+                    # Files too large to process are never read
+                    item.skip(item.tier.reason)
+                else:
+                    content, reason = self.file_processor.read_file(item.file_info)
+                    if content is None:
+                        item.skip(reason)
+                    else:
+                        item.bytes_read = content.size
+                        item.read_ms = content.read_ms
+                        item.content_hash = blob_sha or git_blob_hash(content.data)
+                        if not blob_sha and self.is_unchanged(item.file_path, item.content_hash):
+                            item.skip("unchanged")
+                        elif self.policy is not None:
+                            item.tier = self.policy.classify(item.file_info, content.data)
+                            if item.tier.tier == TIER_SKIP:
+                                item.skip(item.tier.reason)
+                            else:
+                                item.content = content
+                        else:
+                            item.content = content
+            except Exception as e:
+                item.fail(e)
+            if not self._put(out_q, item):
+                return
+        self._put(out_q, _END)
+
+    def _skipped_by_size(self, item: PipelineItem, size: Optional[int]) -> bool:
+        """Check whether the policy skips a file by its listed size."""
+        if self.policy is None or size is None:
+            return False
+        decision = self.policy.classify_size(size)
+        if decision is None or decision.tier != TIER_SKIP:
+            return False
+        item.tier = decision
+        return True
+
+    def _metadata_only(self, item: PipelineItem) -> bool:
+        """Record an item the policy keeps out of the parse stage.
+
+        Returns:
+            True if the item was handled and must not be parsed
+        """
+        if item.tier is None or item.tier.runs_parse:
+            return False
+        item.snippet = self.file_processor.metadata_only_snippet(
+            item.file_info, item.tier.reason, item.bytes_read)
+        item.content = None
+        return True
+
+    def _parse(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        """Parse stage: build snippets inline or in a process pool."""
+        if self.workers > 1:
+            self._parse_in_pool(in_q, out_q)
+            return
+
+        try:
+            while True:
+                item = self._get(in_q)
+                if item is _END:
+                    break
+                try:
+                    if item.status is None and not self._metadata_only(item):
+                        item.snippet = self.file_processor.process_file(item.file_info, item.content)
+                        item.content = None
+                        if item.snippet is None:
+                            item.skip("no_snippet")
+                except Exception as e:
+                    item.fail(e)
+                if not self._put(out_q, item):
+                    return
+        except Exception as e:
+            self._stage_failed("parse", e)
+        finally:
+            # Downstream stages wait for the end marker, so it is always sent
+            self._put(out_q, _END)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Start a worker pool for the parse stage."""
+        # Workers share the parse cache through its database and apply the
+        # same parse limits
+        parser_service = self.file_processor.parser_service
+        parse_cache = parser_service.parse_cache
+        initargs = (
+            str(parse_cache.cache_dir) if parse_cache else None,
+            parse_cache.max_bytes if parse_cache else DEFAULT_PARSE_CACHE_MAX_BYTES,
+            parser_service.parse_timeout_ms,
+            parser_service.max_parse_bytes
+        )
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                   initargs=initargs)
+
+    def _submit(self, executor: ProcessPoolExecutor, item: PipelineItem) -> Tuple[ProcessPoolExecutor, Any]:
+        """Submit an item to the pool, replacing the pool if a worker died.
+
+        A worker killed mid-file (for example by a crash inside a parser)
+        breaks the whole pool: its in-flight futures fail when collected
+        and every later ``submit`` raises. The item is resubmitted once to a
+        fresh pool and fails only if that pool is broken as well.
+
+        Returns:
+            Tuple of (pool in use, future), with the future None if the item failed
+        """
+        for attempt in range(2):
+            try:
+                return executor, executor.submit(process_file_in_worker, item.file_info, item.content)
+            except BrokenProcessPool as e:
+                self._log("error", "Worker pool broken, starting a new one",
+                         file=item.file_path,
+                         error=str(e))
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = self._new_pool()
+                if attempt:
+                    item.fail(e)
+        return executor, None
+
+    def _parse_in_pool(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        """Parse stage backed by worker processes.
+
+        At most ``queue_size`` files are in flight at once, and results are
+        forwarded in submission order. Files in flight when a worker dies
+        are marked failed; the pool is replaced and the stage carries on.
+        """
+        in_flight: deque = deque()
+        executor = None
+        try:
+            executor = self._new_pool()
+            while True:
+                item = self._get(in_q)
+                if item is _END:
+                    break
+                future = None
+                try:
+                    if item.status is None and not self._metadata_only(item):
+                        executor, future = self._submit(executor, item)
+                        item.content = None
+                except Exception as e:
+                    item.fail(e)
+                in_flight.append((item, future))
+
+                while in_flight and (len(in_flight) >= self.queue_size or in_flight[0][1] is None
+                                     or in_flight[0][1].done()):
+                    if not self._put(out_q, self._collect(*in_flight.popleft())):
+                        return
+
+            while in_flight:
+                if not self._put(out_q, self._collect(*in_flight.popleft())):
+                    return
+        except Exception as e:
+            self._stage_failed("parse", e)
+            while in_flight:
+                item, _ = in_flight.popleft()
+                if not self._put(out_q, item.fail(e)):
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            # Downstream stages wait for the end marker, so it is always sent
+            self._put(out_q, _END)
+
+    def _collect(self, item: PipelineItem, future) -> PipelineItem:
+        """Merge a worker result back into its pipeline item."""
+        if future is None:
+            return item
+        try:
+            result = future.result()
+        except Exception as e:
+            return item.fail(e)
+        if result.status == STATUS_ERROR:
+            item.status = STATUS_ERROR
+            item.error = result.error
+        elif result.status == STATUS_SKIPPED:
+            item.skip(result.reason)
+        else:
+            item.snippet = result.snippet
+        return item
+
+    def _embed(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        """Embed stage: compute embeddings for parsed snippets in batches."""
+        finished = False
+        while not finished:
+            item = self._get(in_q)
+            if item is _END:
+                break
+            batch = [item]
+            # Drain whatever is already waiting, up to the batch size
+            while len(batch) < self.embed_batch_size:
+                try:
+                    next_item = in_q.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item is _END:
+                    finished = True
+                    break
+                batch.append(next_item)
+
+            # Files stored with metadata only have no code to embed, and
+            # the policy may keep others out of this stage
+            pending = [i for i in batch if i.status is None and i.snippet is not None
+                       and not metadata_only_reason(i.snippet)
+                       and (i.tier is None or i.tier.runs_embedding)]
+            if pending:
+                try:
+                    embeddings = self.embedding_service.get_embeddings(
+                        [i.snippet.code_text for i in pending])
+                    for pending_item, embedding in zip(pending, embeddings):
+                        pending_item.embedding = embedding
+                except Exception as e:
+                    self._log("error", "Embedding batch failed",
+                             batch_size=len(pending),
+                             error=str(e))
+
+            for batch_item in batch:
+                if not self._put(out_q, batch_item):
+                    return
+        self._put(out_q, _END)
+
+    def _store(self, in_q: queue.Queue, stats: ProcessingStats) -> None:
+        """Store stage: persist results and update counters."""
+        while True:
+            item = self._get(in_q)
+            if item is _END:
+                break
+            stats.total_files += 1
+            if item.status == STATUS_ERROR:
+                stats.increment_errors(f"{item.file_path}: {item.error}")
+            elif item.status == STATUS_SKIPPED:
+                stats.increment_skipped()
+            else:
+                try:
+                    self.store(item)
+                    item.status = STATUS_PROCESSED
+                    stats.increment_processed()
+                    reason = metadata_only_reason(item.snippet)
+                    if reason:
+                        stats.record_metadata_only(item.file_path, reason)
+                    if item.snippet.language:
+                        stats.add_language(item.snippet.language)
+                except Exception as e:
+                    item.fail(e)
+                    stats.increment_errors(f"{item.file_path}: {e}")
+                    self._log("error", "Error processing file",
+                             file=item.file_path,
+                             error=str(e))
+            if item.tier is not None:
+                stats.record_tier(item.tier.tier, item.tier.reason)
+            stats.record_file(item.file_path, item.status,
+                              bytes_read=item.bytes_read,
+                              read_ms=item.read_ms)
@@ -0,0 +1,285 @@
+"""Persistent content-addressed cache of parse summaries.
+
+Identical files - vendored libraries, copied configuration, forks of the
+same project - are otherwise parsed again in every repository and every
+run. Parse summaries (extracted elements, error locations and the compact
+AST) only depend on the file content, the language and the grammar that
+parsed it, so they are stored in an SQLite database keyed by exactly
+those three. The grammar version is a fingerprint of the grammar and the
+extraction patterns, so upgrading either never serves stale results.
+
+SQLite handles concurrent access from ingestion worker processes. Entries
+record when they were last used, and the least recently used ones are
+evicted once the cache grows past its size limit.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from GithubAnalyzer.models.core.ast import ParseSummary
+from GithubAnalyzer.models.core.errors import CacheError
+from GithubAnalyzer.services.core.base_service import BaseService
+from GithubAnalyzer.utils.hashing import content_hash
+from GithubAnalyzer.utils.logging import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+DEFAULT_PARSE_CACHE_DIR = Path.home() / ".cache" / "github_analyzer" / "parses"
+DEFAULT_PARSE_CACHE_MAX_BYTES = 512 * 1024 ** 2
+
+# Bumped whenever the layout of stored summaries changes
+PARSE_CACHE_FORMAT = 1
+
+# Eviction trims the cache to this fraction of its limit, so it does not
+# run again on the very next insert
+EVICTION_TARGET = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parses (
+    content_hash TEXT NOT NULL,
+    language TEXT NOT NULL,
+    grammar_version TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    ast BLOB,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, language, grammar_version)
+);
+CREATE INDEX IF NOT EXISTS parses_last_used ON parses (last_used);
+"""
+
+
+def default_parse_cache_dir() -> Path:
+    """Get the parse cache directory, honouring ``GITHUB_ANALYZER_PARSE_CACHE_DIR``."""
+    return Path(os.getenv("GITHUB_ANALYZER_PARSE_CACHE_DIR", str(DEFAULT_PARSE_CACHE_DIR)))
+
+
+@dataclass
+class ParseCache(BaseService):
+    """Parse summaries on disk, keyed by content hash, language and grammar version.
+
+    Lookups and stores never raise: a broken or locked cache is logged and
+    treated as a miss, so parsing proceeds without it.
+
+    Attributes:
+        cache_dir: Directory holding the cache database
+        max_bytes: Size above which least recently used entries are evicted
+    """
+    cache_dir: Path = field(default_factory=default_parse_cache_dir)
+    max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    stores: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    _size: Optional[int] = field(default=None, init=False)
+    _connections: threading.local = field(default_factory=threading.local, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        """Create the cache database.
+
+        Raises:
+            CacheError: If the database cannot be created
+        """
+        super().__post_init__()
+        self.cache_dir = Path(self.cache_dir).expanduser()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._connect().executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            raise CacheError(f"Cannot open parse cache in {self.cache_dir}: {e}")
+
+    def _get_context(self, **kwargs) -> Dict[str, Any]:
+        """Get standard context for logging.
+
+        Args:
+            **kwargs: Additional context key-value pairs
+
+        Returns:
+            Dict with standard context fields plus any additional fields
+        """
+        context = {
+            'module': 'parse_cache',
+            'thread': threading.get_ident(),
+            'duration_ms': (time.time() - self._start_time) * 1000
+        }
+        context.update(kwargs)
+        return context
+
+    def _log(self, level: str, message: str, **kwargs) -> None:
+        """Log with consistent context.
+
+        Args:
+            level: Log level (debug, info, warning, error, critical)
+            message: Message to log
+            **kwargs: Additional context key-value pairs
+        """
+        context = self._get_context(**kwargs)
+        getattr(self._logger, level)(message, extra={'context': context})
+
+    @property
+    def db_path(self) -> Path:
+        """Path of the cache database."""
+        return self.cache_dir / "parses.sqlite3"
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection to the cache database."""
+        connection = getattr(self._connections, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.connection = connection
+        return connection
+
+    @staticmethod
+    def content_key(source: Union[str, bytes]) -> str:
+        """Get the content part of a cache key."""
+        return content_hash(source)
+
+    def get(self, source_hash: str, language: str, grammar_version: str) -> Optional[ParseSummary]:
+        """Look up a parse summary.
+
+        Args:
+            source_hash: ``content_key`` of the parsed bytes
+            language: Language identifier
+            grammar_version: Fingerprint of the grammar and extraction patterns
+
+        Returns:
+            The cached summary, or None on a miss
+        """
+        key = (source_hash, language, f"{PARSE_CACHE_FORMAT}:{grammar_version}")
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT summary, ast FROM parses "
+                "WHERE content_hash = ? AND language = ? AND grammar_version = ?", key).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE parses SET last_used = ? "
+                    "WHERE content_hash = ? AND language = ? AND grammar_version = ?",
+                    (time.time(), *key))
+        except sqlite3.Error as e:
+            self._log("warning", "Parse cache lookup failed", language=language, error=str(e))
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        summary = ParseSummary(**json.loads(row[0]))
+        summary.ast = row[1]
+        summary.from_cache = True
+        return summary
+
+    def put(self, source_hash: str, language: str, grammar_version: str,
+            summary: ParseSummary) -> None:
+        """Store a parse summary, evicting old entries if the cache is full.
+
+        Args:
+            source_hash: ``content_key`` of the parsed bytes
+            language: Language identifier
+            grammar_version: Fingerprint of the grammar and extraction patterns
+            summary: Summary to store
+        """
+        record = asdict(summary)
+        ast = record.pop('ast')
+        record.pop('from_cache')
+        encoded = json.dumps(record)
+        size = len(encoded) + len(ast or b'')
+        key = (source_hash, language, f"{PARSE_CACHE_FORMAT}:{grammar_version}")
+        try:
+            connection = self._connect()
+            # Read the size of the entry being replaced in the same
+            # transaction, so the running total only grows by the difference
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT size FROM parses "
+                    "WHERE content_hash = ? AND language = ? AND grammar_version = ?",
+                    key).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO parses "
+                    "(content_hash, language, grammar_version, summary, ast, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, encoded, ast, size, time.time()))
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            replaced = row[0] if row is not None else 0
+            with self._lock:
+                self.stores += 1
+                if self._size is None:
+                    self._size = self._total_size(connection)
+                else:
+                    self._size += size - replaced
+                over_limit = self._size > self.max_bytes
+            if over_limit:
+                self._evict(connection)
+        except sqlite3.Error as e:
+            self._log("warning", "Parse cache store failed", language=language, error=str(e))
+
+    @staticmethod
+    def _total_size(connection: sqlite3.Connection) -> int:
+        """Get the stored size of all entries."""
+        return connection.execute("SELECT COALESCE(SUM(size), 0) FROM parses").fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete least recently used entries until the cache is below its target size."""
+        # Other processes share the database, so start from the real size
+        total = self._total_size(connection)
+        target = int(self.max_bytes * EVICTION_TARGET)
+        evicted = 0
+        if total > self.max_bytes:
+            rows = connection.execute(
+                "SELECT rowid, size FROM parses ORDER BY last_used").fetchall()
+            doomed = []
+            for rowid, size in rows:
+                if total <= target:
+                    break
+                doomed.append((rowid,))
+                total -= size
+            connection.executemany("DELETE FROM parses WHERE rowid = ?", doomed)
+            evicted = len(doomed)
+        with self._lock:
+            self._size = total
+            self.evictions += evicted
+        if evicted:
+            self._log("info", "Evicted parse cache entries", evicted=evicted, size=total)
+
+    def clear(self) -> None:
+        """Delete all entries and reset the counters."""
+        try:
+            self._connect().execute("DELETE FROM parses")
+        except sqlite3.Error as e:
+            raise CacheError(f"Cannot clear parse cache: {e}")
+        with self._lock:
+            self._size = 0
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters.
+
+        Returns:
+            Dict with hits, misses, stores, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
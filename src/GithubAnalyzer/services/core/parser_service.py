@@ -1,6 +1,7 @@
 """Parser service for code analysis using tree-sitter."""
-import logging
+import hashlib
 import os
+import sys
 import threading
 import time
 from dataclasses import dataclass
@@ -9,30 +10,56 @@ from typing import Any, Callable, Dict, Optional, Set, Union
 
 from tree_sitter import Language, Parser, Tree
 
-from GithubAnalyzer.models.core.ast import ParseResult
-from GithubAnalyzer.models.core.errors import LanguageError, ParserError
-from GithubAnalyzer.models.core.file import FileInfo
+from GithubAnalyzer.models.core.ast import ParseResult, ParseSummary
+from GithubAnalyzer.models.core.errors import (LanguageError,
+                                               ParseCancelledError,
+                                               ParserError, ParseSizeError,
+                                               ParseTimeoutError)
+from GithubAnalyzer.models.core.file import FileContent, FileInfo
 from GithubAnalyzer.models.core.traversal import TreeSitterTraversal
 from GithubAnalyzer.services.analysis.parsers.language_service import \
     LanguageService
+from GithubAnalyzer.services.core.parse_cache import ParseCache
 from GithubAnalyzer.services.parsers.core.query_handler import \
     TreeSitterQueryHandler
 from GithubAnalyzer.services.analysis.parsers.utils import (
     find_common_ancestor, get_node_hierarchy, get_node_text, iter_children,
     node_to_dict)
-from GithubAnalyzer.utils.logging import get_logger, get_tree_sitter_logger
+from GithubAnalyzer.utils.logging import get_logger
 from GithubAnalyzer.utils.timing import timer
 
 # Initialize logger
 logger = get_logger("core.parser")
-ts_logger = get_tree_sitter_logger()
 
 # Special file types that don't need parsing
 LICENSE_FILES = {'license', 'license.txt', 'license.md', 'copying', 'copying.txt', 'copying.md'}
 
+# Receives the number of bytes parsed so far and returns True to cancel
+ProgressCallback = Callable[[int], bool]
+
+# Bytes handed to tree-sitter per read when a parse can be cancelled; limits
+# are checked before every chunk. Kept small because a parser with debug
+# logging enabled calls back into Python for every lexed character
+PARSE_CHUNK_BYTES = 2 * 1024
+
+# Tree-sitter's progress callback crashes the interpreter before Python 3.14
+PROGRESS_CALLBACK_USABLE = sys.version_info >= (3, 14)
+
 @dataclass
 class ParserService:
-    """Service for parsing files using tree-sitter."""
+    """Service for parsing files using tree-sitter.
+    
+    Attributes:
+        parse_cache: Cache consulted by ``summarize_content``; summaries
+            are computed every time when None
+        parse_timeout_ms: Abandon a parse that runs longer than this;
+            no limit when None
+        max_parse_bytes: Refuse to parse content larger than this; no
+            limit when None
+    """
+    parse_cache: Optional[ParseCache] = None
+    parse_timeout_ms: Optional[float] = None
+    max_parse_bytes: Optional[int] = None
     
     def __post_init__(self):
         """Initialize the parser service."""
@@ -40,6 +67,10 @@ class ParserService:
         self._start_time = time.time()
         self._language_service = LanguageService()
         self._query_handler = TreeSitterQueryHandler()
+        self._grammar_versions: Dict[str, str] = {}
+        # Whether Parser.parse takes a progress callback (tree-sitter 0.25+);
+        # unknown until the first parse that needs one where it is usable
+        self._supports_progress: Optional[bool] = None
         
         self._log("debug", "Parser service initialized",
                  supported_languages=list(self._language_service.supported_languages))
@@ -103,56 +134,58 @@ class ParserService:
                      language=language)
             return ParseResult(None, None, file_info)
         
-        # Try to read file content
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
+        # Read the file once and parse its bytes directly
+        content = FileContent.load(file_path)
+        if content.text is None:
             self._log("warning", "File appears to be binary",
                      file=str(file_path))
             file_info.is_supported = False
             return ParseResult(None, None, file_info)
             
-        return self.parse_content(content, language)
+        return self.parse_content(content.source_bytes, language)
         
     @timer
-    def parse_content(self, content: str, language: str) -> ParseResult:
+    def parse_content(self, content: Union[str, bytes], language: str,
+                      progress_callback: Optional[ProgressCallback] = None) -> ParseResult:
         """Parse content using tree-sitter.
         
         Args:
-            content: Content to parse
+            content: Content to parse, as text or UTF-8 bytes. Bytes are
+                handed to tree-sitter without another encoding pass.
             language: Language identifier
+            progress_callback: Called periodically with the number of bytes
+                parsed so far; returning True cancels the parse
             
         Returns:
             ParseResult containing the tree and metadata
             
         Raises:
             LanguageError: If language is not supported
+            ParseSizeError: If the content is larger than ``max_parse_bytes``
+            ParseTimeoutError: If parsing takes longer than ``parse_timeout_ms``
+            ParseCancelledError: If ``progress_callback`` cancelled the parse
             ParserError: If parsing fails
         """
         try:
-            parser = self._language_service.get_parser(language)
+            source = content if isinstance(content, bytes) else content.encode('utf-8')
+            if self.max_parse_bytes is not None and len(source) > self.max_parse_bytes:
+                raise ParseSizeError(
+                    f"Content of {len(source)} bytes exceeds the parse limit of "
+                    f"{self.max_parse_bytes} bytes")
             
-            # Set up logging callback
-            def logger_callback(log_type: int, msg: str) -> None:
-                level = logging.ERROR if log_type == 1 else logging.DEBUG
-                ts_logger.log(level, msg, extra={
-                    'context': {
-                        'source': 'tree-sitter',
-                        'type': 'parser',
-                        'log_type': 'error' if log_type == 1 else 'parse'
-                    }
-                })
-            
-            # Set the logger on the parser
-            parser.logger = logger_callback
-            
-            tree = parser.parse(bytes(content, "utf8"))
+            # Pooled per thread, with its log callback already installed
+            parser = self._language_service.get_parser(language)
+            tree = self._parse_source(parser, source, progress_callback)
             if tree is None:
                 raise ParserError(f"Failed to parse content for language {language}")
             
-            # Get any missing or error nodes
-            missing_nodes = self._query_handler.find_missing_nodes(tree.root_node)
+            # Functions, classes, imports and missing nodes are collected in a
+            # single query pass. Tree-sitter still provides a partial AST
+            # when there are errors
+            extraction = self._query_handler.extract(tree, language)
+            missing_nodes = extraction.missing_nodes
+            # Every node flagged has_error, not only the ERROR nodes the query
+            # captures; the walk skips error-free subtrees
             error_nodes = self._query_handler.find_error_nodes(tree.root_node)
             
             # Check for syntax errors but don't fail the parse
@@ -163,11 +196,9 @@ class ParserService:
                          language=language,
                          error_count=len(error_nodes))
                 
-            # Extract functions and other structures
-            # Tree-sitter will still provide partial AST even with errors
-            functions = self._query_handler.find_functions(tree.root_node, language)
-            classes = self._query_handler.find_nodes(tree, "class", language)
-            imports = self._query_handler.find_nodes(tree, "import", language)
+            functions = extraction.functions
+            classes = extraction.classes
+            imports = extraction.imports
             
             self._log("debug", "Content parsed successfully",
                      language=language,
@@ -195,12 +226,163 @@ class ParserService:
                      language=language,
                      error=str(e))
             raise
+        except (ParseCancelledError, ParseSizeError) as e:
+            self._log("warning", "Content not parsed",
+                     language=language,
+                     reason=str(e))
+            raise
         except Exception as e:
             self._log("error", "Failed to parse content",
                      language=language,
                      error=str(e))
             raise ParserError(f"Failed to parse content: {str(e)}")
             
+    def _parse_source(self, parser: Parser, source: bytes,
+                      progress_callback: Optional[ProgressCallback]) -> Optional[Tree]:
+        """Parse bytes, enforcing the timeout and honoring cancellation.
+        
+        When a limit applies, the source is handed to tree-sitter in chunks
+        through a read callable, which checks the deadline and the callback
+        before each chunk; once the parse is cancelled no more input is
+        returned. Tree-sitter ignores progress callbacks for a bytestring,
+        and its own progress callback cannot be used on Python before 3.14
+        (the bindings build its arguments with a format code those versions
+        reject), so the read callable is what enforces the limits. The
+        progress callback and, on bindings that still have it,
+        ``timeout_micros`` additionally interrupt slow work inside a chunk.
+        
+        Args:
+            parser: Pooled parser of the content's language
+            source: Content to parse
+            progress_callback: Callback that may cancel the parse
+            
+        Returns:
+            Parsed tree, or None if tree-sitter produced none
+            
+        Raises:
+            ParseTimeoutError: If parsing takes longer than ``parse_timeout_ms``
+            ParseCancelledError: If ``progress_callback`` cancelled the parse
+        """
+        if self.parse_timeout_ms is None and progress_callback is None:
+            return parser.parse(source)
+            
+        deadline = None
+        if self.parse_timeout_ms is not None:
+            deadline = time.monotonic() + self.parse_timeout_ms / 1000
+        cancelled = []
+        
+        def on_progress(byte_offset: int, *_: Any) -> bool:
+            if cancelled:
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                cancelled.append(ParseTimeoutError(
+                    f"Parse timed out after {self.parse_timeout_ms:g} ms at byte {byte_offset}"))
+            elif progress_callback is not None and progress_callback(byte_offset):
+                cancelled.append(ParseCancelledError(f"Parse cancelled at byte {byte_offset}"))
+            return bool(cancelled)
+            
+        def read(byte_offset: int, _point: Any) -> bytes:
+            if on_progress(byte_offset):
+                return b""
+            return source[byte_offset:byte_offset + PARSE_CHUNK_BYTES]
+            
+        use_timeout = deadline is not None and hasattr(parser, 'timeout_micros')
+        if use_timeout:
+            parser.timeout_micros = int(self.parse_timeout_ms * 1000)
+        try:
+            tree = None
+            if self._supports_progress is not False and PROGRESS_CALLBACK_USABLE:
+                try:
+                    tree = parser.parse(read, progress_callback=on_progress)
+                    self._supports_progress = True
+                except TypeError:
+                    self._supports_progress = False
+            if not (self._supports_progress and PROGRESS_CALLBACK_USABLE):
+                tree = parser.parse(read)
+        except ValueError:
+            # Bindings raise instead of returning None when a parse is halted
+            tree = None
+        finally:
+            if use_timeout:
+                # The parser is pooled, so the limit must not leak into other parses
+                parser.timeout_micros = 0
+        if tree is None and not cancelled and deadline is not None and time.monotonic() > deadline:
+            cancelled.append(ParseTimeoutError(
+                f"Parse timed out after {self.parse_timeout_ms:g} ms"))
+                
+        if cancelled:
+            # A halted parse resumes where it stopped unless the parser is reset
+            parser.reset()
+            raise cancelled[0]
+        return tree
+        
+    def summarize_content(self, content: Union[str, bytes], language: str,
+                          progress_callback: Optional[ProgressCallback] = None) -> ParseSummary:
+        """Parse content and summarize the result, using the parse cache.
+        
+        Content already parsed with the same grammar, in any repository,
+        is served from the cache without running tree-sitter.
+        
+        Args:
+            content: Content to parse, as text or UTF-8 bytes
+            language: Language identifier
+            progress_callback: Passed to ``parse_content`` on a cache miss
+            
+        Returns:
+            ParseSummary of the content
+            
+        Raises:
+            LanguageError: If language is not supported
+            ParserError: If parsing fails, including the timeout, size and
+                cancellation errors of ``parse_content``
+        """
+        source = content if isinstance(content, bytes) else content.encode('utf-8')
+        if self.parse_cache is None:
+            return ParseSummary.from_parse_result(self.parse_content(source, language, progress_callback))
+            
+        source_hash = self.parse_cache.content_key(source)
+        grammar_version = self.get_grammar_version(language)
+        summary = self.parse_cache.get(source_hash, language, grammar_version)
+        if summary is not None:
+            self._log("debug", "Parse served from cache",
+                     language=language,
+                     content_hash=source_hash)
+            return summary
+            
+        summary = ParseSummary.from_parse_result(self.parse_content(source, language, progress_callback))
+        self.parse_cache.put(source_hash, language, grammar_version, summary)
+        return summary
+        
+    def get_grammar_version(self, language: str) -> str:
+        """Get a fingerprint of what a parse summary depends on besides content.
+        
+        Covers the grammar's ABI version and size, which change with every
+        grammar release, and the extraction patterns run on each tree.
+        
+        Args:
+            language: Language identifier
+            
+        Returns:
+            Hex digest identifying the grammar and patterns
+            
+        Raises:
+            LanguageError: If language is not supported
+        """
+        version = self._grammar_versions.get(language)
+        if version is None:
+            lang = self._language_service.get_tree_sitter_language(language)
+            extraction = self._query_handler.get_extraction_query(language)
+            parts = (
+                str(getattr(lang, 'abi_version', getattr(lang, 'version', ''))),
+                str(lang.node_kind_count),
+                str(lang.field_count),
+                str(lang.parse_state_count),
+                extraction.source if extraction else ''
+            )
+            version = hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+            self._grammar_versions[language] = version
+        return version
+        
     def get_supported_languages(self) -> Set[str]:
         """Get set of supported languages."""
         return self._language_service.supported_languages
@@ -0,0 +1,428 @@
+"""Persistent on-disk cache of cloned repositories.
+
+Each repository URL gets a ``git clone --mirror`` that is kept between runs
+and refreshed with ``git fetch``, plus a working checkout cloned locally
+from the mirror. Because checkouts live at a stable path, content hashes
+and the last analyzed commit stored for a repository stay valid across
+runs. Entries are guarded by per-URL file locks so concurrent workers can
+share the cache, and the least recently used entries are evicted once the
+cache grows past its size limit. Each entry's disk usage is measured when
+it is refreshed and recorded next to its lock, so checking the limit never
+walks the whole cache.
+
+Shallow and partial copies are cached as separate entries, keyed by their
+options as well as the URL. A local clone of a partial mirror cannot
+fetch the blobs the mirror left out, so shallow or partial working
+checkouts are cloned straight from the remote instead of from a mirror.
+"""
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Set, Tuple, Union
+
+import git
+
+from GithubAnalyzer.models.core.errors import CacheError
+from GithubAnalyzer.services.core.base_service import BaseService
+from GithubAnalyzer.utils.logging import get_logger
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Initialize logger
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "github_analyzer" / "repos"
+DEFAULT_MAX_CACHE_BYTES = 5 * 1024 ** 3
+
+
+def default_cache_dir() -> Path:
+    """Get the cache directory, honouring ``GITHUB_ANALYZER_CACHE_DIR``."""
+    return Path(os.getenv("GITHUB_ANALYZER_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+
+
+@dataclass
+class RepositoryCache(BaseService):
+    """Mirror cache of remote repositories, keyed by URL.
+
+    Attributes:
+        cache_dir: Root directory of the cache
+        max_bytes: Size above which least recently used entries are evicted
+        lock_timeout: Seconds to wait for another process holding an entry
+    """
+    cache_dir: Path = field(default_factory=default_cache_dir)
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES
+    lock_timeout: float = 600.0
+    _held_locks: Dict[Path, IO] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        """Initialize the cache directories."""
+        super().__post_init__()
+        self.cache_dir = Path(self.cache_dir).expanduser()
+        for sub in ("mirrors", "checkouts", "locks", "sizes"):
+            (self.cache_dir / sub).mkdir(parents=True, exist_ok=True)
+        if not HAS_FCNTL:
+            self._log("warning", "File locking unavailable; cache is not safe for concurrent use")
+
+    def _get_context(self, **kwargs) -> Dict[str, Any]:
+        """Get standard context for logging.
+
+        Args:
+            **kwargs: Additional context key-value pairs
+
+        Returns:
+            Dict with standard context fields plus any additional fields
+        """
+        context = {
+            'module': 'repo_cache',
+            'thread': threading.get_ident(),
+            'duration_ms': (time.time() - self._start_time) * 1000
+        }
+        context.update(kwargs)
+        return context
+
+    def _log(self, level: str, message: str, **kwargs) -> None:
+        """Log with consistent context.
+
+        Args:
+            level: Log level (debug, info, warning, error, critical)
+            message: Message to log
+            **kwargs: Additional context key-value pairs
+        """
+        context = self._get_context(**kwargs)
+        getattr(self._logger, level)(message, extra={'context': context})
+
+    @staticmethod
+    def cache_key(repo_url: str, depth: Optional[int] = None,
+                  blob_limit: Optional[int] = None) -> str:
+        """Get the cache key for a repository URL.
+
+        The key combines a readable repository name with a hash of the full
+        URL, so different hosts or owners never collide. Shallow and
+        partial copies get their own keys.
+
+        Args:
+            repo_url: Repository URL
+            depth: Commits of history kept, if shallow
+            blob_limit: Size of the largest blob kept, if partial
+
+        Returns:
+            Filesystem-safe key
+        """
+        name = repo_url.rstrip('/').rsplit('/', 1)[-1]
+        if name.endswith('.git'):
+            name = name[:-4]
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', name)[:64] or 'repo'
+        digest = hashlib.sha256(repo_url.encode('utf-8')).hexdigest()[:16]
+        key = f"{name}-{digest}"
+        if depth:
+            key += f"-depth{depth}"
+        if blob_limit is not None:
+            key += f"-blobs{blob_limit}"
+        return key
+
+    def mirror_path(self, repo_url: str, depth: Optional[int] = None,
+                    blob_limit: Optional[int] = None) -> Path:
+        """Path of the bare mirror for a repository URL."""
+        return self.cache_dir / "mirrors" / f"{self.cache_key(repo_url, depth, blob_limit)}.git"
+
+    def checkout_path(self, repo_url: str, depth: Optional[int] = None,
+                      blob_limit: Optional[int] = None) -> Path:
+        """Path of the working checkout for a repository URL."""
+        return self.cache_dir / "checkouts" / self.cache_key(repo_url, depth, blob_limit)
+
+    def _lock_path(self, key: str) -> Path:
+        return self.cache_dir / "locks" / f"{key}.lock"
+
+    def _size_path(self, key: str) -> Path:
+        return self.cache_dir / "sizes" / key
+
+    def _measure(self, key: str) -> int:
+        """Measure an entry's disk usage and record it.
+
+        The mirror and checkout are measured together, so objects the
+        checkout hard-links from the mirror are counted once.
+        """
+        seen: Set[Tuple[int, int]] = set()
+        size = (_tree_size(self.cache_dir / "mirrors" / f"{key}.git", seen)
+                + _tree_size(self.cache_dir / "checkouts" / key, seen))
+        self._size_path(key).write_text(str(size))
+        return size
+
+    def _recorded_size(self, key: str) -> int:
+        """Get an entry's recorded disk usage, measuring it if unrecorded."""
+        try:
+            return int(self._size_path(key).read_text())
+        except (OSError, ValueError):
+            return self._measure(key)
+
+    def acquire(self, repo_url: str, bare: bool = False,
+                sparse_patterns: Optional[List[str]] = None,
+                depth: Optional[int] = None,
+                blob_limit: Optional[int] = None) -> Path:
+        """Get an up-to-date copy of a repository from the cache.
+
+        The mirror is cloned on first use and fetched afterwards. The entry
+        stays locked until ``release`` is called with the returned path:
+        exclusively for working checkouts, which are reset on every
+        acquire, and shared for bare mirrors, which are only read.
+
+        Args:
+            repo_url: Remote repository URL
+            bare: Return the bare mirror instead of a working checkout
+            sparse_patterns: Non-cone sparse-checkout patterns restricting
+                the files materialized in the checkout
+            depth: Keep only this many commits of history
+            blob_limit: Leave blobs larger than this many bytes on the
+                server; git fetches them on demand if they are read
+
+        Returns:
+            Path to the mirror or checkout
+
+        Raises:
+            CacheError: If the entry is locked for too long or the
+                repository cannot be cloned
+        """
+        key = self.cache_key(repo_url, depth, blob_limit)
+        checkout = self.checkout_path(repo_url, depth, blob_limit)
+        lock_file = self._lock(key, exclusive=True)
+        try:
+            if bare:
+                path = self._refresh_mirror(repo_url, self.mirror_path(repo_url, depth, blob_limit),
+                                            depth, blob_limit)
+                # Readers of the mirror can share the entry
+                if HAS_FCNTL:
+                    fcntl.flock(lock_file, fcntl.LOCK_SH)
+            elif depth or blob_limit is not None:
+                path = self._refresh_remote_checkout(repo_url, checkout, depth, blob_limit,
+                                                     sparse_patterns)
+            else:
+                mirror = self._refresh_mirror(repo_url, self.mirror_path(repo_url))
+                path = self._refresh_checkout(mirror, checkout, sparse_patterns)
+            # The lock file's mtime doubles as the entry's last-used time
+            os.utime(self._lock_path(key))
+            self._measure(key)
+        except Exception:
+            lock_file.close()
+            raise
+
+        self._held_locks[path] = lock_file
+        self.evict(keep=key)
+        return path
+
+    def release(self, path: Union[str, Path]) -> bool:
+        """Release the lock on a path returned by ``acquire``.
+
+        Args:
+            path: Mirror or checkout path
+
+        Returns:
+            True if the path belonged to the cache
+        """
+        lock_file = self._held_locks.pop(Path(path), None)
+        if lock_file is None:
+            return False
+        lock_file.close()
+        return True
+
+    def _lock(self, key: str, exclusive: bool, blocking: bool = True) -> Optional[IO]:
+        """Open and lock an entry's lock file.
+
+        Returns:
+            The open lock file, or None if ``blocking`` is False and the
+            entry is locked by someone else
+
+        Raises:
+            CacheError: If the lock is not acquired within ``lock_timeout``
+        """
+        lock_file = open(self._lock_path(key), 'a')
+        if not HAS_FCNTL:
+            return lock_file
+        mode = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        deadline = time.time() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, mode)
+                return lock_file
+            except BlockingIOError:
+                if not blocking or time.time() >= deadline:
+                    lock_file.close()
+                    if not blocking:
+                        return None
+                    raise CacheError(f"Timed out waiting for cache entry {key}")
+                time.sleep(0.1)
+
+    def _refresh_mirror(self, repo_url: str, mirror: Path, depth: Optional[int] = None,
+                        blob_limit: Optional[int] = None) -> Path:
+        """Clone the mirror on first use, otherwise fetch new commits.
+
+        Partial clones record their blob filter, so later fetches apply
+        it without being told.
+        """
+        if mirror.exists():
+            try:
+                git.Git(str(mirror)).fetch('--prune', *_depth_args(depth), 'origin')
+                self._log("debug", "Fetched cached mirror", repo_url=repo_url)
+            except git.GitCommandError as e:
+                # A stale copy is still better than no copy when offline
+                self._log("warning", "Failed to fetch mirror, using cached copy",
+                         repo_url=repo_url, error=str(e))
+            return mirror
+
+        partial = mirror.with_name(f"{mirror.name}.partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        try:
+            git.Repo.clone_from(repo_url, str(partial), mirror=True,
+                                **_clone_options(depth, blob_limit))
+        except git.GitCommandError as e:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise CacheError(f"Failed to clone {repo_url}: {e}")
+        os.replace(partial, mirror)
+        self._log("info", "Cloned repository into mirror cache", repo_url=repo_url)
+        return mirror
+
+    def _refresh_checkout(self, mirror: Path, checkout: Path,
+                          sparse_patterns: Optional[List[str]] = None) -> Path:
+        """Bring the working checkout in line with the mirror's HEAD."""
+        repo = git.Git(str(checkout))
+        if not (checkout / '.git').exists():
+            shutil.rmtree(checkout, ignore_errors=True)
+            # Local clones hard-link objects instead of copying them
+            git.Repo.clone_from(str(mirror), str(checkout), no_checkout=True)
+        else:
+            repo.fetch('--prune', 'origin')
+            # Follow default branch changes on the remote
+            repo.remote('set-head', 'origin', '--auto')
+        return self._update_work_tree(checkout, sparse_patterns)
+
+    def _refresh_remote_checkout(self, repo_url: str, checkout: Path, depth: Optional[int],
+                                 blob_limit: Optional[int],
+                                 sparse_patterns: Optional[List[str]] = None) -> Path:
+        """Bring a shallow or partial checkout, cloned from the remote, up to date."""
+        repo = git.Git(str(checkout))
+        if not (checkout / '.git').exists():
+            shutil.rmtree(checkout, ignore_errors=True)
+            try:
+                git.Repo.clone_from(repo_url, str(checkout), no_checkout=True,
+                                    **_clone_options(depth, blob_limit))
+            except git.GitCommandError as e:
+                shutil.rmtree(checkout, ignore_errors=True)
+                raise CacheError(f"Failed to clone {repo_url}: {e}")
+            self._log("info", "Cloned repository into checkout cache",
+                     repo_url=repo_url, depth=depth, blob_limit=blob_limit)
+        else:
+            try:
+                repo.fetch('--prune', *_depth_args(depth), 'origin')
+                repo.remote('set-head', 'origin', '--auto')
+            except git.GitCommandError as e:
+                self._log("warning", "Failed to fetch checkout, using cached copy",
+                         repo_url=repo_url, error=str(e))
+        return self._update_work_tree(checkout, sparse_patterns)
+
+    def _update_work_tree(self, checkout: Path,
+                          sparse_patterns: Optional[List[str]] = None) -> Path:
+        """Reset a checkout's work tree to ``origin/HEAD``."""
+        repo = git.Git(str(checkout))
+        # The checkout is shared between runs, so the sparse pattern is
+        # reapplied every time
+        if sparse_patterns:
+            repo.sparse_checkout('set', '--no-cone', *sparse_patterns)
+        elif (checkout / '.git' / 'info' / 'sparse-checkout').exists():
+            repo.sparse_checkout('disable')
+        repo.reset('--hard', 'origin/HEAD')
+        repo.clean('-ffdx')
+        return checkout
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Entries locked by another process are never evicted.
+
+        Args:
+            keep: Key of an entry that must not be evicted
+
+        Returns:
+            Keys of the evicted entries
+        """
+        entries = []
+        total = 0
+        for lock_path in (self.cache_dir / "locks").glob("*.lock"):
+            key = lock_path.stem
+            size = self._recorded_size(key)
+            if size == 0:
+                continue
+            total += size
+            if key != keep:
+                entries.append((lock_path.stat().st_mtime, key, size))
+
+        evicted = []
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            lock_file = self._lock(key, exclusive=True, blocking=False)
+            if lock_file is None:
+                continue
+            try:
+                shutil.rmtree(self.cache_dir / "mirrors" / f"{key}.git", ignore_errors=True)
+                shutil.rmtree(self.cache_dir / "checkouts" / key, ignore_errors=True)
+                self._size_path(key).unlink(missing_ok=True)
+            finally:
+                lock_file.close()
+            total -= size
+            evicted.append(key)
+
+        if evicted:
+            self._log("info", "Evicted repositories from cache",
+                     evicted=evicted, cache_bytes=total)
+        return evicted
+
+
+def _depth_args(depth: Optional[int]) -> List[str]:
+    """Fetch arguments keeping a shallow copy at its depth."""
+    return ['--depth', str(depth)] if depth else []
+
+
+def _clone_options(depth: Optional[int], blob_limit: Optional[int]) -> Dict[str, Any]:
+    """Clone options for a shallow or partial copy."""
+    options: Dict[str, Any] = {}
+    if depth:
+        options['depth'] = depth
+    if blob_limit is not None:
+        options['filter'] = f'blob:limit={blob_limit}'
+    return options
+
+
+def _tree_size(path: Path, seen: Optional[Set[Tuple[int, int]]] = None) -> int:
+    """Disk usage in bytes of the files below ``path``, as ``du`` counts it.
+
+    Args:
+        path: Directory to measure
+        seen: (device, inode) pairs already counted; hard links to them
+            are skipped, and the set is updated in place
+
+    Returns:
+        Bytes allocated to the files
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            inode = (stat.st_dev, stat.st_ino)
+            if inode in seen:
+                continue
+            seen.add(inode)
+            blocks = getattr(stat, 'st_blocks', None)
+            total += blocks * 512 if blocks is not None else stat.st_size
+    return total
@@ -12,35 +12,54 @@ import git
 from dotenv import load_dotenv
 
 from GithubAnalyzer.models.core.base_model import BaseModel
+from GithubAnalyzer.models.core.compact_ast import CompactAST
 from GithubAnalyzer.models.core.db.database import CodeSnippet, File, Function
 from GithubAnalyzer.models.core.file import (FileFilterConfig, FileInfo,
                                              FilePattern)
-from GithubAnalyzer.models.core.repository import (ProcessingResult,
+from GithubAnalyzer.models.core.repository import (IngestionConfig,
+                                                   ProcessingResult,
                                                    ProcessingStats,
+                                                   RepositoryChanges,
                                                    RepositoryInfo)
 from GithubAnalyzer.services.parsers.core.custom_parsers import \
     get_custom_parser
 from GithubAnalyzer.services.analysis.parsers.language_service import \
     LanguageService
+from GithubAnalyzer.services.analysis.parsers.pattern_warmup import \
+    warm_up_patterns
 from GithubAnalyzer.services.analysis.parsers.query_service import \
     TreeSitterQueryHandler
 from GithubAnalyzer.services.analysis.parsers.utils import (
     find_common_ancestor, get_node_hierarchy, get_node_text, iter_children,
     node_to_dict)
+from GithubAnalyzer.services.core.database.embedding_service import \
+    CodeEmbeddingService
 from GithubAnalyzer.services.core.database.neo4j_service import Neo4jService
 from GithubAnalyzer.services.core.database.postgres_service import \
     PostgresService
+from GithubAnalyzer.services.core.file_policy import FilePolicy
+from GithubAnalyzer.services.core.file_processor import (FileProcessor,
+                                                         metadata_only_reason)
 from GithubAnalyzer.services.core.file_service import FileService
+from GithubAnalyzer.services.core.git_blob_reader import GitBlobReader
+from GithubAnalyzer.services.core.ingestion_pipeline import (
+    IngestionPipeline, PipelineItem)
+from GithubAnalyzer.services.core.parse_cache import ParseCache
 from GithubAnalyzer.services.core.parser_service import ParserService
+from GithubAnalyzer.services.core.repo_cache import RepositoryCache
 from GithubAnalyzer.utils.logging import get_logger
 
 load_dotenv()
 # Initialize logger
 logger = get_logger(__name__)
 
+# Node types that define functions, across the supported grammars
+FUNCTION_NODE_TYPES = ('function_definition', 'function_declaration', 'method_definition')
+
 @dataclass
 class RepoProcessor(BaseModel):
     """Service for processing GitHub repositories."""
+    config: IngestionConfig = field(default_factory=IngestionConfig)
     
     def __post_init__(self):
         """Initialize the repository processor."""
@@ -57,10 +76,36 @@ class RepoProcessor(BaseModel):
         
         self.pg_service = PostgresService()
         self.neo4j_service = Neo4jService()
-        self.file_service = FileService()
-        self.parser_service = ParserService()
+        self.file_service = FileService(
+            _filter_config=FileFilterConfig(include_paths=self.config.include_paths)
+        )
+        if self.config.use_repo_cache:
+            cache_options = {'max_bytes': self.config.cache_max_bytes}
+            if self.config.cache_dir:
+                cache_options['cache_dir'] = Path(self.config.cache_dir)
+            self.file_service.repo_cache = RepositoryCache(**cache_options)
+        parse_cache = None
+        if self.config.use_parse_cache:
+            parse_cache_options = {'max_bytes': self.config.parse_cache_max_bytes}
+            if self.config.parse_cache_dir:
+                parse_cache_options['cache_dir'] = Path(self.config.parse_cache_dir)
+            parse_cache = ParseCache(**parse_cache_options)
+        self.parser_service = ParserService(
+            parse_cache=parse_cache,
+            parse_timeout_ms=self.config.parse_timeout_ms,
+            max_parse_bytes=self.config.max_parse_bytes
+        )
         self.language_service = LanguageService()
         self._query_handler = TreeSitterQueryHandler()
+        self.file_processor = FileProcessor(
+            file_service=self.file_service,
+            parser_service=self.parser_service,
+            language_service=self.language_service
+        )
+        self.embedding_service = CodeEmbeddingService()
+        self.last_stats: Optional[ProcessingStats] = None
+        if self.config.warm_up_patterns:
+            warm_up_patterns(language_service=self.language_service)
         
         self._logger.info("Repository processor initialized", extra={
             'context': {
@@ -98,301 +143,299 @@ class RepoProcessor(BaseModel):
         context = self._get_context(**kwargs)
         getattr(self._logger, level)(message, extra={'context': context})
         
-    def process_repo(self, repo_url: str, repo_id: int) -> bool:
+    def process_repo(self, repo_url: str, repo_id: int, workers: Optional[int] = None,
+                     incremental: Optional[bool] = None) -> bool:
         """Process a repository from its URL.
         
+        Files are streamed through the ingestion pipeline as they are
+        discovered: read, parse, embed and store run concurrently and are
+        connected by bounded queues.
+        
         Args:
             repo_url: URL of the repository to process
             repo_id: ID of the repository in the database
+            workers: Number of worker processes to parse files with.
+                Defaults to ``config.workers``; 1 parses in-process.
+            incremental: Only process files changed since the last analyzed
+                commit. Defaults to ``config.incremental``.
             
         Returns:
             bool: True if processing was successful, False otherwise
         """
         start_time = time.time()
+        workers = workers or self.config.workers
+        incremental = self.config.incremental if incremental is None else incremental
         self._log("info", "Starting repository processing",
-                 repo_url=repo_url, repo_id=repo_id)
+                 repo_url=repo_url, repo_id=repo_id, workers=workers,
+                 incremental=incremental)
         
         try:
             # Clone repository
-            repo_path = self.file_service.clone_repository(repo_url)
+            use_git_objects = self.config.use_git_objects
+            repo_path = self.file_service.clone_repository(
+                repo_url,
+                bare=use_git_objects,
+                depth=self.config.clone_depth,
+                blob_limit=self.config.blob_size_limit,
+                sparse=self.config.sparse_checkout
+            )
             if not repo_path:
                 self._log("error", "Failed to clone repository",
                          repo_url=repo_url)
                 return False
                 
-            # Get repository files
-            files = self.file_service.get_repository_files(repo_path, repo_id=repo_id)
-            if not files:
-                self._log("warning", "No files found in repository",
-                         repo_url=repo_url,
-                         repo_path=str(repo_path))
-                return False
-                
-            # Process each file
-            processed_count = 0
-            skipped_count = 0
-            error_count = 0
-            
-            for file_info in files:
-                try:
-                    # Skip files we can't process
-                    if not file_info.is_supported:
-                        self._log("debug", "Skipping unsupported file", file=str(file_info.path))
-                        skipped_count += 1
-                        continue
-
-                    # Skip binary files
-                    if self.file_service._is_binary_file(file_info.path):
-                        self._log("debug", "Skipping binary file", file=str(file_info.path))
-                        skipped_count += 1
-                        continue
-
-                    # Read the current file content
-                    try:
-                        with open(file_info.path, "r", encoding="utf-8") as f:
-                            new_code = f.read()
-                    except (UnicodeDecodeError, IOError) as e:
-                        self._log("debug", "File read error", file=str(file_info.path), error=str(e))
-                        skipped_count += 1
-                        continue
-
-                    # Check if the file is already stored
-                    stored_code = self.pg_service.get_code_text(repo_id, str(file_info.path))
-                    if stored_code is not None:
-                        if stored_code == new_code:
-                            self._log("debug", "Skipping unchanged file", file=str(file_info.path))
-                            skipped_count += 1
-                            continue
-                        else:
-                            # File has changed, remove old record before updating
-                            self.pg_service.delete_file_snippets(str(file_info.path))
-
-                    snippet = self._process_file(file_info)
-                    if snippet:
-                        snippet.repo_id = repo_id
-                        # Store the updated/new snippet in the databases
-                        self._store_in_postgres(snippet)
-                        if snippet.ast_data:
-                            self._store_ast_in_neo4j(snippet)
-                        processed_count += 1
-                    else:
-                        skipped_count += 1
-
-                except Exception as e:
-                    error_count += 1
-                    self._log("error", "Error processing file",
-                             file=str(file_info.path),
-                             error=str(e))
-                    
-            duration = (time.time() - start_time) * 1000
-            self._log("info", "Repository processing completed",
-                     repo_url=repo_url,
-                     total_files=len(files),
-                     processed=processed_count,
-                     skipped=skipped_count,
-                     errors=error_count,
-                     duration_ms=duration)
-            
-            return True
+            blob_reader = GitBlobReader(repo_path=repo_path) if use_git_objects else None
+            self.file_processor.blob_reader = blob_reader
+            try:
+                return self._process_checkout(repo_url, repo_id, repo_path, start_time,
+                                              workers, incremental, blob_reader)
+            finally:
+                self.file_processor.blob_reader = None
+                if blob_reader is not None:
+                    blob_reader.close()
+                self.file_service.cleanup_repository(repo_path)
             
         except Exception as e:
             self._log("error", "Repository processing failed",
                      repo_url=repo_url,
                      error=str(e))
             return False
-            
-    def _process_file(self, file_info: FileInfo) -> Optional[CodeSnippet]:
-        """Process a single file from the repository.
+
+    def _process_checkout(self, repo_url: str, repo_id: int, repo_path: Path,
+                          start_time: float, workers: int, incremental: bool,
+                          blob_reader: Optional[GitBlobReader]) -> bool:
+        """Process the files of a cloned or local repository.
         
+        Args:
+            repo_url: URL of the repository being processed
+            repo_id: ID of the repository in the database
+            repo_path: Path returned by ``clone_repository``
+            start_time: Time processing started, for logging
+            workers: Number of worker processes to parse files with
+            incremental: Only process files changed since the last analyzed commit
+            blob_reader: Reader for the git object database, if content is
+                read from git rather than the working tree
+            
         Returns:
-            - None if the file cannot be processed (encoding errors, read errors, etc.)
-            - CodeSnippet with syntax_valid=False if the file can be read but not parsed
-            - CodeSnippet with syntax_valid=True if the file is successfully parsed
+            bool: True if processing was successful, False otherwise
         """
-        start_time = time.time()
-        try:
-            # Try to read file content first
-            try:
-                with open(file_info.path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except (UnicodeDecodeError, IOError) as e:
-                self._log("debug", "File read error",
-                         file=str(file_info.path),
-                         error=str(e))
-                return None
-
-            # Handle empty files
-            if not content.strip():
-                self._log("debug", "Empty file",
-                         file=str(file_info.path))
-                return None
-
-            # Always try custom parser first for supported file types
-            custom_parser = get_custom_parser(str(file_info.path))
-            if custom_parser:
-                ast_data = self._parse_with_custom_parser(content, file_info.path)
-                if ast_data:
-                    self._log("debug", "Successfully parsed with custom parser",
-                             file=str(file_info.path),
-                             parser_type="custom")
-                    return CodeSnippet(
-                        id=None,
-                        repo_id=0,  # Default repo ID
-                        file_path=str(file_info.path),
-                        code_text=content,
-                        language=file_info.language,
-                        ast_data=ast_data,
-                        syntax_valid=True,
-                        embedding=[0.0] * 1536  # Default zero embedding
-                    )
-
-            # Process with tree-sitter if language is supported
-            if self.language_service.is_language_supported(file_info.language):
-                ast_data = self._parse_with_tree_sitter(content, file_info.language)
-                if ast_data:
-                    duration = (time.time() - start_time) * 1000
-                    self._log("debug", "File processed successfully",
-                             file=str(file_info.path),
-                             language=file_info.language,
-                             parser_type="tree-sitter",
-                             duration_ms=duration)
-                    return CodeSnippet(
-                        id=None,
-                        repo_id=0,  # Default repo ID
-                        file_path=str(file_info.path),
-                        code_text=content,
-                        language=file_info.language,
-                        ast_data=ast_data,
-                        syntax_valid=ast_data.get('syntax_valid', True),  # Default to True if not specified
-                        embedding=[0.0] * 1536  # Default zero embedding
-                    )
-
-            # If we get here, we have valid content but no successful parse
-            # Return a CodeSnippet with syntax_valid=False
-            self._log("debug", "No successful parse",
-                     file=str(file_info.path),
-                     language=file_info.language or "unknown")
-            return CodeSnippet(
-                id=None,
-                repo_id=0,  # Default repo ID
-                file_path=str(file_info.path),
-                code_text=content,
-                language=file_info.language or "unknown",
-                ast_data={},
-                syntax_valid=False,
-                embedding=[0.0] * 1536  # Default zero embedding
-            )
+        head_commit = self.file_service.get_head_commit(repo_path)
+        changes = None
+        if incremental and head_commit:
+            changes = self._get_changes_since_last_run(repo_path, repo_id, head_commit)
+            
+        # Load stored content hashes once so unchanged files are
+        # skipped with a dictionary lookup. Files are stored under paths
+        # relative to the repository, since checkouts of the same
+        # repository land in a different directory on every run
+        known_hashes = self.pg_service.get_file_hashes(repo_id)
+        
+        changed_paths = None
+        if changes is not None:
+            # Drop data for deleted and renamed-away files, then only
+            # stream the files that changed
+            self._remove_files(repo_id, repo_path, changes.removed_paths, known_hashes)
+            changed_paths = changes.changed_paths
+            
+        # Stream repository files through the pipeline
+        if blob_reader is not None:
+            files = self.file_service.iter_git_files(
+                repo_path, blob_reader, repo_id=repo_id, relative_paths=changed_paths)
+        elif changed_paths is not None:
+            files = self.file_service.iter_files_for_paths(
+                repo_path, changed_paths, repo_id=repo_id)
+        else:
+            files = self.file_service.iter_repository_files(repo_path, repo_id=repo_id)
+        stats = ProcessingStats(record_file_stats=self.config.record_file_stats)
+        self.last_stats = stats
+        
+        pipeline = IngestionPipeline(
+            file_processor=self.file_processor,
+            embedding_service=self.embedding_service,
+            is_unchanged=lambda file_path, new_hash: self._is_unchanged(
+                known_hashes, self._stored_path(repo_path, file_path), new_hash),
+            store=lambda item: self._store_item(item, repo_id, repo_path, known_hashes),
+            workers=workers,
+            queue_size=self.config.queue_size,
+            embed_batch_size=self.config.embed_batch_size,
+            policy=self._file_policy()
+        )
+        pipeline.run(files, stats)
+        stats.complete()
+        
+        if not stats.total_files and changes is None:
+            self._log("warning", "No files found in repository",
+                     repo_url=repo_url,
+                     repo_path=str(repo_path))
+            return False
+            
+        # Only advance the recorded commit when every stage ran to the end
+        # and every file made it in, so failed and unreached files are
+        # retried by the next incremental run
+        if head_commit and not stats.error_files and not stats.failed_stages:
+            self.pg_service.update_last_analyzed_commit(repo_id, head_commit)
+                
+        duration = (time.time() - start_time) * 1000
+        self._log("info", "Repository processing completed",
+                 repo_url=repo_url,
+                 total_files=stats.total_files,
+                 processed=stats.processed_files,
+                 skipped=stats.skipped_files,
+                 errors=stats.error_files,
+                 failed_stages=stats.failed_stages,
+                 timed_out=stats.timed_out_files,
+                 oversized=stats.oversized_files,
+                 tiers=stats.tier_counts,
+                 removed=len(changes.removed_paths) if changes else 0,
+                 incremental=changes is not None,
+                 head_commit=head_commit,
+                 workers=workers,
+                 duration_ms=duration)
+        
+        return True
 
-        except Exception as e:
-            self._log("error", "Error processing file",
-                     file=str(file_info.path),
-                     error=str(e))
+    def _file_policy(self) -> Optional[FilePolicy]:
+        """Build the file policy described by the ingestion config.
+        
+        Returns:
+            FilePolicy, or None if every file runs every stage
+        """
+        if not self.config.use_file_policy:
             return None
+        return FilePolicy(
+            skip_bytes=self.config.skip_file_bytes,
+            metadata_only_bytes=self.config.max_parse_bytes,
+            parse_only_bytes=self.config.parse_only_bytes
+        )
 
-    def _parse_with_tree_sitter(self, content: str, language: str) -> Optional[Dict]:
-        """Parse file content using tree-sitter.
+    def _get_changes_since_last_run(self, repo_path: Path, repo_id: int,
+                                    head_commit: str) -> Optional[RepositoryChanges]:
+        """Get the files changed since the last analyzed commit.
         
         Args:
-            content: File content to parse
-            language: Programming language to use for parsing
+            repo_path: Path to the repository
+            repo_id: ID of the repository in the database
+            head_commit: Commit being analyzed now
             
         Returns:
-            Dictionary containing AST data if successful, None otherwise
+            RepositoryChanges, or None if a full run is required
         """
-        try:
-            parse_result = self.parser_service.parse_content(content, language)
-            if not parse_result or not parse_result.tree:
-                self._log("error", "Failed to parse content",
-                         language=language)
-                return {
-                    'syntax_valid': False,
-                    'errors': ['Failed to parse content'],
-                    'error_nodes': [],
-                    'missing_nodes': []
-                }
-                
-            # Extract AST data even if there are syntax errors
-            # Tree-sitter will provide a partial AST
-            ast_data = self._extract_ast_data(parse_result)
-            
-            # Check if the root node has any syntax errors
-            syntax_valid = not parse_result.tree.root_node.has_error
-            
-            # Include AST data and error information
-            result = ast_data or {}
-            result['syntax_valid'] = syntax_valid
-            result['errors'] = parse_result.errors if hasattr(parse_result, 'errors') else []
-            result['error_nodes'] = [node_to_dict(node) for node in parse_result.error_nodes] if hasattr(parse_result, 'error_nodes') else []
-            result['missing_nodes'] = [node_to_dict(node) for node in parse_result.missing_nodes] if hasattr(parse_result, 'missing_nodes') else []
-            
-            return result
+        last_commit = self.pg_service.get_last_analyzed_commit(repo_id)
+        if not last_commit:
+            self._log("info", "No analyzed commit recorded, running full analysis",
+                     repo_id=repo_id)
+            return None
+        if last_commit == head_commit:
+            return RepositoryChanges(base_commit=last_commit, head_commit=head_commit)
             
-        except Exception as e:
-            self._log("error", "Tree-sitter parsing error",
-                     language=language,
-                     error=str(e))
-            return {
-                'syntax_valid': False,
-                'errors': [str(e)],
-                'error_nodes': [],
-                'missing_nodes': []
-            }
+        changes = self.file_service.get_changed_files(repo_path, last_commit, head_commit)
+        if changes is None:
+            self._log("warning", "Could not diff against last analyzed commit, running full analysis",
+                     repo_id=repo_id,
+                     last_commit=last_commit,
+                     head_commit=head_commit)
+        return changes
+
+    def _remove_files(self, repo_id: int, repo_path: Path, relative_paths: List[str],
+                      known_hashes: Dict[str, Optional[str]]) -> None:
+        """Remove stored data for files that no longer exist.
+        
+        Args:
+            repo_id: ID of the repository in the database
+            repo_path: Path to the repository
+            relative_paths: Removed paths relative to ``repo_path``
+            known_hashes: Stored content hashes keyed by repository-relative
+                path, updated in place
+        """
+        for relative_path in relative_paths:
+            file_path = self._stored_path(repo_path, repo_path / relative_path)
+            self.pg_service.delete_file_snippets(file_path, repo_id=repo_id)
+            self.neo4j_service.delete_file_nodes(repo_id, file_path)
+            known_hashes.pop(file_path, None)
+            self._log("debug", "Removed deleted file", file=file_path)
+
+    @staticmethod
+    def _stored_path(repo_path: Path, file_path) -> str:
+        """Get the path a file is stored under: relative to the repository, with forward slashes.
+        
+        Args:
+            repo_path: Path to the repository
+            file_path: Path of the file inside ``repo_path``
             
-    def _parse_with_custom_parser(self, content: str, file_path: Path) -> Optional[Dict[str, Any]]:
-        """Parse file content using a custom parser.
+        Returns:
+            Repository-relative POSIX path
+        """
+        return Path(os.path.relpath(file_path, repo_path)).as_posix()
+
+    def _is_unchanged(self, known_hashes: Dict[str, Optional[str]], file_path: str,
+                      new_hash: str) -> bool:
+        """Check a file against the preloaded hash of its stored version.
         
         Args:
-            content: File content to parse
-            file_path: Path to the file
+            known_hashes: Stored content hashes keyed by repository-relative path
+            file_path: Repository-relative path of the file
+            new_hash: Hash of the current file content
             
         Returns:
-            Parsed AST data if successful, None otherwise
+            True if the stored version matches the current content
         """
-        try:
-            parser = get_custom_parser(str(file_path))
-            if parser:
-                return parser.parse(content)
-            return None
-        except Exception as e:
-            self._log("error", "Custom parser error",
-                     file=str(file_path),
-                     error=str(e))
-            return None
+        if known_hashes.get(file_path) == new_hash:
+            self._log("debug", "Skipping unchanged file", file=file_path)
+            return True
+        return False
 
-    def _extract_ast_data(self, parse_result) -> Dict[str, Any]:
-        """Extract AST data from parse result."""
-        if not parse_result.tree or not parse_result.tree.root_node:
-            return {}
+    def _store_item(self, item: PipelineItem, repo_id: int, repo_path: Path,
+                    known_hashes: Dict[str, Optional[str]]) -> None:
+        """Store a processed pipeline item in both databases.
+        
+        Args:
+            item: Pipeline item carrying the snippet and its embedding
+            repo_id: ID of the repository in the database
+            repo_path: Path to the repository the item was read from
+            known_hashes: Stored content hashes keyed by repository-relative path
+        """
+        snippet = item.snippet
+        snippet.repo_id = repo_id
+        snippet.file_path = self._stored_path(repo_path, item.file_path)
+        snippet.content_hash = item.content_hash
+        if snippet.file_path in known_hashes:
+            # File has changed, remove old record before updating
+            self.pg_service.delete_file_snippets(snippet.file_path, repo_id=repo_id)
+        # Store the updated/new snippet in the databases
+        skip_embedding = ((item.tier is not None and not item.tier.runs_embedding)
+                          or metadata_only_reason(snippet) is not None)
+        self._store_in_postgres(snippet, item.embedding, skip_embedding=skip_embedding)
+        if snippet.ast_data:
+            self._store_ast_in_neo4j(snippet)
             
-        return node_to_dict(parse_result.tree.root_node)
+    def _process_file(self, file_info: FileInfo) -> Optional[CodeSnippet]:
+        """Process a single file from the repository.
+        
+        Returns:
+            - None if the file cannot be processed (encoding errors, read errors, etc.)
+            - CodeSnippet with syntax_valid=False if the file can be read but not parsed
+            - CodeSnippet with syntax_valid=True if the file is successfully parsed
+        """
+        return self.file_processor.process_file(file_info)
         
-    def _extract_functions(self, ast_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively extract function definitions from the AST data.
+    def _extract_functions(self, ast: CompactAST) -> Dict[str, int]:
+        """Extract function definitions from a compact AST.
         
         Args:
-            ast_data: AST data dictionary
+            ast: Compact AST with its source attached
             
         Returns:
-            A dictionary mapping function names to their AST node data.
+            A dictionary mapping function names to their node indices.
         """
         functions = {}
-
-        def recurse(node):
-            if isinstance(node, dict):
-                # Check for function definition nodes; adjust the node types as needed
-                if node.get('type') in ['function_definition', 'function_declaration', 'method_definition']:
-                    # Attempt to find the function name from children
-                    for child in node.get('children', []):
-                        if isinstance(child, dict) and child.get('type') == 'identifier' and 'text' in child:
-                            func_name = child['text']
-                            if func_name:
-                                functions[func_name] = node
-                                break
-                # Recurse into children
-                for child in node.get('children', []):
-                    recurse(child)
-
-        recurse(ast_data)
+        for index in ast.find(FUNCTION_NODE_TYPES):
+            # The function name is its first identifier child
+            for child in ast.children(index):
+                if ast.type_of(child) == 'identifier':
+                    func_name = ast.text(child)
+                    if func_name:
+                        functions[func_name] = index
+                        break
         return functions
 
     def _store_ast_in_neo4j(self, snippet: CodeSnippet) -> None:
@@ -413,39 +456,43 @@ class RepoProcessor(BaseModel):
         )
         self.neo4j_service.create_file_node(file_node)
         
+        # Custom parsers produce their own AST data without functions
+        ast = CompactAST.from_ast_data(snippet.ast_data, snippet.code_text.encode('utf-8'))
+        if ast is None:
+            return
+
         # Extract function definitions from the AST
-        functions = self._extract_functions(snippet.ast_data)
+        functions = self._extract_functions(ast)
         
         # Create function nodes
-        for func_name, func_ast in functions.items():
-            self.neo4j_service.create_function_node(func_name, func_ast)
+        for func_name, func_index in functions.items():
+            self.neo4j_service.create_function_node(func_name, ast.node_dict(func_index))
             
         # Create function call relationships
-        for caller, caller_ast in functions.items():
-            for callee, callee_ast in functions.items():
+        for caller, caller_index in functions.items():
+            for callee in functions:
                 if caller != callee:
-                    if self._has_function_call(caller_ast, callee):
+                    if self._has_function_call(ast, caller_index, callee):
                         self.neo4j_service.create_function_relationship(caller, callee)
 
-    def _has_function_call(self, ast_data: Dict[str, Any], function_name: str) -> bool:
-        """Check if the AST data contains a call to the given function.
+    def _has_function_call(self, ast: CompactAST, index: int, function_name: str) -> bool:
+        """Check if a subtree of the AST contains a call to the given function.
         
         Args:
-            ast_data: AST data to search in
+            ast: Compact AST with its source attached
+            index: Root of the subtree to search in
             function_name: Name of the function to look for
             
         Returns:
             True if a call to the function is found, False otherwise
         """
-        if ast_data.get('type') == 'call':
-            for child in ast_data.get('children', []):
-                if (child.get('type') == 'identifier' and 
-                    child.get('text') == function_name):
+        for node in (index, *ast.descendants(index)):
+            if ast.type_of(node) != 'call':
+                continue
+            for child in ast.children(node):
+                if (ast.type_of(child) == 'identifier' and
+                        ast.text(child) == function_name):
                     return True
-        # Recursively check children
-        for child in ast_data.get('children', []):
-            if isinstance(child, dict) and self._has_function_call(child, function_name):
-                return True
         return False
 
     def query_codebase(self, query: str, limit: int = 5) -> Dict[str, Any]:
@@ -476,12 +523,14 @@ class RepoProcessor(BaseModel):
                 
         return results 
 
-    def _store_in_postgres(self, snippet: CodeSnippet) -> None:
+    def _store_in_postgres(self, snippet: CodeSnippet, embedding: Optional[List[float]] = None,
+                           skip_embedding: bool = False) -> None:
         """Store the given CodeSnippet in the PostgreSQL database using PostgresService."""
         try:
             # Attempt to insert the new code snippet
             # Assuming PostgresService has a create_code_snippet method that accepts a CodeSnippet
-            self.pg_service.store_code_with_embedding(snippet)
+            self.pg_service.store_code_with_embedding(snippet, embedding=embedding,
+                                                      skip_embedding=skip_embedding)
         except Exception as e:
             self._log("error", "Failed to store snippet in Postgres", file=snippet.file_path, error=str(e))
             raise 
\ No newline at end of file
@@ -8,6 +8,8 @@ from .custom_parsers import (CustomParser, EditorConfigParser, EnvFileParser,
                              RequirementsParser)
 # Language services
 from .language_service import LanguageService
+# Compiled query cache
+from .query_cache import QueryCache, get_query_cache
 # Traversal services
 from .traversal_service import TraversalService
 
@@ -16,6 +18,8 @@ __all__ = [
     'BaseParserService',
     'LanguageService',
     'TraversalService',
+    'QueryCache',
+    'get_query_cache',
     
     # Custom parsers
     'CustomParser',
@@ -0,0 +1,125 @@
+"""Process-wide cache of compiled tree-sitter queries.
+
+Compiling a query parses the pattern source and analyzes it against the
+grammar, which costs far more than running it on a typical file. Queries
+only depend on the language and the pattern text, so they are compiled
+once and shared: entries are keyed by the language and a hash of the
+pattern and evicted least recently used first.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from tree_sitter import Query
+
+DEFAULT_QUERY_CACHE_SIZE = 256
+
+QueryKey = Tuple[str, str]
+
+
+class QueryCache:
+    """Bounded LRU cache of compiled queries with hit and miss counters.
+
+    Cached queries are shared between callers and threads, so callers must
+    reset any settings they change on a query (such as a byte range) before
+    returning it to use. Objects built from compiled queries, such as
+    combined extraction queries, may be cached under a reserved pattern key
+    so they share the same bound.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_QUERY_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of compiled queries to keep
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._queries: "OrderedDict[QueryKey, Query]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(language: str, pattern: str) -> QueryKey:
+        """Get the cache key for a language and pattern.
+
+        Args:
+            language: Language identifier
+            pattern: Query source
+
+        Returns:
+            Tuple of the normalized language and a hash of the pattern
+        """
+        digest = hashlib.blake2b(pattern.encode('utf-8'), digest_size=16).hexdigest()
+        return language.lower().strip(), digest
+
+    def get(self, language: str, pattern: str, compile_query: Callable[[], Query]) -> Query:
+        """Get a compiled query, compiling it on a miss.
+
+        Args:
+            language: Language identifier
+            pattern: Query source
+            compile_query: Called without arguments to compile the query
+                when it is not cached
+
+        Returns:
+            Compiled query
+
+        Raises:
+            Any error raised by ``compile_query``; failures are not cached
+        """
+        key = self.key(language, pattern)
+        with self._lock:
+            query = self._queries.get(key)
+            if query is not None:
+                self._queries.move_to_end(key)
+                self.hits += 1
+                return query
+            self.misses += 1
+
+        # Compile outside the lock; if two threads race, both results are
+        # valid and the first one stored wins
+        query = compile_query()
+        with self._lock:
+            cached = self._queries.setdefault(key, query)
+            self._queries.move_to_end(key)
+            while len(self._queries) > self.max_size:
+                self._queries.popitem(last=False)
+                self.evictions += 1
+        return cached
+
+    def clear(self) -> None:
+        """Drop all cached queries and reset the counters."""
+        with self._lock:
+            self._queries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters.
+
+        Returns:
+            Dict with hits, misses, evictions, size, max_size and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._queries),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+
+_query_cache = QueryCache()
+
+
+def get_query_cache() -> QueryCache:
+    """Get the process-wide query cache."""
+    return _query_cache
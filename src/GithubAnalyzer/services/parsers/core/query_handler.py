@@ -1,14 +1,18 @@
 """Core tree-sitter query handler functionality."""
+import bisect
 import logging
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import (Any, Callable, Dict, List, Optional, Sequence, Set, Tuple,
+                    Union)
 
 from tree_sitter import Language, Node, Parser, Point, Query, QueryError, Tree
 from tree_sitter_language_pack import get_binding, get_language, get_parser
 
-from GithubAnalyzer.models.analysis.query import (QueryCapture, QueryExecutor,
+from GithubAnalyzer.models.analysis.query import (ExtractionQuery,
+                                                  ExtractionResult,
+                                                  QueryCapture, QueryExecutor,
                                                   QueryOptimizationSettings,
                                                   QueryPattern, QueryResult,
                                                   QueryStats)
@@ -17,19 +21,76 @@ from GithubAnalyzer.models.core.ast import NodeDict, NodeList
 from GithubAnalyzer.models.core.errors import ParserError
 from GithubAnalyzer.models.core.traversal import TreeSitterTraversal
 from GithubAnalyzer.models.core.tree_sitter_core import (
-    get_node_text, get_node_type, get_node_range, is_valid_node,
-    node_to_dict, iter_children
+    find_missing_nodes, get_node_text, get_node_type, get_node_range,
+    is_valid_node, iter_error_nodes, node_to_dict, iter_children
 )
 from GithubAnalyzer.services.parsers.core.base_parser_service import \
     BaseParserService
 from GithubAnalyzer.services.parsers.core.language_service import \
     LanguageService
+from GithubAnalyzer.services.parsers.core.query_cache import (QueryCache,
+                                                              get_query_cache)
 from GithubAnalyzer.utils.logging import get_logger
 from GithubAnalyzer.utils.timing import timer
 
+try:
+    from tree_sitter import QueryCursor
+except ImportError:  # tree-sitter < 0.25 runs queries on the Query itself
+    QueryCursor = None
+
 # Initialize logger
 logger = get_logger(__name__)
 
+# Pattern types combined into the per-language extraction query
+EXTRACTION_KINDS = ('function', 'class', 'import')
+
+# Patterns collecting syntax errors in the same pass
+ERROR_PATTERNS = (
+    ('error', '(ERROR) @error'),
+    ('missing', '(MISSING) @missing'),
+)
+
+# Query cache pattern under which each language's extraction query is
+# kept; it is not valid query syntax, so it never collides with a pattern
+EXTRACTION_QUERY_KEY = "<extraction>"
+
+# Byte range tree-sitter queries cover when not restricted
+_FULL_BYTE_RANGE = (0, 0xFFFFFFFF)
+
+
+def run_matches(query: Query, node: Node,
+                byte_range: Optional[Tuple[int, int]] = None) -> List[Tuple[int, Dict[str, Any]]]:
+    """Run a query over a node and return its matches.
+    
+    Args:
+        query: Compiled query
+        node: Node to run the query on
+        byte_range: Only return matches intersecting this (start, end) range
+        
+    Returns:
+        List of (pattern_index, captures) tuples
+    """
+    if QueryCursor is not None:
+        cursor = QueryCursor(query)
+        if byte_range is not None:
+            cursor.set_byte_range(*byte_range)
+        return cursor.matches(node)
+    if byte_range is None:
+        return query.matches(node)
+    # Compiled queries are cached and shared, so the range must not stick
+    query.set_byte_range(byte_range)
+    try:
+        return query.matches(node)
+    finally:
+        query.set_byte_range(_FULL_BYTE_RANGE)
+
+
+def _first_node(nodes: Any) -> Optional[Node]:
+    """Get the node of a capture, which newer bindings return as a list."""
+    if isinstance(nodes, list):
+        return nodes[0] if nodes else None
+    return nodes
+
 @dataclass
 class TreeSitterQueryHandler(BaseParserService):
     """Handler for tree-sitter queries with enhanced language support."""
@@ -39,6 +100,7 @@ class TreeSitterQueryHandler(BaseParserService):
     _executor: QueryExecutor = field(default_factory=QueryExecutor)
     _traversal: TreeSitterTraversal = field(default_factory=TreeSitterTraversal)
     _start_time: float = field(default_factory=time.time)
+    _query_cache: QueryCache = field(default_factory=get_query_cache)
     
     def __post_init__(self):
         """Initialize query handler."""
@@ -56,7 +118,6 @@ class TreeSitterQueryHandler(BaseParserService):
             raise ValueError(f"Could not get language for {self.language_name}")
         
         # Initialize query components
-        self._pattern_queries = {}
         self._disabled_patterns = set()
         self._disabled_captures = set()
         
@@ -92,23 +153,34 @@ class TreeSitterQueryHandler(BaseParserService):
         getattr(self._logger, level)(message, extra={'context': context})
 
     def create_query(self, query_string: str, language_name: Optional[str] = None) -> Query:
-        """Create an optimized tree-sitter query."""
+        """Get a compiled tree-sitter query.
+        
+        Queries are compiled once per language and pattern and then served
+        from the shared query cache; see ``get_query_cache_stats``.
+        """
+        language = language_name or self._language_name
+        return self._query_cache.get(
+            language, query_string,
+            lambda: self._compile_query(query_string, language))
+        
+    def _compile_query(self, query_string: str, language_name: str) -> Query:
+        """Compile and validate a tree-sitter query."""
         start_time = self._time_operation('create_query')
         
         try:
             # Get language
-            lang = self._language_service.get_language_object(language_name or self._language_name)
+            lang = self._language_service.get_tree_sitter_language(language_name)
             if not lang:
-                raise ValueError(f"Could not get language for {language_name or self._language_name}")
+                raise ValueError(f"Could not get language for {language_name}")
             
             # Create and optimize query
-            query = lang.query(query_string)
+            query = Query(lang, query_string)
             
             # Create query stats
             stats = QueryStats(
                 pattern_count=query.pattern_count,
                 capture_count=query.capture_count,
-                match_limit=query.match_limit
+                match_limit=getattr(query, 'match_limit', 0)
             )
             
             # Check for unrooted patterns
@@ -130,7 +202,7 @@ class TreeSitterQueryHandler(BaseParserService):
                     'source': 'tree-sitter',
                     'type': 'query',
                     'log_type': 'optimization',
-                    'language': language_name or self._language_name,
+                    'language': language_name,
                     'stats': stats.__dict__,
                     'query_string': query_string
                 }
@@ -264,6 +336,10 @@ class TreeSitterQueryHandler(BaseParserService):
         self._operation_times[operation] = duration
         return duration
 
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters of the query cache."""
+        return self._query_cache.stats()
+
     def get_query_stats(self, query: Query) -> Dict[str, Any]:
         """Get statistics about a query."""
         return {
@@ -278,7 +354,11 @@ class TreeSitterQueryHandler(BaseParserService):
         self._disabled_captures.add(capture)
 
     def disable_pattern(self, pattern_index: int) -> None:
-        """Disable a pattern in future queries."""
+        """Disable a pattern in future queries.
+        
+        Applies to ``find_nodes`` and ``get_matches``; ``extract`` runs
+        every pattern of its combined query.
+        """
         self._disabled_patterns.add(pattern_index)
 
     def find_nodes(self, tree_or_node: Union[Tree, Node], pattern_type: str, language: Optional[str] = None) -> List[Dict[str, Node]]:
@@ -424,33 +504,29 @@ class TreeSitterQueryHandler(BaseParserService):
             self._end_operation('get_pattern_info', start_time)
 
     def _get_pattern_query(self, pattern_type: str, language: Optional[str] = None) -> Optional[Query]:
-        """Get cached query for pattern type."""
-        lang = language or self.language.name
+        """Get the compiled query for a registered pattern type."""
+        lang = language or self._language_name
         from GithubAnalyzer.models.analysis.pattern_registry import \
-            PATTERN_REGISTRY
-        return self._pattern_queries.get(lang, {}).get(pattern_type)
+            get_language_patterns
+        try:
+            pattern = get_language_patterns(lang).get(pattern_type)
+            if not pattern:
+                return None
+            return self.create_query(pattern, lang)
+        except Exception:
+            return None
 
     def _process_captures(self, captures: Dict[str, List[Node]]) -> Dict[str, List[Node]]:
         """Process captures into a dictionary mapping capture names to node lists."""
         return captures  # Tree-sitter already returns the format we want
 
     def find_error_nodes(self, node: Node) -> List[Node]:
-        """Find error nodes in tree."""
-        if not node:
-            return []
-        return self._traversal.find_nodes(
-            node,
-            lambda n: hasattr(n, 'has_error') and n.has_error
-        )
+        """Find error nodes in tree, only descending into subtrees with errors."""
+        return list(iter_error_nodes(node))
         
     def find_missing_nodes(self, node: Node) -> List[Node]:
-        """Find missing nodes in tree."""
-        if not node:
-            return []
-        return self._traversal.find_nodes(
-            node,
-            lambda n: hasattr(n, 'is_missing') and n.is_missing
-        )
+        """Find missing nodes in tree, only descending into subtrees with errors."""
+        return find_missing_nodes(node)
 
     def validate_syntax(self, node: Node, language: Optional[str] = None) -> Tuple[bool, List[str]]:
         """Validate syntax using error patterns."""
@@ -473,7 +549,7 @@ class TreeSitterQueryHandler(BaseParserService):
         
         try:
             # Create and execute query
-            query = self.language.query(pattern)
+            query = self.create_query(pattern)
             captures_dict = query.captures(target_node)
 
             # Log detailed capture information
@@ -569,6 +645,258 @@ class TreeSitterQueryHandler(BaseParserService):
             })
             return []
 
+    def get_extraction_query(self, language: Optional[str] = None) -> Optional[ExtractionQuery]:
+        """Get the combined extraction query for a language.
+        
+        The language's function, class and import patterns and the error
+        patterns are concatenated into one query, remembering which kind
+        each pattern index belongs to. Parts that fail to compile on their
+        own are left out, so one broken pattern does not disable the rest.
+        
+        Extraction queries are kept in the shared query cache, so they are
+        bounded and evicted along with the queries they are built from.
+        
+        Args:
+            language: Language identifier
+            
+        Returns:
+            ExtractionQuery, or None if the language has no usable pattern
+        """
+        lang = language or self._language_name
+        extraction = self._query_cache.get(
+            lang, EXTRACTION_QUERY_KEY, lambda: self._build_extraction_query(lang))
+        return extraction if extraction.query is not None else None
+        
+    def _build_extraction_query(self, lang: str) -> ExtractionQuery:
+        """Build the combined extraction query for a language.
+        
+        Returns:
+            ExtractionQuery, with no query if the language has no usable pattern
+        """
+        from GithubAnalyzer.models.analysis.pattern_registry import \
+            get_language_patterns
+        patterns = get_language_patterns(lang)
+        parts = [(kind, patterns[kind]) for kind in EXTRACTION_KINDS if patterns.get(kind)]
+        parts.extend(ERROR_PATTERNS)
+        
+        sources = []
+        pattern_kinds: List[str] = []
+        for kind, pattern in parts:
+            try:
+                part = self.create_query(pattern, lang)
+            except Exception as e:
+                self._log("warning", f"Leaving {kind} pattern out of extraction query: {e}",
+                         language=lang)
+                continue
+            sources.append(pattern)
+            pattern_kinds.extend([kind] * part.pattern_count)
+            
+        if sources:
+            try:
+                query = self.create_query("\n".join(sources), lang)
+                return ExtractionQuery(query=query, pattern_kinds=pattern_kinds,
+                                       source="\n".join(sources))
+            except Exception as e:
+                self._log("error", f"Failed to build extraction query: {e}", language=lang)
+        return ExtractionQuery(query=None)
+        
+    def extract(self, tree_or_node: Union[Tree, Node], language: Optional[str] = None) -> ExtractionResult:
+        """Collect functions, classes, imports and syntax errors in one pass.
+        
+        Runs the language's extraction query once and dispatches each match
+        on the kind of pattern that produced it. Functions have the same
+        shape as ``find_functions`` results; classes and imports map capture
+        names to nodes like ``find_nodes`` results.
+        
+        Args:
+            tree_or_node: Tree or node to extract from
+            language: Language identifier
+            
+        Returns:
+            ExtractionResult with the collected nodes
+        """
+        root = tree_or_node.root_node if isinstance(tree_or_node, Tree) else tree_or_node
+        result = ExtractionResult()
+        extraction = self.get_extraction_query(language)
+        if extraction is None:
+            return result
+            
+        self._collect_matches(extraction, root, result)
+                
+        # Without query support for MISSING, fall back to a walk, which is
+        # only needed when the tree has errors at all
+        if 'missing' not in extraction.pattern_kinds and root.has_error:
+            result.missing_nodes = self.find_missing_nodes(root)
+        return result
+        
+    def extract_changes(self, previous: ExtractionResult, tree: Tree,
+                        byte_ranges: Sequence[Tuple[int, int]],
+                        map_byte: Callable[[int], Optional[int]],
+                        language: Optional[str] = None) -> ExtractionResult:
+        """Update an extraction after edits by re-querying only the changed ranges.
+        
+        Elements of ``previous`` that do not touch a changed range are kept
+        and re-anchored to the nodes at their shifted position in the new
+        tree. The extraction query then runs restricted to the changed
+        ranges, and its matches replace the dropped elements. The cost
+        follows the size of the change, not of the file.
+        
+        Args:
+            previous: Extraction of the tree before the edits
+            tree: Tree after the edits
+            byte_ranges: Changed (start, end) byte ranges in the new tree,
+                such as ``EditSession.affected_ranges()``
+            map_byte: Maps a byte offset of the old tree to the new tree,
+                returning None for bytes inside replaced text, such as
+                ``EditSession.map_byte``
+            language: Language identifier
+            
+        Returns:
+            ExtractionResult for the new tree, equal to ``extract(tree)``
+        """
+        root = tree.root_node
+        result = ExtractionResult()
+        extraction = self.get_extraction_query(language)
+        if extraction is None:
+            return result
+            
+        # Widened by a byte, so zero-length ranges of deletions still match
+        # the elements around them, and kept elements never match again
+        ranges = [(max(start - 1, 0), end + 1) for start, end in byte_ranges]
+        low = min((start for start, _ in ranges), default=0)
+        high = max((end for _, end in ranges), default=-1)
+        
+        # Same test as the query cursor's, so dropped elements are found again
+        def touches_change(start: int, end: int) -> bool:
+            if end <= low or start >= high:
+                return False
+            return any(start < range_end and range_start < end for range_start, range_end in ranges)
+            
+        def relocate(node: Node) -> Optional[Node]:
+            start, end = map_byte(node.start_byte), map_byte(node.end_byte)
+            if start is None or end is None or touches_change(start, end):
+                return None
+            found = root.descendant_for_byte_range(start, end)
+            # The smallest node spanning the range may be a child of the same extent
+            while found is not None and found.start_byte == start and found.end_byte == end:
+                if found.type == node.type:
+                    return found
+                found = found.parent
+            # Not where it should be; re-query its region instead
+            ranges.append((start, end))
+            return None
+            
+        def relocate_captures(captures: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            moved = dict(captures)
+            for name, node in captures.items():
+                if isinstance(node, Node):
+                    moved[name] = relocate(node)
+                    if moved[name] is None:
+                        return None
+            return moved
+            
+        for function in previous.functions:
+            moved = relocate_captures(function)
+            if moved is not None:
+                moved['start_point'] = moved['function.def'].start_point
+                moved['end_point'] = moved['function.def'].end_point
+                result.functions.append(moved)
+        for kind in ('classes', 'imports'):
+            kept = getattr(result, kind)
+            for captures in getattr(previous, kind):
+                moved = relocate_captures(captures)
+                if moved is not None:
+                    kept.append(moved)
+        for node in previous.error_nodes:
+            moved = relocate(node)
+            if moved is not None:
+                result.error_nodes.append(moved)
+                    
+        # Matches of the changed ranges are merged into the kept elements,
+        # which are already in document order
+        changes = ExtractionResult()
+        for byte_range in ranges:
+            self._collect_matches(extraction, root, changes, byte_range)
+        for kind in ('functions', 'classes', 'imports', 'error_nodes'):
+            elements = getattr(result, kind)
+            for element in getattr(changes, kind):
+                # Overlapping ranges return the same match more than once
+                position = self._element_position(element)
+                index = bisect.bisect_left(elements, position, key=self._element_position)
+                key = self._element_key(element)
+                duplicate = False
+                while index < len(elements) and self._element_position(elements[index]) == position:
+                    if self._element_key(elements[index]) == key:
+                        duplicate = True
+                        break
+                    index += 1
+                if not duplicate:
+                    elements.insert(index, element)
+                    
+        # Zero-width MISSING nodes sit on range boundaries, so they are
+        # collected again by the walk, which skips error-free subtrees
+        if root.has_error:
+            result.missing_nodes = self.find_missing_nodes(root)
+        return result
+        
+    def _collect_matches(self, extraction: ExtractionQuery, root: Node, result: ExtractionResult,
+                         byte_range: Optional[Tuple[int, int]] = None) -> None:
+        """Run an extraction query and add its matches to a result.
+        
+        ``disable_pattern`` indices number the patterns of the queries they
+        were taken from, not of the combined query, so they are not applied.
+        """
+        seen_functions = {function['function.def'] for function in result.functions}
+        for pattern_index, captures in run_matches(extraction.query, root, byte_range):
+            kind = extraction.pattern_kinds[pattern_index]
+            nodes = {name: _first_node(value) for name, value in captures.items()}
+            if kind == 'error':
+                result.error_nodes.append(nodes['error'])
+            elif kind == 'missing':
+                result.missing_nodes.append(nodes['missing'])
+            elif kind == 'function':
+                function = self._function_info(nodes)
+                if function is not None and function['function.def'] not in seen_functions:
+                    seen_functions.add(function['function.def'])
+                    result.functions.append(function)
+            elif kind == 'class':
+                result.classes.append(nodes)
+            else:
+                result.imports.append(nodes)
+                
+    @staticmethod
+    def _element_key(element: Any) -> Any:
+        """Identify an extracted element by its captured nodes."""
+        if isinstance(element, Node):
+            return element
+        return tuple((name, node) for name, node in element.items() if isinstance(node, Node))
+        
+    @staticmethod
+    def _element_position(element: Any) -> Tuple[int, int]:
+        """Sort key putting extracted elements in document order."""
+        nodes = [element] if isinstance(element, Node) else [
+            node for node in element.values() if isinstance(node, Node)]
+        if not nodes:
+            return (0, 0)
+        return (min(node.start_byte for node in nodes), -max(node.end_byte for node in nodes))
+        
+    @staticmethod
+    def _function_info(nodes: Dict[str, Node]) -> Optional[Dict[str, Any]]:
+        """Build a ``find_functions``-style entry from a function match."""
+        func_node = nodes.get('function.def') or nodes.get('function')
+        if func_node is None:
+            return None
+        name_node = nodes.get('function.name') or func_node.child_by_field_name('name')
+        return {
+            'function.def': func_node,
+            'function.name': name_node,
+            'name': name_node.text.decode('utf8') if name_node is not None else None,
+            'is_named': name_node is not None,
+            'start_point': func_node.start_point,
+            'end_point': func_node.end_point,
+            'type': func_node.type
+        }
+
     def find_classes(self, node: Node, language: Optional[str] = None) -> List[Dict[str, Node]]:
         """Find class definitions with their components."""
         return self.find_nodes(node, "class", language)
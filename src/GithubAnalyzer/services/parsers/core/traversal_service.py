@@ -14,7 +14,8 @@ from GithubAnalyzer.models.core.traversal import (NodeContext, NodeRange,
                                                   TraversalResult,
                                                   TreeSitterTraversal)
 from GithubAnalyzer.models.core.tree_sitter_core import (
-    get_node_text, get_node_type, get_node_range, is_valid_node, node_to_dict
+    find_missing_nodes, get_node_text, get_node_type, get_node_range,
+    is_valid_node, iter_error_nodes, node_to_dict
 )
 from GithubAnalyzer.utils.logging import get_logger
 
@@ -243,20 +244,6 @@ class TraversalService:
                 return parent
         return None
 
-    def find_error_nodes(self, node: Node) -> List[Node]:
-        """Find all error nodes in the tree."""
-        return self._traversal.find_nodes(
-            node,
-            lambda n: n.has_error or n.type == "ERROR"
-        )
-
-    def find_missing_nodes(self, node: Node) -> List[Node]:
-        """Find all missing nodes in the tree."""
-        return self._traversal.find_nodes(
-            node,
-            lambda n: n.is_missing
-        )
-
     @staticmethod
     def walk_tree(node: Node) -> Generator[Node, None, None]:
         """Walk a tree using tree-sitter's native cursor API."""
@@ -339,34 +326,13 @@ class TraversalService:
         if not node:
             return False
             
-        # Check for errors in node and its children
-        for n in self.walk_tree(node):
-            if self.has_errors(n):
-                return False
-        return True
+        # has_error covers the node's descendants as well
+        return not self.has_errors(node)
 
     def find_error_nodes(self, node: Node) -> List[Node]:
-        """Find all error nodes in the tree."""
-        error_nodes = []
-        
-        def check_node(n: Node):
-            if n.has_error or n.type == "ERROR":
-                error_nodes.append(n)
-            for child in n.children:
-                check_node(child)
-                
-        check_node(node)
-        return error_nodes
+        """Find all error nodes in the tree, skipping error-free subtrees."""
+        return list(iter_error_nodes(node))
 
     def find_missing_nodes(self, node: Node) -> List[Node]:
-        """Find all missing nodes in the tree."""
-        missing_nodes = []
-        
-        def check_node(n: Node):
-            if n.is_missing:
-                missing_nodes.append(n)
-            for child in n.children:
-                check_node(child)
-                
-        check_node(node)
-        return missing_nodes 
\ No newline at end of file
+        """Find all missing nodes in the tree, skipping error-free subtrees."""
+        return find_missing_nodes(node) 
\ No newline at end of file
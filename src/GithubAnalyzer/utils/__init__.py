@@ -2,6 +2,10 @@
 
 # Database utilities
 from .db.cleanup import DatabaseCleaner
+# Hashing utilities
+from .hashing import content_hash, git_blob_hash
+# Path matching utilities
+from .path_matcher import PathFilter, PathMatcher
 # Logging utilities
 from .logging.config import configure_logging
 from .logging.tree_sitter_logging import get_tree_sitter_logger
@@ -17,6 +21,14 @@ __all__ = [
     # Database utils
     'DatabaseCleaner',
     
+    # Hashing utils
+    'content_hash',
+    'git_blob_hash',
+    
+    # Path matching utils
+    'PathFilter',
+    'PathMatcher',
+    
     # Logging utils
     'configure_logging',
     'get_tree_sitter_logger',
@@ -0,0 +1,42 @@
+"""Content hashing utilities used for change detection.
+
+Stored files are compared by ``git_blob_hash`` of their raw bytes, which is
+the SHA git already records for every blob. Files listed from the git
+object database therefore need no hashing at all, and files read from a
+working tree hash to the same value, so switching between the two listing
+modes never re-processes a file. ``content_hash`` is a faster, shorter
+digest for caches that are keyed by content but never compared with git.
+"""
+import hashlib
+from typing import Union
+
+# 16-byte BLAKE2b digests (32 hex characters) are plenty for change detection
+CONTENT_HASH_DIGEST_SIZE = 16
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """Compute a stable hash of file content.
+
+    Args:
+        content: File content as text (encoded as UTF-8) or raw bytes
+
+    Returns:
+        Hex digest of the content
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=CONTENT_HASH_DIGEST_SIZE).hexdigest()
+
+
+def git_blob_hash(data: bytes) -> str:
+    """Compute the git blob SHA of raw file bytes.
+
+    Args:
+        data: File content exactly as stored, before any decoding or
+            line ending normalization
+
+    Returns:
+        Hex SHA-1, as printed by ``git hash-object``
+    """
+    header = b'blob %d\0' % len(data)
+    return hashlib.sha1(header + data).hexdigest()
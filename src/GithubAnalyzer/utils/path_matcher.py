@@ -0,0 +1,275 @@
+"""Compiled .gitignore-style path matching.
+
+Patterns follow ``.gitignore`` rules: ``*``, ``?`` and ``[...]`` never
+match ``/``, ``**`` matches across directories, a leading ``!`` negates, a
+trailing ``/`` only matches directories, and patterns containing a slash
+are anchored to the matcher's root while others match at any depth. The
+last matching pattern wins.
+
+Patterns are compiled once into at most two regular expressions - one for
+patterns that only look at the file name, one for patterns anchored to the
+root - plus a dictionary for plain names. Regex alternatives are ordered
+from the last pattern to the first and each is wrapped in a named group,
+so one ``fullmatch`` call finds the winning pattern through
+``Match.lastgroup``; the highest pattern index across the three lookups
+wins.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+
+# Characters that make a pattern more than a plain name
+_GLOB_CHARS = frozenset('*?[\\')
+
+
+def _translate(pattern: str) -> Optional[Tuple[str, bool, bool, Optional[str]]]:
+    """Translate a gitignore pattern into a regular expression.
+
+    Args:
+        pattern: A single line of a gitignore file
+
+    Returns:
+        Tuple of (regex, negated, directory_only, basename), or None for
+        blank lines and comments. ``basename`` is set for patterns without
+        a slash, which match file names at any depth; their regex matches
+        the name alone.
+    """
+    if not pattern or pattern.startswith('#'):
+        return None
+    negated = pattern.startswith('!')
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith(('\\!', '\\#')):
+        pattern = pattern[1:]
+
+    # Trailing spaces are ignored unless escaped
+    stripped = pattern.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(pattern):
+        stripped += ' '
+    pattern = stripped
+
+    directory_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    if not pattern:
+        return None
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    basename = None if anchored else pattern
+
+    parts: List[str] = []
+    i = 0
+    if pattern.startswith('**/'):
+        parts.append('(?:.*/)?')
+        i = 3
+    while i < len(pattern):
+        if pattern.startswith('/**/', i):
+            parts.append('/(?:.*/)?')
+            i += 4
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            parts.append('/.*')
+            i += 3
+        elif pattern[i] == '*':
+            # Other runs of asterisks behave like a single one
+            while i < len(pattern) and pattern[i] == '*':
+                i += 1
+            parts.append('[^/]*')
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape('['))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            parts.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+
+    return ''.join(parts), negated, directory_only, basename
+
+
+class PathMatcher:
+    """A list of gitignore-style patterns compiled for fast matching.
+
+    Paths are given relative to the matcher's root with ``/`` separators.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile the patterns.
+
+        Args:
+            patterns: Gitignore-style patterns, in file order
+        """
+        self.patterns: List[str] = []
+        self._negated: List[bool] = []
+        # Per kind of path (file, directory): plain names, name regex
+        # alternatives and path regex alternatives
+        names: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+        name_alternatives: Tuple[List[str], List[str]] = ([], [])
+        path_alternatives: Tuple[List[str], List[str]] = ([], [])
+        for pattern in patterns:
+            translated = _translate(pattern)
+            if translated is None:
+                continue
+            regex, negated, directory_only, basename = translated
+            index = len(self.patterns)
+            self.patterns.append(pattern)
+            self._negated.append(negated)
+            kinds = (1,) if directory_only else (0, 1)
+            for kind in kinds:
+                if basename is not None and not _GLOB_CHARS.intersection(basename):
+                    names[kind][basename] = index
+                elif basename is not None:
+                    name_alternatives[kind].append(f'(?P<p{index}>{regex})')
+                else:
+                    path_alternatives[kind].append(f'(?P<p{index}>{regex})')
+
+        self._names = names
+        self._name_regex = tuple(self._compile(alternatives) for alternatives in name_alternatives)
+        self._path_regex = tuple(self._compile(alternatives) for alternatives in path_alternatives)
+
+    @staticmethod
+    def _compile(alternatives: List[str]) -> Optional[Pattern]:
+        """Join alternatives so the last pattern is tried first."""
+        if not alternatives:
+            return None
+        return re.compile('|'.join(reversed(alternatives)), re.DOTALL)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, path: str, is_dir: bool = False) -> Optional[bool]:
+        """Match a single path against the patterns, ignoring its parents.
+
+        Args:
+            path: Relative path with ``/`` separators
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the last matching pattern is a plain pattern, False if
+            it is a negation, None if no pattern matches
+        """
+        kind = 1 if is_dir else 0
+        name = path.rpartition('/')[2]
+        winner = self._names[kind].get(name, -1)
+        for regex, subject in ((self._name_regex[kind], name), (self._path_regex[kind], path)):
+            if regex is not None:
+                found = regex.fullmatch(subject)
+                if found is not None:
+                    winner = max(winner, int(found.lastgroup[1:]))
+        if winner < 0:
+            return None
+        return not self._negated[winner]
+
+    def is_matched(self, path: str, is_dir: bool = False, check_parents: bool = True) -> bool:
+        """Check whether a path is matched, as git decides if it is ignored.
+
+        A path inside a matched directory is matched too, and cannot be
+        re-included by a negated pattern.
+
+        Args:
+            path: Relative path with ``/`` separators
+            is_dir: Whether the path is a directory
+            check_parents: Also check the path's parent directories. Walkers
+                that already pruned matched directories can skip this.
+
+        Returns:
+            True if the path is matched
+        """
+        if check_parents:
+            parts = path.split('/')
+            for end in range(1, len(parts)):
+                if self.match('/'.join(parts[:end]), is_dir=True):
+                    return True
+        return bool(self.match(path, is_dir))
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Sequence[str]) -> PathMatcher:
+    """Get a compiled matcher for a tuple of patterns, reusing earlier ones.
+
+    Args:
+        patterns: Tuple of gitignore-style patterns
+
+    Returns:
+        Compiled PathMatcher
+    """
+    return PathMatcher(patterns)
+
+
+class PathFilter:
+    """Include and exclude patterns answered in a single call.
+
+    Attributes:
+        include: Matcher for files to keep; empty keeps everything
+        exclude: Matcher for files and directories to drop
+        exclude_hidden: Also drop dot files no pattern explicitly matches
+    """
+
+    def __init__(self, include: Sequence[str] = (), exclude: Sequence[str] = (),
+                 exclude_hidden: bool = False):
+        """Compile the filter.
+
+        Args:
+            include: Gitignore-style patterns of files to keep
+            exclude: Gitignore-style patterns of files and directories to drop
+            exclude_hidden: Also drop dot files no pattern explicitly matches
+        """
+        self.include = compile_patterns(tuple(include))
+        self.exclude = compile_patterns(tuple(exclude))
+        self.exclude_hidden = exclude_hidden
+        # Parent directories are shared by many files, so their verdicts
+        # are remembered
+        self._excluded_parents: Dict[str, bool] = {}
+
+    def is_dir_excluded(self, path: str) -> bool:
+        """Check whether a directory should be pruned from a walk.
+
+        Args:
+            path: Directory path relative to the root, with ``/`` separators
+        """
+        return bool(self.exclude.match(path, is_dir=True))
+
+    def matches(self, path: str, check_parents: bool = True) -> bool:
+        """Check whether a file passes the filter.
+
+        Args:
+            path: File path relative to the root, with ``/`` separators
+            check_parents: Also apply directory excludes to the file's
+                parents; walkers that pruned directories can skip this
+
+        Returns:
+            True if the file should be kept
+        """
+        if check_parents:
+            parent = path.rpartition('/')[0]
+            if parent and self._is_parent_excluded(parent):
+                return False
+        excluded = self.exclude.match(path)
+        if excluded:
+            return False
+        if excluded is None and self.exclude_hidden and path.rsplit('/', 1)[-1].startswith('.'):
+            return False
+        if self.include:
+            return self.include.is_matched(path)
+        return True
+
+    def _is_parent_excluded(self, directory: str) -> bool:
+        """Check whether a directory or any of its parents is excluded."""
+        excluded = self._excluded_parents.get(directory)
+        if excluded is None:
+            parent = directory.rpartition('/')[0]
+            excluded = ((bool(parent) and self._is_parent_excluded(parent))
+                        or bool(self.exclude.match(directory, is_dir=True)))
+            self._excluded_parents[directory] = excluded
+        return excluded
@@ -0,0 +1,55 @@
+"""Tests for the compact columnar AST encoding."""
+import json
+
+import pytest
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.models.core.compact_ast import (FLAG_MISSING, FLAG_NAMED,
+                                                    CompactAST)
+from GithubAnalyzer.models.core.errors import ParserError
+
+CODE = b"def greet(name):\n    return helper(name)\n\ndef helper(value):\n    return value\n"
+
+
+def _pre_order(node):
+    nodes = [node]
+    for child in node.children:
+        nodes.extend(_pre_order(child))
+    return nodes
+
+
+def test_round_trip_preserves_structure_and_slices_text():
+    """A stored tree decodes to the same nodes, with text sliced from the source."""
+    root = get_parser("python").parse(CODE).root_node
+    ast_data = json.loads(json.dumps(CompactAST.from_node(root).to_ast_data()))
+    ast = CompactAST.from_ast_data(ast_data, CODE)
+    nodes = _pre_order(root)
+
+    assert len(ast) == len(nodes) == ast_data["node_count"]
+    for index, node in enumerate(nodes):
+        assert ast.type_of(index) == node.type
+        assert ast.byte_range(index) == (node.start_byte, node.end_byte)
+        assert ast.start_point(index) == tuple(node.start_point)
+        assert ast.end_point(index) == tuple(node.end_point)
+        assert ast.has_flag(index, FLAG_NAMED) == node.is_named
+        assert [nodes[child].id for child in ast.children(index)] == [child.id for child in node.children]
+
+    function = ast.find("function_definition")[0]
+    assert ast.text(function) == "def greet(name):\n    return helper(name)"
+    assert [ast.text(i) for i in ast.descendants(function) if ast.type_of(i) == "call"] == ["helper(name)"]
+
+
+def test_missing_nodes_are_flagged():
+    """Nodes inserted by error recovery keep their MISSING flag."""
+    source = b"def f(:\n    pass\n"
+    ast = CompactAST.from_node(get_parser("python").parse(source).root_node, source)
+
+    missing = [ast.node_dict(i) for i in range(len(ast)) if ast.has_flag(i, FLAG_MISSING)]
+    assert [node["type"] for node in missing] == [")"]
+
+
+def test_invalid_data_is_rejected():
+    """Corrupt blobs raise ParserError; other AST data is not a compact tree."""
+    with pytest.raises(ParserError):
+        CompactAST.from_bytes(b"not a compact ast")
+    assert CompactAST.from_ast_data({"type": "module", "children": []}) is None
@@ -0,0 +1,77 @@
+"""Tests for incremental edit sessions."""
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.services.analysis.parsers.edit_session import (EditSession,
+                                                                   TextEdit)
+from GithubAnalyzer.services.parsers.core.query_handler import \
+    TreeSitterQueryHandler
+
+CODE = "def first():\n    return 1\n\n\ndef second():\n    return 2\n"
+
+
+def _sexp(node):
+    return (node.type, node.start_byte, node.end_byte, node.start_point, node.end_point,
+            [_sexp(child) for child in node.children])
+
+
+def test_incremental_reparse_matches_full_parse():
+    """Edited trees equal a fresh parse of the edited text."""
+    parser = get_parser("python")
+    session = EditSession.start(parser, CODE)
+    start = CODE.index("return 2")
+
+    session.apply_edits([
+        TextEdit(start, start + len("return 2"), "value = 'é'\n    return value"),
+        TextEdit(CODE.index("first"), CODE.index("first") + len("first"), "renamed"),
+    ])
+
+    expected = CODE.replace("return 2", "value = 'é'\n    return value").replace("first", "renamed")
+    assert session.text == expected
+    assert _sexp(session.tree.root_node) == _sexp(parser.parse(expected.encode("utf-8")).root_node)
+
+
+def test_changed_ranges_cover_only_the_edit():
+    """Changed ranges are limited to the edited function."""
+    session = EditSession.start(get_parser("python"), CODE)
+    start = CODE.index("return 2")
+
+    session.replace(start, start + len("return 2"), "pass")
+
+    second = session.tree.root_node.children[1]
+    assert session.previous_tree is not None
+    assert session.changed_ranges
+    assert all(r.start_byte >= second.start_byte for r in session.changed_ranges)
+
+
+def test_session_from_tree_keeps_leading_whitespace():
+    """Edits on a session started from a tree land at the source's offsets."""
+    parser = get_parser("python")
+    code = "\n\n# c\nx = 1\n"
+    session = EditSession.from_tree(parser, parser.parse(code.encode("utf-8")), code)
+
+    session.replace(code.index("1"), code.index("1") + 1, "2")
+
+    assert session.text == "\n\n# c\nx = 2\n"
+    assert _sexp(session.tree.root_node) == _sexp(parser.parse(session.source).root_node)
+
+
+def _spans(extraction):
+    return {
+        kind: sorted((n.type, n.start_byte, n.end_byte) for element in getattr(extraction, kind)
+                     for n in ([element] if hasattr(element, "start_byte") else element.values())
+                     if hasattr(n, "start_byte"))
+        for kind in ("functions", "classes", "imports", "error_nodes", "missing_nodes")
+    }
+
+
+def test_incremental_extraction_matches_full_extraction():
+    """Re-querying only the affected ranges gives the same elements as a full pass."""
+    handler = TreeSitterQueryHandler()
+    session = EditSession.start(get_parser("python"), CODE * 3)
+    extraction = handler.extract(session.tree, "python")
+
+    for start, end, text in ((0, 3, "async def"), (20, 20, "\nclass B:\n    pass\n"), (5, 9, "(")):
+        session.replace(start, end, text)
+        extraction = handler.extract_changes(
+            extraction, session.tree, session.affected_ranges(), session.map_byte, "python")
+        assert _spans(extraction) == _spans(handler.extract(session.tree, "python"))
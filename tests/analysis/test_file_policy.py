@@ -0,0 +1,42 @@
+"""Tests for the size-tiered file policy."""
+import base64
+import os
+from pathlib import Path
+
+from GithubAnalyzer.models.core.file import FileInfo
+from GithubAnalyzer.services.core.file_policy import (TIER_FULL,
+                                                      TIER_METADATA_ONLY,
+                                                      TIER_PARSE_ONLY,
+                                                      TIER_SKIP, FilePolicy,
+                                                      byte_entropy)
+
+CODE = b"def f(x):\n    return x + 1\n\n" * 100
+
+
+def _classify(policy, name, data):
+    return policy.classify(FileInfo(path=Path(name)), data)
+
+
+def test_size_tiers():
+    """Size alone places files in every tier."""
+    policy = FilePolicy(skip_bytes=10_000, metadata_only_bytes=5_000, parse_only_bytes=2_000)
+
+    assert _classify(policy, "a.py", CODE[:1_000]).tier == TIER_FULL
+    assert _classify(policy, "a.py", CODE).tier == TIER_PARSE_ONLY
+    assert _classify(policy, "a.py", CODE * 2).tier == TIER_METADATA_ONLY
+    assert policy.classify_size(20_000).tier == TIER_SKIP
+    assert policy.classify_size(1_000) is None
+
+
+def test_minified_encoded_and_generated_files():
+    """Heuristics demote minified, encoded and generated files."""
+    policy = FilePolicy()
+    minified = b"var a=1;" * 2_000
+    encoded = base64.encodebytes(os.urandom(6_000))
+
+    assert _classify(policy, "app.js", minified).reason == "minified"
+    assert _classify(policy, "vendor.min.js", b"var a;\n").tier == TIER_METADATA_ONLY
+    assert _classify(policy, "blob.txt", encoded).reason == "encoded"
+    assert _classify(policy, "api_pb2.py", CODE).tier == TIER_PARSE_ONLY
+    assert _classify(policy, "gen.go", b"// Code generated by protoc. DO NOT EDIT.\n" + CODE).reason == "generated"
+    assert byte_entropy(CODE) < 5.0
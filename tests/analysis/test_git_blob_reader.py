@@ -0,0 +1,95 @@
+"""Tests for reading repository content from the git object database."""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from GithubAnalyzer.models.core.errors import FileError
+from GithubAnalyzer.services.core.git_blob_reader import GitBlobReader
+
+MAIN = b"def main():\n    return 1\n"
+INNER = b"VALUE = 2\n"
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A committed repository with a nested file, a symlink and a submodule."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    _git(repo, "init", "-q")
+    (repo / "main.py").write_bytes(MAIN)
+    (repo / "pkg" / "inner.py").write_bytes(INNER)
+    os.symlink("main.py", repo / "link.py")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    # A gitlink entry, as a submodule adds to the tree
+    _git(repo, "update-index", "--add", "--cacheinfo",
+         f"160000,{_git(repo, 'rev-parse', 'HEAD')},sub")
+    _git(repo, "commit", "-q", "-m", "add submodule")
+    # Uncommitted edits are not part of the tree
+    (repo / "main.py").write_bytes(b"changed\n")
+    return repo
+
+
+def test_tree_lists_blobs_with_sizes(repo):
+    """Regular files and symlinks are listed with their blob SHA and size; submodules are not."""
+    with GitBlobReader(repo_path=repo) as reader:
+        entries = {entry.path: entry for entry in reader.iter_tree()}
+
+    assert sorted(entries) == ["link.py", "main.py", "pkg/inner.py"]
+    assert entries["main.py"].blob_sha == _git(repo, "rev-parse", "HEAD:main.py")
+    assert entries["main.py"].size == len(MAIN) and entries["main.py"].mode == "100644"
+    assert entries["link.py"].mode == "120000"
+    assert not any(entry.missing for entry in entries.values())
+
+
+def test_tree_listing_can_be_restricted_to_paths(repo):
+    """Only blobs under the given paths are listed."""
+    with GitBlobReader(repo_path=repo) as reader:
+        assert [entry.path for entry in reader.iter_tree(["pkg"])] == ["pkg/inner.py"]
+
+
+def test_blobs_are_read_by_sha(repo):
+    """Blobs hold the committed content, read through one long-lived process."""
+    with GitBlobReader(repo_path=repo) as reader:
+        entries = {entry.path: entry for entry in reader.iter_tree()}
+        assert reader.read_blob(entries["main.py"].blob_sha) == MAIN
+        process = reader._process
+        assert reader.read_blob(entries["pkg/inner.py"].blob_sha) == INNER
+        assert reader.read_blob(entries["link.py"].blob_sha) == b"main.py"
+        assert reader._process is process
+    assert reader._process is None
+
+
+def test_missing_blob_raises_and_reader_stays_usable(repo):
+    """An unknown SHA raises FileError without breaking later reads."""
+    sha = _git(repo, "rev-parse", "HEAD:pkg/inner.py")
+    with GitBlobReader(repo_path=repo) as reader:
+        with pytest.raises(FileError):
+            reader.read_blob("0" * 40)
+        assert reader.read_blob(sha) == INNER
+
+
+def test_bare_clone_is_read_without_a_work_tree(repo, tmp_path):
+    """A bare clone lists and reads the same blobs as its source."""
+    bare = tmp_path / "bare.git"
+    _git(tmp_path, "clone", "-q", "--bare", str(repo), str(bare))
+
+    with GitBlobReader(repo_path=bare) as reader:
+        entries = {entry.path: entry for entry in reader.iter_tree()}
+        assert reader.read_blob(entries["pkg/inner.py"].blob_sha) == INNER
+    assert sorted(entries) == ["link.py", "main.py", "pkg/inner.py"]
+
+
+def test_unknown_commit_raises(repo):
+    """Listing a commit that does not exist raises FileError."""
+    with GitBlobReader(repo_path=repo, commit="no-such-branch") as reader:
+        with pytest.raises(FileError):
+            list(reader.iter_tree())
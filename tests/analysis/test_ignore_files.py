@@ -0,0 +1,29 @@
+"""Tests for honouring ignore files during repository discovery."""
+from pathlib import Path
+
+from GithubAnalyzer.services.core.file_service import FileService
+from GithubAnalyzer.utils.path_matcher import PathFilter
+
+
+def _write(root: Path, name: str, content: str = "x = 1\n") -> None:
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_nested_ignore_files_prune_discovery(tmp_path):
+    """Deeper ignore files override shallower ones and ignored trees are skipped."""
+    _write(tmp_path, ".gitignore", "*.log\ndist/\n!keep.log\n")
+    _write(tmp_path, "pkg/.dockerignore", "generated.py\n")
+    _write(tmp_path, "pkg/sub/.gitignore", "!*.log\n")
+    for name in ("main.py", "debug.log", "keep.log", "dist/bundle.py",
+                 "pkg/generated.py", "pkg/mod.py", "pkg/sub/generated.py", "pkg/sub/trace.log"):
+        _write(tmp_path, name)
+
+    found = {
+        path.relative_to(tmp_path).as_posix()
+        for path, _, _ in FileService()._walk_files(tmp_path, PathFilter(), use_ignore_files=True)
+    }
+    assert {"main.py", "keep.log", "pkg/mod.py", "pkg/sub/trace.log"} <= found
+    assert not {"debug.log", "dist/bundle.py", "pkg/generated.py", "pkg/sub/generated.py"} & found
+
@@ -0,0 +1,131 @@
+"""Tests for incremental processing of repositories between commits."""
+import subprocess
+from pathlib import Path
+from unittest.mock import call, patch
+
+import pytest
+
+from GithubAnalyzer.services.core.file_service import FileService
+from GithubAnalyzer.services.core.repo_processor import RepoProcessor
+
+MOVED = "def moved(value):\n    total = value * 2\n    return total + 1\n"
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def history(tmp_path):
+    """A repository whose second commit adds, modifies, deletes and renames a file."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    (repo / "keep.py").write_text("def keep():\n    return 0\n")
+    (repo / "change.py").write_text("def change():\n    return 1\n")
+    (repo / "remove.py").write_text("def remove():\n    return 2\n")
+    (repo / "move.py").write_text(MOVED)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    base = _git(repo, "rev-parse", "HEAD")
+
+    (repo / "new.py").write_text("def new():\n    return 3\n")
+    (repo / "change.py").write_text("def change():\n    return 10\n")
+    _git(repo, "rm", "-q", "remove.py")
+    _git(repo, "mv", "move.py", "moved.py")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "head")
+    return repo, base, _git(repo, "rev-parse", "HEAD")
+
+
+def test_changed_files_between_commits(history):
+    """Added, modified, deleted and renamed files are told apart."""
+    repo, base, head = history
+
+    changes = FileService().get_changed_files(repo, base, head)
+
+    assert changes.added == ["new.py"]
+    assert changes.modified == ["change.py"]
+    assert changes.deleted == ["remove.py"]
+    assert changes.renamed == [("move.py", "moved.py")]
+    assert sorted(changes.changed_paths) == ["change.py", "moved.py", "new.py"]
+    assert sorted(changes.removed_paths) == ["move.py", "remove.py"]
+
+
+def test_changed_files_are_relative_to_a_subdirectory(history):
+    """Diffs from a subdirectory only list files beneath it, relative to it."""
+    repo, _, _ = history
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "inner.py").write_text(MOVED)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "add inner")
+    base = _git(repo, "rev-parse", "HEAD")
+    _git(repo, "mv", "pkg/inner.py", "pkg/renamed.py")
+    (repo / "top.py").write_text("X = 1\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "rename inner")
+
+    changes = FileService().get_changed_files(repo / "pkg", base, "HEAD")
+
+    assert changes.renamed == [("inner.py", "renamed.py")]
+    assert not changes.added and not changes.modified and not changes.deleted
+
+
+def test_unknown_base_commit_gives_no_changes(history):
+    """A base commit missing from the clone makes the caller fall back to a full run."""
+    repo, _, head = history
+
+    assert FileService().get_changed_files(repo, "0" * 40, head) is None
+
+
+def test_incremental_run_processes_only_changed_files(history):
+    """Only changed files are re-processed; deleted and renamed-away files are removed."""
+    repo, base, head = history
+    stored = []
+
+    def store(snippet, embedding=None, skip_embedding=False):
+        stored.append(snippet.file_path)
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService") as neo4j_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService") as embed_cls:
+        pg = pg_cls.return_value
+        pg.get_last_analyzed_commit.return_value = base
+        pg.get_file_hashes.return_value = {
+            path: "stale" for path in ("keep.py", "change.py", "remove.py", "move.py")}
+        pg.store_code_with_embedding.side_effect = store
+        embed_cls.return_value.get_embeddings.side_effect = lambda texts: [[0.0]] * len(texts)
+        processor = RepoProcessor()
+
+        assert processor._process_checkout("url", 1, repo, 0.0, 1, True, None)
+
+    assert sorted(stored) == ["change.py", "moved.py", "new.py"]
+    assert processor.last_stats.total_files == 3
+    neo4j_cls.return_value.delete_file_nodes.assert_has_calls(
+        [call(1, "remove.py"), call(1, "move.py")], any_order=True)
+    assert neo4j_cls.return_value.delete_file_nodes.call_count == 2
+    deleted = [c.args[0] for c in pg.delete_file_snippets.call_args_list]
+    assert sorted(deleted) == ["change.py", "move.py", "remove.py"]
+    pg.update_last_analyzed_commit.assert_called_once_with(1, head)
+
+
+def test_incremental_run_at_the_analyzed_commit_does_nothing(history):
+    """A run at the last analyzed commit neither processes nor removes files."""
+    repo, _, head = history
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService") as neo4j_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService"):
+        pg = pg_cls.return_value
+        pg.get_last_analyzed_commit.return_value = head
+        pg.get_file_hashes.return_value = {}
+        processor = RepoProcessor()
+
+        assert processor._process_checkout("url", 1, repo, 0.0, 1, True, None)
+
+    assert processor.last_stats.total_files == 0
+    pg.store_code_with_embedding.assert_not_called()
+    pg.delete_file_snippets.assert_not_called()
+    neo4j_cls.return_value.delete_file_nodes.assert_not_called()
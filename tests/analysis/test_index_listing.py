@@ -0,0 +1,92 @@
+"""Tests for listing working tree files from the git index."""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from GithubAnalyzer.services.core.file_service import FileService
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A work tree with clean, modified, deleted, untracked, ignored, symlinked,
+    sparse and submodule entries."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    _git(repo, "init", "-q")
+    (repo / ".gitignore").write_text("*.log\n")
+    for name in ("clean.py", "modified.py", "deleted.py", "sparse.py", "pkg/inner.py"):
+        (repo / name).write_text(f"NAME = {name!r}\n")
+    os.symlink("clean.py", repo / "link.py")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    _git(repo, "update-index", "--add", "--cacheinfo",
+         f"160000,{_git(repo, 'rev-parse', 'HEAD')},sub")
+    _git(repo, "update-index", "--skip-worktree", "sparse.py")
+
+    (repo / "modified.py").write_text("NAME = 'changed'\n")
+    (repo / "deleted.py").unlink()
+    (repo / "untracked.py").write_text("NEW = 1\n")
+    (repo / "pkg" / "new.py").write_text("NEW = 2\n")
+    (repo / "debug.log").write_text("ignored\n")
+    return repo
+
+
+def _listed(root: Path):
+    files = FileService().iter_index_files(root)
+    assert files is not None
+    return {Path(os.path.relpath(info.path, root)).as_posix(): info for info in files}
+
+
+def test_index_lists_every_kind_of_entry(repo):
+    """Clean files come from the index; modified, untracked and symlinked ones from disk."""
+    listed = _listed(repo)
+
+    assert {"clean.py", "modified.py", "link.py", "untracked.py",
+            "pkg/inner.py", "pkg/new.py"} <= set(listed)
+    assert not {"deleted.py", "sparse.py", "sub", "debug.log"} & set(listed)
+
+    clean = listed["clean.py"].metadata
+    assert clean["blob_sha"] == _git(repo, "rev-parse", "HEAD:clean.py")
+    assert clean["size"] == (repo / "clean.py").stat().st_size
+    assert clean["mode"] == "100644"
+    for path in ("modified.py", "link.py", "untracked.py"):
+        assert "blob_sha" not in listed[path].metadata
+    assert listed["modified.py"].metadata["size"] == len("NAME = 'changed'\n")
+    assert listed["clean.py"].language == "python"
+
+
+def test_index_listing_of_a_subdirectory(repo):
+    """Listing from a subdirectory only yields the files beneath it."""
+    listed = _listed(repo / "pkg")
+
+    assert set(listed) == {"inner.py", "new.py"}
+    assert listed["inner.py"].path == repo / "pkg" / "inner.py"
+    assert listed["inner.py"].metadata["blob_sha"] == _git(repo, "rev-parse", "HEAD:pkg/inner.py")
+
+
+def test_index_listing_outside_a_work_tree(tmp_path, repo):
+    """Plain directories and bare repositories fall back to walking."""
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    bare = tmp_path / "bare.git"
+    _git(tmp_path, "clone", "-q", "--bare", str(repo), str(bare))
+
+    assert FileService().iter_index_files(plain) is None
+    assert FileService().iter_index_files(bare) is None
+
+
+def test_repository_files_use_the_index(repo):
+    """Repository listing goes through the index when enabled, and walks otherwise."""
+    indexed = {info.path for info in FileService().iter_repository_files(repo)}
+    walked = {info.path for info in FileService(use_git_index=False).iter_repository_files(repo)}
+
+    assert repo / "clean.py" in indexed and repo / "clean.py" in walked
+    assert repo / "sparse.py" not in indexed and repo / "sparse.py" in walked
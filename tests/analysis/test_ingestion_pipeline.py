@@ -0,0 +1,90 @@
+"""Tests for the streaming ingestion pipeline."""
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from GithubAnalyzer.models.core.file import FileContent, FileInfo
+from GithubAnalyzer.models.core.repository import ProcessingStats
+from GithubAnalyzer.services.core import ingestion_pipeline
+from GithubAnalyzer.services.core.file_processor import (STATUS_SKIPPED,
+                                                         FileProcessingResult)
+from GithubAnalyzer.services.core.ingestion_pipeline import IngestionPipeline
+
+
+def _no_init(*args):
+    pass
+
+
+def _crash_on_bad_file(file_info, content=None):
+    if file_info.path.name == "crash.py":
+        # Simulates a worker killed by a crash inside a parser
+        os._exit(1)
+    return FileProcessingResult(file_path=str(file_info.path), status=STATUS_SKIPPED, reason="test")
+
+
+def test_dead_worker_fails_its_file_and_run_completes(tmp_path, monkeypatch):
+    """A worker dying mid-file does not hang the pipeline."""
+    monkeypatch.setattr(ingestion_pipeline, "init_worker", _no_init)
+    monkeypatch.setattr(ingestion_pipeline, "process_file_in_worker", _crash_on_bad_file)
+    names = ["crash.py"] + [f"file_{i}.py" for i in range(8)]
+    files = [FileInfo(path=Path(tmp_path / name), language="python") for name in names]
+
+    file_processor = MagicMock()
+    file_processor.parser_service.parse_cache = None
+    file_processor.parser_service.parse_timeout_ms = None
+    file_processor.parser_service.max_parse_bytes = None
+    file_processor.read_file.side_effect = lambda info: (FileContent.from_bytes(info.path, b"x = 1\n"), None)
+    pipeline = IngestionPipeline(
+        file_processor=file_processor,
+        embedding_service=MagicMock(),
+        is_unchanged=lambda file_path, new_hash: False,
+        store=MagicMock(),
+        workers=2,
+        queue_size=2
+    )
+
+    stats = pipeline.run(files, ProcessingStats())
+
+    assert stats.total_files == len(files)
+    assert any(message.startswith(str(files[0].path)) for message in stats.error_messages)
+    assert stats.error_files + stats.skipped_files == len(files)
+
+
+def test_failed_discovery_is_recorded(tmp_path):
+    """A stage that stops early marks the run as failed instead of finishing quietly."""
+    def discover():
+        yield FileInfo(path=Path(tmp_path / "a.py"), language="python")
+        raise OSError("listing failed")
+
+    file_processor = MagicMock()
+    file_processor.read_file.side_effect = lambda info: (FileContent.from_bytes(info.path, b"x = 1\n"), None)
+    file_processor.process_file.return_value = None
+    pipeline = IngestionPipeline(
+        file_processor=file_processor,
+        embedding_service=MagicMock(),
+        is_unchanged=lambda file_path, new_hash: False,
+        store=MagicMock()
+    )
+
+    stats = pipeline.run(discover(), ProcessingStats())
+
+    assert stats.total_files == 1
+    assert stats.failed_stages == ["discover"]
+    assert stats.error_files == 0
+    assert any("listing failed" in message for message in stats.error_messages)
+
+    stats = pipeline.run([], ProcessingStats())
+    assert stats.failed_stages == []
+
+
+def test_per_file_stats_are_opt_in():
+    """Only run totals are kept unless per-file records are requested."""
+    stats = ProcessingStats()
+    for i in range(1000):
+        stats.record_file(f"file_{i}.py", "processed", bytes_read=10, read_ms=0.5)
+    assert stats.file_stats == {}
+    assert stats.bytes_read == 10_000 and stats.read_time_ms == 500.0
+
+    stats = ProcessingStats(record_file_stats=True)
+    stats.record_file("main.py", "processed", bytes_read=10, read_ms=0.5)
+    assert stats.file_stats == {"main.py": {"status": "processed", "bytes_read": 10, "read_ms": 0.5}}
@@ -0,0 +1,57 @@
+"""Tests for the content-addressed parse cache."""
+from GithubAnalyzer.models.core.ast import ParseSummary
+from GithubAnalyzer.models.core.compact_ast import CompactAST
+from GithubAnalyzer.services.core.parse_cache import ParseCache
+from GithubAnalyzer.services.core.parser_service import ParserService
+
+CODE = "import os\n\nclass Greeter:\n    def greet(self, name):\n        return name\n"
+
+
+def test_repeated_content_is_served_from_cache(tmp_path):
+    """The second parse of identical content is a cache hit with the same summary."""
+    cache = ParseCache(cache_dir=tmp_path)
+    service = ParserService(parse_cache=cache)
+
+    first = service.summarize_content(CODE, "python")
+    second = ParserService(parse_cache=ParseCache(cache_dir=tmp_path)).summarize_content(CODE, "python")
+
+    assert not first.from_cache and second.from_cache
+    assert [f["name"] for f in second.functions] == ["greet"]
+    assert [c["name"] for c in second.classes] == ["Greeter"]
+    assert second.ast == first.ast
+    ast = second.get_compact_ast(CODE.encode("utf-8"))
+    assert isinstance(ast, CompactAST) and ast.type_of(0) == "module"
+    assert cache.stats()["misses"] == 1
+
+    service.summarize_content(CODE + "\n", "python")
+    assert cache.stats()["stores"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Stores past the size limit evict the entries used longest ago."""
+    cache = ParseCache(cache_dir=tmp_path, max_bytes=1000)
+    summary = ParseSummary(language="python", ast=b"\0" * 100)
+
+    for key in ("a", "b", "c"):
+        cache.put(key, "python", "v1", summary)
+    assert cache.get("a", "python", "v1") is not None
+    cache.put("d", "python", "v1", summary)
+
+    assert cache.evictions >= 1
+    assert cache.get("b", "python", "v1") is None
+    assert cache.get("a", "python", "v1") is not None
+    assert cache.get("d", "python", "v1") is not None
+    assert cache.get("a", "python", "other") is None
+
+
+def test_replacing_an_entry_does_not_grow_the_cache(tmp_path):
+    """Storing the same key again counts only the new entry's size."""
+    cache = ParseCache(cache_dir=tmp_path)
+    summary = ParseSummary(language="python", ast=b"\0" * 100)
+    cache.put("a", "python", "v1", summary)
+    cache.put("b", "python", "v1", summary)
+
+    for _ in range(20):
+        cache.put("a", "python", "v1", ParseSummary(language="python", ast=b"\0" * 50))
+
+    assert cache._size == ParseCache._total_size(cache._connect())
@@ -0,0 +1,61 @@
+"""Tests for per-file parse limits."""
+import time
+
+import pytest
+
+from GithubAnalyzer.models.core.errors import (ParseCancelledError,
+                                               ParseSizeError,
+                                               ParseTimeoutError)
+from GithubAnalyzer.models.core.file import FileContent, FileInfo
+from GithubAnalyzer.services.core.file_processor import (FileProcessor,
+                                                         metadata_only_reason)
+from GithubAnalyzer.services.core.parser_service import ParserService
+
+CODE = "def f(x):\n    return x + 1\n"
+
+
+def test_oversized_content_is_refused():
+    """Content over the ceiling never reaches the parser."""
+    service = ParserService(max_parse_bytes=10)
+    with pytest.raises(ParseSizeError):
+        service.parse_content(CODE, "python")
+
+
+def test_timeout_raises_and_parser_stays_usable():
+    """A timed-out parse stops promptly, and the pooled parser still parses afterwards."""
+    service = ParserService(parse_timeout_ms=1)
+    start = time.monotonic()
+    with pytest.raises(ParseTimeoutError):
+        service.parse_content(CODE * 200_000, "python")
+    assert time.monotonic() - start < 5
+
+    result = ParserService().parse_content(CODE, "python")
+    assert [f["name"] for f in result.functions] == ["f"]
+
+
+def test_progress_callback_cancels_parse():
+    """The progress callback sees the parse advance and can cancel it."""
+    offsets = []
+
+    def cancel_after_first_chunk(offset):
+        offsets.append(offset)
+        return offset > 0
+
+    start = time.monotonic()
+    with pytest.raises(ParseCancelledError):
+        ParserService().parse_content(CODE * 200_000, "python",
+                                      progress_callback=cancel_after_first_chunk)
+    assert time.monotonic() - start < 5
+    assert offsets[0] == 0 and offsets[-1] > 0
+
+
+def test_oversized_file_is_stored_as_metadata_only(tmp_path):
+    """The file processor routes oversized files to a metadata only snippet."""
+    path = tmp_path / "big.py"
+    path.write_text(CODE * 10)
+    processor = FileProcessor(parser_service=ParserService(max_parse_bytes=len(CODE)))
+
+    snippet = processor.process_file(FileInfo(path=path, language="python"), FileContent.load(path))
+
+    assert metadata_only_reason(snippet) == "oversized"
+    assert snippet.code_text == "" and snippet.ast_data["size_bytes"] == len(CODE) * 10
@@ -0,0 +1,150 @@
+"""Tests for the persistent repository mirror cache."""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from GithubAnalyzer.services.core import repo_cache
+from GithubAnalyzer.services.core.repo_cache import RepositoryCache
+
+
+def _git(cwd: Path, *args: str) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(['git', *args], cwd=str(cwd), check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def _commit(work: Path, name: str, content: str) -> str:
+    """Commit a file in the work tree and push it to the bare origin."""
+    (work / name).write_text(content)
+    _git(work, 'add', name)
+    _git(work, '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+         'commit', '-q', '-m', f'add {name}')
+    _git(work, 'push', '-q', 'origin', 'HEAD:main')
+    return _git(work, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def remote_repo(tmp_path):
+    """A bare repository reachable through a file:// URL, plus a work tree."""
+    origin = tmp_path / "origin.git"
+    _git(tmp_path, 'init', '-q', '--bare', '-b', 'main', str(origin))
+    work = tmp_path / "work"
+    _git(tmp_path, 'clone', '-q', str(origin), str(work))
+    _git(work, 'checkout', '-q', '-b', 'main')
+    _commit(work, "main.py", "print('hello')\n")
+    return f"file://{origin}", work
+
+
+def test_reuses_mirror_and_fetches_new_commits(tmp_path, remote_repo):
+    """Second acquire fetches into the existing mirror and checkout."""
+    url, work = remote_repo
+    cache = RepositoryCache(cache_dir=tmp_path / "cache")
+
+    path = cache.acquire(url)
+    assert path == cache.checkout_path(url)
+    assert (path / "main.py").read_text() == "print('hello')\n"
+    mirror_inode = cache.mirror_path(url).stat().st_ino
+    cache.release(path)
+
+    head = _commit(work, "util.py", "x = 1\n")
+    path = cache.acquire(url)
+    assert cache.mirror_path(url).stat().st_ino == mirror_inode
+    assert _git(path, 'rev-parse', 'HEAD') == head
+    assert (path / "util.py").exists()
+    cache.release(path)
+
+    bare_path = cache.acquire(url, bare=True)
+    assert bare_path == cache.mirror_path(url)
+    assert _git(bare_path, 'rev-parse', 'HEAD') == head
+    cache.release(bare_path)
+
+
+def test_evicts_least_recently_used_unlocked_entries(tmp_path, remote_repo):
+    """Eviction removes idle entries but never locked or kept ones."""
+    url, _ = remote_repo
+    other_url = url.replace("origin.git", "origin.git/")
+    cache = RepositoryCache(cache_dir=tmp_path / "cache")
+
+    cache.release(cache.acquire(url))
+    held = cache.acquire(other_url)
+
+    cache.max_bytes = 0
+    assert cache.evict() == [cache.cache_key(url)]
+    assert not cache.mirror_path(url).exists()
+    assert cache.mirror_path(other_url).exists()
+
+    cache.release(held)
+    assert cache.evict(keep=cache.cache_key(other_url)) == []
+    assert cache.evict() == [cache.cache_key(other_url)]
+
+
+def test_depth_and_blob_limit_are_applied_to_cached_copies(tmp_path, remote_repo):
+    """Shallow and partial options reach the clone and get their own entries."""
+    url, work = remote_repo
+    _git(Path(url[len("file://"):]), 'config', 'uploadpack.allowfilter', 'true')
+    _commit(work, "big.py", "x = 1\n" * 1000)
+    head = _commit(work, "util.py", "y = 2\n")
+    cache = RepositoryCache(cache_dir=tmp_path / "cache")
+
+    bare_path = cache.acquire(url, bare=True, depth=1, blob_limit=100)
+    assert bare_path == cache.mirror_path(url, depth=1, blob_limit=100)
+    assert bare_path != cache.mirror_path(url)
+    assert _git(bare_path, 'rev-list', '--count', 'HEAD') == "1"
+    assert _git(bare_path, 'config', 'remote.origin.partialclonefilter') == "blob:limit=100"
+    cache.release(bare_path)
+
+    path = cache.acquire(url, depth=1)
+    assert path == cache.checkout_path(url, depth=1)
+    assert _git(path, 'rev-parse', 'HEAD') == head
+    assert _git(path, 'rev-list', '--count', 'HEAD') == "1"
+    assert not cache.mirror_path(url).exists()
+    cache.release(path)
+
+
+def test_bare_acquire_never_materializes_a_work_tree(tmp_path, remote_repo):
+    """Bare copies are object databases only, full or partial."""
+    url, _ = remote_repo
+    _git(Path(url[len("file://"):]), 'config', 'uploadpack.allowfilter', 'true')
+    cache = RepositoryCache(cache_dir=tmp_path / "cache")
+
+    for blob_limit in (None, 0):
+        path = cache.acquire(url, bare=True, blob_limit=blob_limit)
+        assert _git(path, 'rev-parse', '--is-bare-repository') == "true"
+        assert not cache.checkout_path(url, blob_limit=blob_limit).exists()
+        cache.release(path)
+    assert _git(cache.mirror_path(url, blob_limit=0), 'config',
+                'remote.origin.partialclonefilter') == "blob:limit=0"
+
+
+def test_eviction_uses_recorded_sizes(tmp_path, remote_repo, monkeypatch):
+    """Entry sizes are recorded on acquire, so evict never walks the cache."""
+    url, _ = remote_repo
+    cache = RepositoryCache(cache_dir=tmp_path / "cache")
+    cache.release(cache.acquire(url))
+    key = cache.cache_key(url)
+    assert int((cache.cache_dir / "sizes" / key).read_text()) > 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("evict walked the cache")
+
+    monkeypatch.setattr(repo_cache, "_tree_size", fail)
+    assert cache.evict() == []
+    cache.max_bytes = 0
+    assert cache.evict() == [key]
+    assert not (cache.cache_dir / "sizes" / key).exists()
+
+
+def test_tree_size_counts_hard_links_once(tmp_path):
+    """Hard links to the same file are counted once."""
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a").write_bytes(b"x" * 100_000)
+    single = repo_cache._tree_size(data)
+    os.link(data / "a", data / "b")
+    assert repo_cache._tree_size(data) == single
+
+    seen = set()
+    repo_cache._tree_size(data, seen)
+    assert repo_cache._tree_size(data, seen) == 0
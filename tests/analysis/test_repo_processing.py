@@ -1,6 +1,7 @@
 """Test suite for repository processing flow."""
 import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Any, Dict
@@ -13,8 +14,12 @@ from tree_sitter_language_pack import get_binding, get_language, get_parser
 from GithubAnalyzer.services.parsers.core.custom_parsers import get_custom_parser
 from GithubAnalyzer.services.analysis.parsers.language_service import \
     LanguageService
+from GithubAnalyzer.models.core.db.database import CodeSnippet
+from GithubAnalyzer.models.core.repository import IngestionConfig
 from GithubAnalyzer.services.analysis.parsers.query_service import \
     TreeSitterQueryHandler
+from GithubAnalyzer.services.core.database.postgres_service import \
+    PostgresService
 from GithubAnalyzer.services.core.file_service import FileService
 from GithubAnalyzer.services.core.repo_processor import RepoProcessor
 from GithubAnalyzer.utils.logging import get_logger
@@ -356,4 +361,130 @@ def test_function():
     # Find functions
     functions = query_handler.find_functions(tree.root_node)
     assert len(functions) == 1
-    assert functions[0]['function.name'].text.decode() == 'test_function' 
\ No newline at end of file
+    assert functions[0]['function.name'].text.decode() == 'test_function' 
+
+def test_unchanged_files_match_across_checkout_roots(sample_repo):
+    """Files stored from one checkout are recognized in a checkout at another path."""
+    stored = {}
+
+    def store(snippet, embedding=None, skip_embedding=False):
+        stored[snippet.file_path] = snippet.content_hash
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService"), \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService") as embed_cls:
+        pg_cls.return_value.get_file_hashes.side_effect = lambda repo_id: dict(stored)
+        pg_cls.return_value.store_code_with_embedding.side_effect = store
+        embed_cls.return_value.get_embeddings.side_effect = lambda texts: [[0.0]] * len(texts)
+        processor = RepoProcessor()
+        processor.file_service.get_head_commit = MagicMock(return_value=None)
+
+        with tempfile.TemporaryDirectory() as other_root:
+            copy = Path(other_root) / "checkout"
+            shutil.copytree(sample_repo, copy)
+
+            processor._process_checkout("url", 1, sample_repo, 0.0, 1, False, None)
+            first = processor.last_stats
+            processor._process_checkout("url", 1, copy, 0.0, 1, False, None)
+            second = processor.last_stats
+
+    assert first.processed_files > 0
+    assert "main.py" in stored and not any(os.path.isabs(path) for path in stored)
+    assert second.processed_files == 0
+    assert second.skipped_files == second.total_files
+
+
+def test_failed_discovery_does_not_advance_last_analyzed_commit(sample_repo):
+    """Files a run never reached are not recorded as analyzed."""
+    def failing_discovery(repo_path, repo_id=None):
+        yield from FileService().iter_repository_files(repo_path, repo_id=repo_id)
+        raise OSError("listing failed")
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService"), \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService") as embed_cls:
+        pg_cls.return_value.get_file_hashes.return_value = {}
+        embed_cls.return_value.get_embeddings.side_effect = lambda texts: [[0.0]] * len(texts)
+        processor = RepoProcessor()
+        processor.file_service.get_head_commit = MagicMock(return_value="abc123")
+
+        processor._process_checkout("url", 1, sample_repo, 0.0, 1, False, None)
+        pg_cls.return_value.update_last_analyzed_commit.assert_called_once_with(1, "abc123")
+
+        processor.file_service.iter_repository_files = failing_discovery
+        processor._process_checkout("url", 1, sample_repo, 0.0, 1, False, None)
+
+    assert processor.last_stats.failed_stages == ["discover"]
+    pg_cls.return_value.update_last_analyzed_commit.assert_called_once()
+
+
+def test_parse_only_files_are_stored_without_embedding(sample_repo):
+    """Files the policy keeps out of the embedding tier never reach the embedder."""
+    (sample_repo / "api_pb2.py").write_text("# Generated by protoc. DO NOT EDIT!\nX = 1\n")
+    skipped = {}
+    embedded = []
+
+    def store(snippet, embedding=None, skip_embedding=False):
+        skipped[snippet.file_path] = skip_embedding
+
+    def embed(texts):
+        embedded.extend(texts)
+        return [[0.0]] * len(texts)
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService"), \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService") as embed_cls:
+        pg_cls.return_value.get_file_hashes.return_value = {}
+        pg_cls.return_value.store_code_with_embedding.side_effect = store
+        embed_cls.return_value.get_embeddings.side_effect = embed
+        processor = RepoProcessor()
+        processor.file_service.get_head_commit = MagicMock(return_value=None)
+        processor._process_checkout("url", 1, sample_repo, 0.0, 1, False, None)
+
+    assert processor.last_stats.tier_counts.get("parse_only") == 1
+    assert skipped["api_pb2.py"] is True
+    assert skipped["main.py"] is False
+    assert not any("protoc" in text for text in embedded)
+
+
+def test_metadata_only_files_are_stored_without_embedding(sample_repo):
+    """Files too large to parse are recorded without reaching the embedder."""
+    skipped = {}
+    embedded = []
+
+    def store(snippet, embedding=None, skip_embedding=False):
+        skipped[snippet.file_path] = skip_embedding
+
+    def embed(texts):
+        embedded.extend(texts)
+        return [[0.0]] * len(texts)
+
+    with patch("GithubAnalyzer.services.core.repo_processor.PostgresService") as pg_cls, \
+            patch("GithubAnalyzer.services.core.repo_processor.Neo4jService"), \
+            patch("GithubAnalyzer.services.core.repo_processor.CodeEmbeddingService") as embed_cls:
+        pg_cls.return_value.get_file_hashes.return_value = {}
+        pg_cls.return_value.store_code_with_embedding.side_effect = store
+        embed_cls.return_value.get_embeddings.side_effect = embed
+        processor = RepoProcessor(config=IngestionConfig(max_parse_bytes=200, use_file_policy=False))
+        processor.file_service.get_head_commit = MagicMock(return_value=None)
+        processor._process_checkout("url", 1, sample_repo, 0.0, 1, False, None)
+
+    assert processor.last_stats.oversized_files >= 1
+    assert skipped["app.js"] is True
+    assert skipped["main.py"] is False
+    assert "" not in embedded
+
+
+def test_skipped_embedding_is_stored_as_null():
+    """Postgres stores a NULL embedding without calling the embedder."""
+    with patch("GithubAnalyzer.services.core.database.postgres_service.psycopg2") as pg, \
+            patch("GithubAnalyzer.services.core.database.postgres_service.CodeEmbeddingService") as embed_cls:
+        service = PostgresService()
+        snippet = CodeSnippet(id=None, repo_id=1, file_path="api_pb2.py", code_text="X = 1\n",
+                              embedding=[], language="python")
+        service.store_code_with_embedding(snippet, skip_embedding=True)
+
+    embed_cls.return_value.get_embedding.assert_not_called()
+    cursor = pg.connect.return_value.cursor.return_value.__enter__.return_value
+    params = cursor.execute.call_args[0][1]
+    assert params[4] is None
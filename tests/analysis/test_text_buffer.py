@@ -0,0 +1,53 @@
+"""Tests for the piece table text buffer."""
+import random
+
+import pytest
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.models.core.errors import EditorError
+from GithubAnalyzer.services.analysis.parsers.text_buffer import TextBuffer
+
+
+def _point(data: bytes, byte: int):
+    line_start = data.rfind(b'\n', 0, byte) + 1
+    return (data.count(b'\n', 0, byte), byte - line_start)
+
+
+def test_random_edits_match_bytearray():
+    """Contents, points and offsets agree with a plain bytearray after many edits."""
+    rng = random.Random(7)
+    expected = bytearray(b"line one\nline two\n\nline four")
+    buffer = TextBuffer(bytes(expected))
+
+    for _ in range(300):
+        start = rng.randint(0, len(expected))
+        end = rng.randint(start, min(len(expected), start + 12))
+        data = rng.choice([b'', b'x', b'\n', b'ab\ncd', 'é\n'.encode('utf-8')])
+        buffer.replace(start, end, data)
+        expected[start:end] = data
+
+        assert bytes(buffer) == bytes(expected)
+        assert buffer.line_count == expected.count(b'\n') + 1
+        byte = rng.randint(0, len(expected))
+        assert buffer.point_at(byte) == _point(bytes(expected), byte)
+        assert buffer.byte_at(_point(bytes(expected), byte)) == byte
+        assert buffer.slice(start, start + 5) == bytes(expected[start:start + 5])
+
+
+def test_read_callback_parses_like_bytes():
+    """Parsing through ``read`` gives the same tree as parsing the bytes."""
+    buffer = TextBuffer("def f():\n    return 1\n" * 50)
+    buffer.insert(0, "import os\n")
+    buffer.delete(10, 13)
+
+    parser = get_parser("python")
+    assert str(parser.parse(buffer.read).root_node) == str(parser.parse(bytes(buffer)).root_node)
+
+
+def test_out_of_range_raises():
+    """Ranges and rows outside of the buffer are rejected."""
+    buffer = TextBuffer("a\nb")
+    with pytest.raises(EditorError):
+        buffer.replace(2, 10, "")
+    with pytest.raises(EditorError):
+        buffer.line_start(2)
@@ -0,0 +1,48 @@
+"""Tests for the cursor-based tree walk."""
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.models.core.traversal import POST_ORDER, walk_tree
+
+CODE = b"def f(a, b):\n    return a + b\n\nclass A:\n    x = [1, 2]\n"
+
+
+def _pre_order(node, depth=0, max_depth=None):
+    nodes = [node]
+    if max_depth is None or depth < max_depth:
+        for child in node.children:
+            nodes.extend(_pre_order(child, depth + 1, max_depth))
+    return nodes
+
+
+def _post_order(node):
+    nodes = []
+    for child in node.children:
+        nodes.extend(_post_order(child))
+    return nodes + [node]
+
+
+def test_walk_orders_match_recursive_traversal():
+    """Pre- and post-order walks visit nodes like the recursive definitions."""
+    root = get_parser("python").parse(CODE).root_node
+    class_node = root.children[1]
+
+    assert [n.id for n in walk_tree(root)] == [n.id for n in _pre_order(root)]
+    assert [n.id for n in walk_tree(root, order=POST_ORDER)] == [n.id for n in _post_order(root)]
+    assert [n.id for n in walk_tree(class_node)] == [n.id for n in _pre_order(class_node)]
+    assert [n.id for n in walk_tree(root, max_depth=2)] == [n.id for n in _pre_order(root, max_depth=2)]
+
+
+def test_walk_filters():
+    """Named-only and type filters select nodes without pruning the walk."""
+    root = get_parser("python").parse(CODE).root_node
+
+    assert all(n.is_named for n in walk_tree(root, named_only=True))
+    assert [n.text for n in walk_tree(root, types="identifier")] == [
+        b"f", b"a", b"b", b"a", b"b", b"A", b"x"]
+
+
+def test_walk_handles_deep_nesting():
+    """Deeply nested code does not hit the recursion limit."""
+    root = get_parser("python").parse(b"x = " + b"[" * 5000 + b"]" * 5000).root_node
+
+    assert sum(1 for _ in walk_tree(root, order=POST_ORDER)) == root.descendant_count
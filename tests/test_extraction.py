@@ -0,0 +1,40 @@
+"""Tests for element extraction by the query handler."""
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.services.core.parser_service import ParserService
+from GithubAnalyzer.services.parsers.core.query_handler import \
+    TreeSitterQueryHandler
+
+CODE = "import os\n\n\ndef first():\n    return 1\n\n\nclass Second:\n    pass\n"
+
+
+def _spans(extraction):
+    return {
+        kind: sorted((n.type, n.start_byte, n.end_byte) for element in getattr(extraction, kind)
+                     for n in ([element] if hasattr(element, "start_byte") else element.values())
+                     if hasattr(n, "start_byte"))
+        for kind in ("functions", "classes", "imports", "error_nodes", "missing_nodes")
+    }
+
+
+def test_parse_result_reports_every_flagged_error_node():
+    """Parse results list every has_error node; the extraction only ERROR nodes."""
+    service = ParserService()
+    broken = "def f(:\n    return 1\n"
+    result = service.parse_content(broken, "python")
+    handler = TreeSitterQueryHandler()
+
+    assert result.error_nodes == handler.find_error_nodes(result.tree.root_node)
+    assert result.tree.root_node in result.error_nodes
+    assert all(node.type == "ERROR" for node in handler.extract(result.tree, "python").error_nodes)
+
+
+def test_disabled_patterns_do_not_affect_extraction():
+    """Pattern indices of single queries are not applied to the combined query."""
+    handler = TreeSitterQueryHandler()
+    tree = get_parser("python").parse(CODE.encode("utf-8"))
+    expected = _spans(handler.extract(tree, "python"))
+
+    handler.disable_pattern(0)
+
+    assert _spans(handler.extract(tree, "python")) == expected
@@ -0,0 +1,9 @@
+"""Tests for content hashing used in change detection."""
+from GithubAnalyzer.utils.hashing import git_blob_hash
+
+
+def test_git_blob_hash_matches_git():
+    """Hashes equal the blob SHAs git records, over the raw bytes."""
+    assert git_blob_hash(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+    assert git_blob_hash(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+    assert git_blob_hash(b"a\r\n") != git_blob_hash(b"a\n")
@@ -0,0 +1,65 @@
+"""Tests for the per-thread parser pool and the Language cache."""
+import threading
+
+from GithubAnalyzer.services.analysis.parsers import language_service
+from GithubAnalyzer.services.analysis.parsers.language_service import \
+    LanguageService
+
+
+def _in_thread(function):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_parser_is_reused_within_a_thread():
+    """Every service in a thread shares one parser per language."""
+    parser = LanguageService().get_parser("python")
+
+    assert LanguageService().get_parser(" Python ") is parser
+    assert parser.parse(b"x = 1\n").root_node.type == "module"
+
+
+def test_each_thread_gets_its_own_parser():
+    """Parsers are not shared across threads, but their Language is."""
+    service = LanguageService()
+    parser = service.get_parser("python")
+
+    other, again = _in_thread(lambda: (service.get_parser("python"), service.get_parser("python")))
+
+    assert other is not parser
+    assert other is again
+    assert other.language == parser.language
+
+
+def test_language_objects_are_created_once(monkeypatch):
+    """Languages are looked up once per process and shared by every thread."""
+    calls = []
+    real_get_language = language_service.get_language
+
+    def counting_get_language(name):
+        calls.append(name)
+        return real_get_language(name)
+
+    monkeypatch.setattr(language_service, "_languages", {})
+    monkeypatch.setattr(language_service, "get_language", counting_get_language)
+    service = LanguageService()
+
+    language = service.get_tree_sitter_language("python")
+
+    assert service.get_tree_sitter_language("PYTHON") is language
+    assert _in_thread(lambda: LanguageService().get_tree_sitter_language("python")) is language
+    assert calls == ["python"]
+
+
+def test_csharp_aliases_share_one_language(monkeypatch):
+    """The C# aliases resolve to the same cached Language."""
+    monkeypatch.setattr(language_service, "_languages", {})
+    service = LanguageService()
+
+    language = service.get_tree_sitter_language("c#")
+
+    assert service.get_tree_sitter_language("csharp") is language
+    assert service.get_tree_sitter_language("c_sharp") is language
@@ -0,0 +1,59 @@
+"""Tests for compiled .gitignore-style path matching."""
+import pytest
+
+from GithubAnalyzer.utils.path_matcher import PathFilter, PathMatcher
+
+
+@pytest.mark.parametrize("pattern,path,is_dir,expected", [
+    ("*.pyc", "a/b/c.pyc", False, True),
+    ("*.pyc", "a/b/c.py", False, None),
+    ("node_modules", "web/node_modules", True, True),
+    ("build/", "build", True, True),
+    ("build/", "build", False, None),
+    ("/docs", "docs", True, True),
+    ("/docs", "src/docs", True, None),
+    ("src/*.py", "src/a.py", False, True),
+    ("src/*.py", "src/sub/a.py", False, None),
+    ("src/*.py", "lib/src/a.py", False, None),
+    ("**/fixtures", "a/b/fixtures", True, True),
+    ("a/**/z.txt", "a/z.txt", False, True),
+    ("a/**/z.txt", "a/b/c/z.txt", False, True),
+    ("logs/**", "logs/x/y.log", False, True),
+    ("file?.txt", "file1.txt", False, True),
+    ("file[0-9].txt", "fileA.txt", False, None),
+    ("\\#notes", "#notes", False, True),
+])
+def test_single_pattern(pattern, path, is_dir, expected):
+    """Each pattern follows gitignore semantics."""
+    assert PathMatcher([pattern]).match(path, is_dir=is_dir) is expected
+
+
+def test_last_matching_pattern_wins():
+    """Later patterns override earlier ones, including negations."""
+    matcher = PathMatcher(["*.log", "!keep.log", "keep.log"])
+    assert matcher.match("keep.log") is True
+
+    matcher = PathMatcher(["*.log", "!keep.log"])
+    assert matcher.match("keep.log") is False
+    assert matcher.match("other.log") is True
+
+
+def test_files_in_excluded_directory_cannot_be_reincluded():
+    """A negation does not re-include files below an excluded directory."""
+    matcher = PathMatcher(["vendor/", "!vendor/keep.py"])
+    assert matcher.is_matched("vendor/keep.py")
+    assert not matcher.is_matched("src/keep.py")
+
+
+def test_path_filter_combines_include_and_exclude():
+    """Include and exclude are answered in one call."""
+    path_filter = PathFilter(include=["*.py", "docs/"], exclude=["tests/", "*_pb2.py"],
+                             exclude_hidden=True)
+    assert path_filter.matches("src/app.py")
+    assert path_filter.matches("docs/index.md")
+    assert not path_filter.matches("src/app.js")
+    assert not path_filter.matches("tests/test_app.py")
+    assert not path_filter.matches("src/api_pb2.py")
+    assert not path_filter.matches("src/.hidden.py")
+    assert path_filter.is_dir_excluded("tests")
+    assert not path_filter.is_dir_excluded("src")
@@ -0,0 +1,99 @@
+"""Tests for ahead-of-time compilation of the query pattern library."""
+import importlib
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from GithubAnalyzer.services.analysis.parsers import pattern_warmup
+from GithubAnalyzer.services.analysis.parsers.pattern_warmup import \
+    warm_up_patterns
+from GithubAnalyzer.services.parsers.core.query_cache import QueryCache
+
+FUNCTIONS = "(function_definition name: (identifier) @name)"
+PATTERNS = [
+    ("python", "functions", "query_patterns", FUNCTIONS),
+    ("python", "broken", "patterns", "(no_such_node) @node"),
+    ("no_such_language", "identifiers", "patterns", "(identifier) @id"),
+]
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Replace the pattern registries with a valid, an invalid and an unparseable pattern."""
+    def iter_patterns(languages=None):
+        return iter([p for p in PATTERNS if languages is None or p[0] in languages])
+    monkeypatch.setattr(pattern_warmup, "iter_registered_patterns", iter_patterns)
+
+
+@pytest.fixture
+def cli():
+    """The CLI, imported without connecting to a database."""
+    with patch("GithubAnalyzer.services.core.database.database_service.DatabaseService"):
+        sys.modules.pop("GithubAnalyzer.cli", None)
+        return importlib.import_module("GithubAnalyzer.cli").cli
+
+
+def _fail():
+    raise AssertionError("query was compiled again")
+
+
+def test_warm_up_fills_the_query_cache():
+    """Valid patterns are compiled into the cache; invalid ones and missing grammars are reported."""
+    cache = QueryCache(max_size=1)
+
+    report = warm_up_patterns(query_cache=cache)
+
+    assert [r.pattern_name for r in report.compiled] == ["functions"]
+    assert [r.pattern_name for r in report.invalid] == ["broken"]
+    assert report.invalid[0].error and report.invalid[0].source == "patterns"
+    assert list(report.skipped_languages) == ["no_such_language"]
+    assert cache.max_size >= 2
+    assert cache.get("python", FUNCTIONS, _fail) is not None
+
+
+def test_second_warm_up_is_served_from_the_cache():
+    """Warming up an already warm cache compiles nothing."""
+    cache = QueryCache()
+    warm_up_patterns(["python"], query_cache=cache)
+    misses = cache.stats()["misses"]
+
+    report = warm_up_patterns(["python"], query_cache=cache)
+
+    assert cache.stats()["misses"] == misses + 1  # the invalid pattern is never cached
+    assert [r.pattern_name for r in report.compiled] == ["functions"]
+    assert not report.skipped_languages
+
+
+def test_warmup_command_reports_invalid_patterns(cli):
+    """The command lists invalid patterns and only fails with --strict."""
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["patterns", "warmup"])
+    assert result.exit_code == 0
+    assert "python/broken (patterns)" in result.output
+    assert "no_such_language" in result.output
+
+    assert runner.invoke(cli, ["patterns", "warmup", "--strict"]).exit_code == 1
+
+
+def test_warmup_command_json_and_language_filter(cli):
+    """--json prints the report, and --language limits it to one language."""
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["patterns", "warmup", "--json", "--language", "python"])
+    report = json.loads(result.output)
+
+    assert result.exit_code == 0
+    assert report["compiled"] == 1
+    assert [p["pattern_name"] for p in report["invalid"]] == ["broken"]
+    assert report["skipped_languages"] == {}
+
+
+def test_strict_warmup_succeeds_without_invalid_patterns(cli):
+    """--strict exits 0 when every selected pattern compiles."""
+    result = CliRunner().invoke(cli, ["patterns", "warmup", "--strict", "--language", "no_such_language"])
+
+    assert result.exit_code == 0
@@ -0,0 +1,64 @@
+"""Tests for the compiled query cache."""
+from tree_sitter_language_pack import get_parser
+
+from GithubAnalyzer.services.parsers.core.query_cache import QueryCache
+from GithubAnalyzer.services.parsers.core.query_handler import (
+    EXTRACTION_QUERY_KEY, TreeSitterQueryHandler)
+
+
+def test_queries_are_compiled_once_per_language_and_pattern():
+    """Repeated lookups are hits; the language is part of the key."""
+    cache = QueryCache(max_size=8)
+    compiled = []
+
+    def compile_query():
+        compiled.append(object())
+        return compiled[-1]
+
+    first = cache.get("python", "(identifier) @id", compile_query)
+    assert cache.get("Python", "(identifier) @id", compile_query) is first
+    assert cache.get("javascript", "(identifier) @id", compile_query) is not first
+    assert len(compiled) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_query_is_evicted():
+    """The cache stays bounded and keeps recently used queries."""
+    cache = QueryCache(max_size=2)
+    cache.get("python", "a", object)
+    cache.get("python", "b", object)
+    cache.get("python", "a", object)
+    cache.get("python", "c", object)
+
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    misses = cache.stats()["misses"]
+    cache.get("python", "a", object)
+    assert cache.stats()["misses"] == misses
+    cache.get("python", "b", object)
+    assert cache.stats()["misses"] == misses + 1
+
+
+def test_validate_node_looks_up_registered_patterns():
+    """Validation resolves pattern queries through the registry and the cache."""
+    handler = TreeSitterQueryHandler(language_name="python")
+    tree = get_parser("python").parse(b"def f(x):\n    return x\n")
+
+    valid, errors = handler.validate_node(tree.root_node)
+
+    assert valid and errors == []
+    assert handler._get_pattern_query("no_such_pattern") is None
+
+
+def test_extraction_queries_live_in_the_bounded_cache():
+    """Combined extraction queries are cached, and evicted, like any query."""
+    cache = QueryCache(max_size=64)
+    handler = TreeSitterQueryHandler(language_name="python", _query_cache=cache)
+
+    first = handler.get_extraction_query("python")
+    assert handler.get_extraction_query("python") is first
+    assert cache.key("python", EXTRACTION_QUERY_KEY) in cache._queries
+
+    cache.clear()
+    assert handler.get_extraction_query("python") is not first